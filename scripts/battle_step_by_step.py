@@ -8,56 +8,121 @@ This script runs a battle and visualizes each turn, showing:
 - Results of each action
 - Final battle outcome
 """
+import argparse
+import random
 import sys
+import time
 from pathlib import Path
 
+import numpy as np
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.simulator import (
     GameDataLoader, BattleSimulator, BattleResult, Action
 )
+from src.simulator.enums import Side
 from src.simulator.models import Position
+from src.simulator._action_match import pack_actions, find_match
 from src.utils.visualizer import BattleVisualizer, Colors
 from src.ml.agents import RandomAgent, HeuristicAgent
 
+# Precomputed color templates; fill with .format(text)
+_BAR = "=" * 70
+_BOLD_BAR = f"{Colors.BOLD}{_BAR}{Colors.RESET}"
+_BOLD = f"{Colors.BOLD}{{}}{Colors.RESET}"
+_GREEN = f"{Colors.GREEN}{{}}{Colors.RESET}"
+_RED = f"{Colors.RED}{{}}{Colors.RESET}"
+_YELLOW = f"{Colors.YELLOW}{{}}{Colors.RESET}"
+_MAGENTA = f"{Colors.MAGENTA}{{}}{Colors.RESET}"
+_CYAN_HEADING = f"\n{Colors.CYAN}{{}}{Colors.RESET}"
+_GREEN_BOLD = f"{Colors.GREEN}{Colors.BOLD}{{}}{Colors.RESET}"
+_RED_BOLD = f"{Colors.RED}{Colors.BOLD}{{}}{Colors.RESET}"
+_DEFEATED = _RED.format("DEFEATED!")
+
 
 class StepByStepBattle:
     """Run and visualize a battle step-by-step."""
 
-    def __init__(self, battle, player_agent=None, enemy_agent=None, auto_mode=False):
+    def __init__(self, battle, player_agent=None, enemy_agent=None, auto_mode=False,
+                 quiet=False, verbose=False):
+        """
+        Args:
+            battle: BattleState to run
+            player_agent: Agent for the player side (defaults to HeuristicAgent)
+            enemy_agent: Agent for the enemy side (defaults to RandomAgent)
+            auto_mode: Play without waiting for Enter between turns
+            quiet: Only render the initial and final grids
+            verbose: Render the grid every turn even when output is piped
+        """
         self.battle = battle
         self.viz = BattleVisualizer(battle)
         self.player_agent = player_agent or HeuristicAgent()
         self.enemy_agent = enemy_agent or RandomAgent()
         self.turn_count = 0
         self.auto_mode = auto_mode
+        self._last_grid_signature = None
+
+        # Piped auto-mode output is a log: skip per-turn grids and pacing delays
+        self._is_tty = sys.stdout.isatty()
+        self._render_per_turn = verbose or not (quiet or (auto_mode and not self._is_tty))
 
     def show_initial_state(self):
         """Show the initial battle state."""
-        print(f"\n{Colors.BOLD}{'=' * 70}{Colors.RESET}")
-        print(f"{Colors.BOLD}BATTLE BEGINS!{Colors.RESET}")
-        print(f"{Colors.BOLD}{'=' * 70}{Colors.RESET}\n")
-
-        print(f"{Colors.GREEN}Player Forces:{Colors.RESET}")
-        for i, unit in enumerate(self.battle.player_units):
-            print(f"  [{i}] {unit.template.class_type.name} - HP: {unit.current_hp}/{unit.template.stats.hp} - "
-                  f"Position: ({unit.position.x}, {unit.position.y})")
-            for wid, weapon in unit.template.weapons.items():
-                print(f"      • {weapon.name} (DMG: {weapon.stats.base_damage_min}-{weapon.stats.base_damage_max})")
-
-        print(f"\n{Colors.RED}Enemy Forces:{Colors.RESET}")
-        for i, unit in enumerate(self.battle.enemy_units):
-            print(f"  [{i}] {unit.template.class_type.name} - HP: {unit.current_hp}/{unit.template.stats.hp} - "
-                  f"Position: ({unit.position.x}, {unit.position.y})")
-            for wid, weapon in unit.template.weapons.items():
-                print(f"      • {weapon.name} (DMG: {weapon.stats.base_damage_min}-{weapon.stats.base_damage_max})")
-
-        print(f"\n{Colors.CYAN}Battle Grid:{Colors.RESET}")
-        print(self.viz.render_grid())
+        arrays = self.battle.arrays
+        buf = self._banner("BATTLE BEGINS!", leading_newline=True)
+
+        buf.append(_GREEN.format("Player Forces:"))
+        self._show_forces(buf, self.battle.player_units, arrays.player_slice)
+
+        buf.append("\n" + _RED.format("Enemy Forces:"))
+        self._show_forces(buf, self.battle.enemy_units, arrays.enemy_slice)
+
+        buf.append(_CYAN_HEADING.format("Battle Grid:"))
+        buf.append(self._render_grid())
+        self._flush(buf)
 
         if not self.auto_mode:
-            input(f"\n{Colors.YELLOW}Press Enter to start the battle...{Colors.RESET}")
+            input("\n" + _YELLOW.format("Press Enter to start the battle..."))
+
+    def _show_forces(self, buf, units, slots):
+        """Append one side's units, reading HP and positions from the battle arrays."""
+        arrays = self.battle.arrays
+        rows = np.stack((arrays.hp[slots], arrays.max_hp[slots], arrays.pos_x[slots], arrays.pos_y[slots]), axis=1)
+        for i, (unit, (hp, max_hp, x, y)) in enumerate(zip(units, rows.tolist())):
+            tpl = unit.template
+            buf.append(f"  [{i}] {tpl.class_type.name} - HP: {hp}/{max_hp} - Position: ({x}, {y})")
+            for weapon in tpl.weapons.values():
+                w_stats = weapon.stats
+                buf.append(f"      • {weapon.name} (DMG: {w_stats.base_damage_min}-{w_stats.base_damage_max})")
+
+    @staticmethod
+    def _banner(title, leading_newline=False, color=""):
+        """Start an output buffer with a bold title bar."""
+        return [
+            ("\n" if leading_newline else "") + _BOLD_BAR,
+            color + _BOLD.format(title),
+            _BOLD_BAR + "\n",
+        ]
+
+    @staticmethod
+    def _flush(buf):
+        """Write a block of lines to stdout in a single call."""
+        sys.stdout.write("\n".join(buf) + "\n")
+
+    def _grid_signature(self):
+        """Bytes identifying the visible unit state (HP, alive, position)."""
+        arrays = self.battle.arrays
+        return b"".join((
+            arrays.hp.tobytes(), arrays.is_alive.tobytes(),
+            arrays.pos_x.tobytes(), arrays.pos_y.tobytes()
+        ))
+
+    def _render_grid(self):
+        """Render the grid and remember the state it was rendered from."""
+        self._last_grid_signature = self._grid_signature()
+        return self.viz.render_grid()
 
     def execute_turn(self):
         """Execute one complete turn (one side's action)."""
@@ -67,15 +132,14 @@ class StepByStepBattle:
         current_side = "PLAYER" if self.battle.is_player_turn else "ENEMY"
         side_color = Colors.GREEN if self.battle.is_player_turn else Colors.RED
 
-        print(f"\n{Colors.BOLD}{'=' * 70}{Colors.RESET}")
-        print(f"{side_color}{Colors.BOLD}TURN {self.turn_count}: {current_side} PHASE{Colors.RESET}")
-        print(f"{Colors.BOLD}{'=' * 70}{Colors.RESET}\n")
+        buf = self._banner(f"TURN {self.turn_count}: {current_side} PHASE", leading_newline=True, color=side_color)
 
         # Get legal actions
         legal_actions = self.battle.get_legal_actions()
 
         if not legal_actions:
-            print(f"{Colors.YELLOW}No valid actions available. Turn skipped.{Colors.RESET}")
+            buf.append(_YELLOW.format("No valid actions available. Turn skipped."))
+            self._flush(buf)
             self.battle.end_turn()
             return
 
@@ -85,30 +149,31 @@ class StepByStepBattle:
         else:
             action = self.enemy_agent.select_action(self.battle)
 
-        # Validate action
-        if action not in legal_actions:
-            # Try to find a matching action
-            action = self._find_matching_action(action, legal_actions)
-            if action is None:
-                print(f"{Colors.YELLOW}Agent selected invalid action. Using random action.{Colors.RESET}")
-                import random
-                action = random.choice(legal_actions)
+        # Validate action against the legal set
+        action = self._find_matching_action(action, legal_actions)
+        if action is None:
+            buf.append(_YELLOW.format("Agent selected invalid action. Using random action."))
+            action = random.choice(legal_actions)
 
         # Show action details
-        self._show_action_details(action)
+        self._show_action_details(buf, action)
 
         # Execute action
         result = self.battle.execute_action(action)
 
         # Show results
-        self._show_action_results(action, result)
+        self._show_action_results(buf, action, result)
 
         # End turn
         self.battle.end_turn()
 
-        # Show updated grid
-        print(f"\n{Colors.CYAN}Updated Battlefield:{Colors.RESET}")
-        print(self.viz.render_grid())
+        # Show updated grid (auto mode skips it when nothing visible changed)
+        if self._render_per_turn and (
+            not self.auto_mode or self._grid_signature() != self._last_grid_signature
+        ):
+            buf.append(_CYAN_HEADING.format("Updated Battlefield:"))
+            buf.append(self._render_grid())
+        self._flush(buf)
 
         # Check if battle ended
         if self.battle.result != BattleResult.IN_PROGRESS:
@@ -116,73 +181,79 @@ class StepByStepBattle:
 
         # Pause for user to see the results
         if not self.auto_mode:
-            input(f"\n{Colors.YELLOW}Press Enter to continue to next turn...{Colors.RESET}")
+            input("\n" + _YELLOW.format("Press Enter to continue to next turn..."))
         return True
 
     def _find_matching_action(self, action, legal_actions):
         """Find a legal action that matches the given action."""
-        for legal in legal_actions:
-            if (action.unit_index == legal.unit_index and
-                action.weapon_id == legal.weapon_id and
-                action.target_position == legal.target_position):
-                return legal
-        return None
-
-    def _show_action_details(self, action):
-        """Show details about the action being taken."""
-        units = self.battle.current_side_units
-        unit = units[action.unit_index]
+        if action is None:
+            return None
+        index = find_match(
+            pack_actions(legal_actions),
+            action.unit_index, action.weapon_id,
+            action.target_position.x, action.target_position.y
+        )
+        return legal_actions[index] if index >= 0 else None
+
+    def _show_action_details(self, buf, action):
+        """Append details about the action being taken."""
+        unit = self.battle.current_side_units[action.unit_index]
+        pos = unit.position
+        target_pos = action.target_position
         weapon = unit.template.weapons.get(action.weapon_id)
 
-        target_unit = self.battle.get_unit_at_position(action.target_position)
+        target_unit = self.battle.get_unit_at_position(target_pos)
         target_name = target_unit.template.class_type.name if target_unit else "Empty Space"
 
-        print(f"{Colors.BOLD}Action:{Colors.RESET}")
-        print(f"  Attacker: {unit.template.class_type.name} at ({unit.position.x}, {unit.position.y})")
-        print(f"  Weapon: {weapon.name if weapon else 'Unknown'}")
-        print(f"  Target: {target_name} at ({action.target_position.x}, {action.target_position.y})")
+        buf.append(_BOLD.format("Action:"))
+        buf.append(f"  Attacker: {unit.template.class_type.name} at ({pos.x}, {pos.y})")
+        buf.append(f"  Weapon: {weapon.name if weapon else 'Unknown'}")
+        buf.append(f"  Target: {target_name} at ({target_pos.x}, {target_pos.y})")
 
         if weapon:
-            print(f"  Base Damage: {weapon.stats.base_damage_min}-{weapon.stats.base_damage_max}")
+            w_stats = weapon.stats
+            buf.append(f"  Base Damage: {w_stats.base_damage_min}-{w_stats.base_damage_max}")
 
             # Show ability info
-            if weapon.abilities:
-                ability = self.battle.data_loader.get_ability(weapon.abilities[0])
-                if ability:
-                    print(f"  Ability: {ability.name}")
-                    print(f"  Range: {ability.stats.min_range}-{ability.stats.max_range}")
+            ability = weapon.primary_ability
+            if ability:
+                a_stats = ability.stats
+                buf.append(f"  Ability: {ability.name}")
+                buf.append(f"  Range: {a_stats.min_range}-{a_stats.max_range}")
 
-    def _show_action_results(self, action, result):
-        """Show the results of an action."""
-        print(f"\n{Colors.BOLD}Results:{Colors.RESET}")
+    def _show_action_results(self, buf, action, result):
+        """Append the results of an action."""
+        buf.append("\n" + _BOLD.format("Results:"))
 
         if not result.success:
-            print(f"  {Colors.RED}✗ Action failed: {result.message}{Colors.RESET}")
+            buf.append("  " + _RED.format(f"✗ Action failed: {result.message}"))
             return
 
         if result.damage_dealt:
-            print(f"  {Colors.YELLOW}Damage Dealt:{Colors.RESET}")
+            buf.append("  " + _YELLOW.format("Damage Dealt:"))
             opposing_units = self.battle.opposing_side_units
             for unit_idx, damage in result.damage_dealt.items():
                 if unit_idx < len(opposing_units):
                     target = opposing_units[unit_idx]
-                    status = f"HP: {target.current_hp}/{target.template.stats.hp}"
-                    if not target.is_alive:
-                        status = f"{Colors.RED}DEFEATED!{Colors.RESET}"
-                    print(f"    • {target.template.class_type.name}: {damage} damage ({status})")
+                    tpl = target.template
+                    if target.is_alive:
+                        status = f"HP: {target.current_hp}/{tpl.stats.hp}"
+                    else:
+                        status = _DEFEATED
+                    buf.append(f"    • {tpl.class_type.name}: {damage} damage ({status})")
 
         if result.kills:
-            print(f"  {Colors.RED}Units Defeated: {len(result.kills)}{Colors.RESET}")
+            buf.append("  " + _RED.format(f"Units Defeated: {len(result.kills)}"))
 
         if result.status_applied:
-            print(f"  {Colors.MAGENTA}Status Effects Applied:{Colors.RESET}")
+            buf.append("  " + _MAGENTA.format("Status Effects Applied:"))
             for unit_idx, effect_id in result.status_applied:
                 effect = self.battle.data_loader.status_effects.get(effect_id)
                 if effect:
-                    print(f"    • {effect.family.name} ({effect.duration} turns)")
+                    buf.append(f"    • {effect.family.name} ({effect.duration} turns)")
 
         if not result.damage_dealt and not result.kills and not result.status_applied:
-            print(f"  {Colors.YELLOW}Attack missed or had no effect{Colors.RESET}")
+            buf.append("  " + _YELLOW.format("Attack missed or had no effect"))
 
     def run_battle(self, max_turns=50):
         """Run the complete battle step-by-step."""
@@ -196,9 +267,8 @@ class StepByStepBattle:
             if not continue_battle:
                 break
 
-            # In auto mode, add small delay for readability
-            if self.auto_mode:
-                import time
+            # In auto mode, add small delay for readability (only when someone is watching)
+            if self.auto_mode and self._is_tty:
                 time.sleep(0.5)
 
         # Show final results
@@ -206,46 +276,53 @@ class StepByStepBattle:
 
     def _show_final_results(self):
         """Show the final battle results."""
-        print(f"\n{Colors.BOLD}{'=' * 70}{Colors.RESET}")
-        print(f"{Colors.BOLD}BATTLE ENDED!{Colors.RESET}")
-        print(f"{Colors.BOLD}{'=' * 70}{Colors.RESET}\n")
+        buf = self._banner("BATTLE ENDED!", leading_newline=True)
 
         if self.battle.result == BattleResult.PLAYER_WIN:
-            print(f"{Colors.GREEN}{Colors.BOLD}VICTORY!{Colors.RESET}")
-            print(f"{Colors.GREEN}Player forces have defeated the enemy!{Colors.RESET}")
+            buf.append(_GREEN_BOLD.format("VICTORY!"))
+            buf.append(_GREEN.format("Player forces have defeated the enemy!"))
         elif self.battle.result == BattleResult.ENEMY_WIN:
-            print(f"{Colors.RED}{Colors.BOLD}DEFEAT!{Colors.RESET}")
-            print(f"{Colors.RED}Enemy forces have defeated the player!{Colors.RESET}")
+            buf.append(_RED_BOLD.format("DEFEAT!"))
+            buf.append(_RED.format("Enemy forces have defeated the player!"))
         else:
-            print(f"{Colors.YELLOW}Battle ended in a draw or surrender.{Colors.RESET}")
+            buf.append(_YELLOW.format("Battle ended in a draw or surrender."))
 
-        print(f"\n{Colors.CYAN}Final Statistics:{Colors.RESET}")
-        print(f"  Total Turns: {self.battle.turn_number}")
-        print(f"  Total Actions: {len(self.battle.action_history)}")
+        buf.append(_CYAN_HEADING.format("Final Statistics:"))
+        buf.append(f"  Total Turns: {self.battle.turn_number}")
+        buf.append(f"  Total Actions: {len(self.battle.action_history)}")
 
-        player_alive = sum(1 for u in self.battle.player_units if u.is_alive)
-        enemy_alive = sum(1 for u in self.battle.enemy_units if u.is_alive)
-        print(f"  Player Units Remaining: {player_alive}/{len(self.battle.player_units)}")
-        print(f"  Enemy Units Remaining: {enemy_alive}/{len(self.battle.enemy_units)}")
+        player_alive = self.battle.alive_count(Side.PLAYER)
+        enemy_alive = self.battle.alive_count(Side.HOSTILE)
+        buf.append(f"  Player Units Remaining: {player_alive}/{len(self.battle.player_units)}")
+        buf.append(f"  Enemy Units Remaining: {enemy_alive}/{len(self.battle.enemy_units)}")
 
-        print(f"\n{Colors.CYAN}Final Battlefield:{Colors.RESET}")
-        print(self.viz.render_grid())
+        player_hp, enemy_hp = self.battle.arrays.hp_by_side()
+        player_max_hp, enemy_max_hp = self.battle.arrays.max_hp_by_side()
+        buf.append(f"  Player HP Remaining: {player_hp}/{player_max_hp}")
+        buf.append(f"  Enemy HP Remaining: {enemy_hp}/{enemy_max_hp}")
+
+        buf.append(_CYAN_HEADING.format("Final Battlefield:"))
+        buf.append(self.viz.render_grid())
+        self._flush(buf)
 
 
 def main():
     """Run a step-by-step battle visualization."""
-    print(f"{Colors.BOLD}Battle Simulator - Step-by-Step Visualization{Colors.RESET}")
-    print(f"{Colors.BOLD}{'=' * 70}{Colors.RESET}\n")
+    parser = argparse.ArgumentParser(description="Step-by-step battle visualization")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--quiet", action="store_true", help="Only show the initial and final grids")
+    output.add_argument("--verbose", action="store_true", help="Show the grid every turn, even when piped")
+    args = parser.parse_args()
+
+    print(_BOLD.format("Battle Simulator - Step-by-Step Visualization"))
+    print(_BOLD_BAR + "\n")
 
     # Load data and create battle
     print("Loading game data...")
     simulator = BattleSimulator("data")
 
     # Get units with weapons
-    units_with_weapons = [
-        uid for uid, unit in simulator.data_loader.units.items()
-        if unit.weapons
-    ][:8]
+    units_with_weapons = simulator.data_loader.units_with_weapons[:8]
 
     if len(units_with_weapons) < 4:
         print("Not enough units with weapons for demo")
@@ -270,7 +347,7 @@ def main():
     battle.seed(42)
 
     # Ask for mode
-    print(f"{Colors.YELLOW}Choose mode:{Colors.RESET}")
+    print(_YELLOW.format("Choose mode:"))
     print("  1. Step-by-step (press Enter after each turn)")
     print("  2. Auto-play (automatic with small delays)")
 
@@ -286,13 +363,15 @@ def main():
         battle,
         player_agent=HeuristicAgent(),
         enemy_agent=RandomAgent(),
-        auto_mode=auto_mode
+        auto_mode=auto_mode,
+        quiet=args.quiet,
+        verbose=args.verbose
     )
 
     try:
         step_battle.run_battle(max_turns=50)
     except KeyboardInterrupt:
-        print(f"\n\n{Colors.YELLOW}Battle interrupted by user.{Colors.RESET}")
+        print("\n\n" + _YELLOW.format("Battle interrupted by user."))
 
 
 if __name__ == "__main__":
@@ -1,26 +1,35 @@
 #!/usr/bin/env python3
 """Demo script to test the battle simulator."""
 import sys
+from itertools import islice
 from pathlib import Path
 
+import gymnasium as gym
+import numpy as np
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.simulator import (
-    GameDataLoader, BattleSimulator, BattleResult,
-    BattleEnv, Position
+    get_game_data, BattleSimulator, BattleResult,
+    BattleEnv, Position, Side
 )
 from src.ml.agents import RandomAgent, HeuristicAgent
 
+_SEPARATOR = "=" * 50
+
+
+def print_separator(title: str, leading_newline: bool = True) -> None:
+    """Print a title between separator bars in a single write."""
+    prefix = "\n" if leading_newline else ""
+    sys.stdout.write(f"{prefix}{_SEPARATOR}\n{title}\n{_SEPARATOR}\n")
+
 
 def test_data_loading():
     """Test that data loads correctly."""
-    print("=" * 50)
-    print("Testing Data Loading...")
-    print("=" * 50)
+    print_separator("Testing Data Loading...", leading_newline=False)
 
-    loader = GameDataLoader("data")
-    loader.load_all()
+    loader = get_game_data("data")
 
     print(f"Loaded {len(loader.units)} units")
     print(f"Loaded {len(loader.abilities)} abilities")
@@ -37,22 +46,21 @@ def test_data_loading():
     print(f"  HP: {sample_unit.stats.hp}")
     print(f"  Weapons: {len(sample_unit.weapons)}")
 
+    print("\nFirst player units:")
+    for unit in islice(loader.iter_player_units(), 5):
+        print(f"  #{unit.id} {unit.name} ({unit.class_type.name})")
+
     return loader
 
 
 def test_battle_simulation(loader):
     """Test running a battle."""
-    print("\n" + "=" * 50)
-    print("Testing Battle Simulation...")
-    print("=" * 50)
+    print_separator("Testing Battle Simulation...")
 
     simulator = BattleSimulator("data")
 
     # Get units that have weapons
-    units_with_weapons = [
-        uid for uid, unit in loader.units.items()
-        if unit.weapons
-    ][:8]
+    units_with_weapons = loader.units_with_weapons[:8]
 
     if len(units_with_weapons) < 4:
         print("Not enough units with weapons for demo")
@@ -92,22 +100,17 @@ def test_battle_simulation(loader):
 
     print(f"\nBattle Result: {result.name}")
     print(f"  Turns played: {battle.turn_number}")
-    print(f"  Player units alive: {sum(1 for u in battle.player_units if u.is_alive)}")
-    print(f"  Enemy units alive: {sum(1 for u in battle.enemy_units if u.is_alive)}")
+    print(f"  Player units alive: {battle.alive_count(Side.PLAYER)}")
+    print(f"  Enemy units alive: {battle.alive_count(Side.HOSTILE)}")
 
     return battle
 
 
 def test_gym_environment(loader):
     """Test the Gymnasium environment."""
-    print("\n" + "=" * 50)
-    print("Testing Gymnasium Environment...")
-    print("=" * 50)
+    print_separator("Testing Gymnasium Environment...")
 
-    units_with_weapons = [
-        uid for uid, unit in loader.units.items()
-        if unit.weapons
-    ][:8]
+    units_with_weapons = loader.units_with_weapons[:8]
 
     if len(units_with_weapons) < 4:
         print("Not enough units with weapons for demo")
@@ -125,46 +128,75 @@ def test_gym_environment(loader):
     print(f"  Observation space: {env.observation_space}")
     print(f"  Action space: {env.action_space}")
 
-    # Run a few episodes
-    total_reward = 0
-    wins = 0
+    # Run a few episodes concurrently, one per worker process
     episodes = 5
-
-    for ep in range(episodes):
-        obs, info = env.reset(seed=ep)
-        done = False
-        ep_reward = 0
-        steps = 0
-
-        while not done and steps < 100:
-            # Use action mask to select valid action
-            action_mask = info["action_mask"]
-            valid_actions = [i for i in range(len(action_mask)) if action_mask[i] == 1]
-
-            if valid_actions:
-                import random
-                action = random.choice(valid_actions)
+    envs = gym.vector.AsyncVectorEnv([
+        lambda: BattleEnv(
+            data_dir="data",
+            player_unit_ids=units_with_weapons[:2],
+            enemy_unit_ids=units_with_weapons[2:4],
+            enemy_positions=[0, 1]
+        )
+        for _ in range(episodes)
+    ])
+
+    obs, info = envs.reset(seed=list(range(episodes)))
+    rngs = [np.random.default_rng(ep) for ep in range(episodes)]
+    ep_rewards = np.zeros(episodes)
+    ep_steps = np.zeros(episodes, dtype=int)
+    results = ["N/A"] * episodes
+    done = np.zeros(episodes, dtype=bool)
+
+    # Only each env's first episode counts; finished envs autoreset and are ignored
+    for _ in range(100):
+        if done.all():
+            break
+
+        # Use action masks to select valid actions
+        actions = np.zeros(episodes, dtype=np.int64)
+        for i, mask in enumerate(info["action_mask"]):
+            valid_actions = np.flatnonzero(mask)
+            if valid_actions.size:
+                actions[i] = rngs[i].choice(valid_actions)
             else:
-                action = env.action_space.sample()
+                actions[i] = envs.single_action_space.sample()
 
-            obs, reward, terminated, truncated, info = env.step(action)
-            ep_reward += reward
-            done = terminated or truncated
-            steps += 1
+        obs, rewards, terminated, truncated, info = envs.step(actions)
+        active = ~done
+        ep_rewards[active] += rewards[active]
+        ep_steps[active] += 1
 
-        total_reward += ep_reward
-        if info.get("result") == "PLAYER_WIN":
-            wins += 1
+        finished = active & (terminated | truncated)
+        for i in np.flatnonzero(finished):
+            results[i] = info["result"][i]
+        done |= finished
 
-        print(f"  Episode {ep + 1}: Reward={ep_reward:.2f}, Steps={steps}, Result={info.get('result', 'N/A')}")
+    envs.close()
 
+    for ep in range(episodes):
+        print(f"  Episode {ep + 1}: Reward={ep_rewards[ep]:.2f}, Steps={ep_steps[ep]}, Result={results[ep]}")
+
+    wins = results.count("PLAYER_WIN")
     print(f"\nSummary over {episodes} episodes:")
     print(f"  Win rate: {wins/episodes:.1%}")
-    print(f"  Avg reward: {total_reward/episodes:.2f}")
+    print(f"  Avg reward: {ep_rewards.mean():.2f}")
 
     # Show render
+    # Deterministic rollout: always take the first valid action
+    print("\nFirst-valid-action rollout:")
+    env.reset(seed=0)
+    for step in range(5):
+        mask = env.action_masks()
+        action = int(np.argmax(mask))  # mask is 0/1, so argmax is the first valid index
+        if not mask[action]:
+            print(f"  Step {step + 1}: no valid actions")
+            break
+        _, reward, terminated, truncated, info = env.step(action)
+        print(f"  Step {step + 1}: action={action}, reward={reward:.2f}")
+        if terminated or truncated:
+            break
+
     print("\nSample render:")
-    env.reset()
     print(env.render())
 
     env.close()
@@ -172,8 +204,7 @@ def test_gym_environment(loader):
 
 def main():
     """Run all demo tests."""
-    print("Battle Simulator ML Demo")
-    print("========================\n")
+    sys.stdout.write("Battle Simulator ML Demo\n========================\n\n")
 
     # Test data loading
     loader = test_data_loading()
@@ -185,9 +216,7 @@ def main():
         # Test gym environment
         test_gym_environment(loader)
 
-    print("\n" + "=" * 50)
-    print("Demo Complete!")
-    print("=" * 50)
+    print_separator("Demo Complete!")
 
 
 if __name__ == "__main__":
@@ -13,7 +13,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.simulator import BattleSimulator
+from src.simulator import BattleSimulator, preload_game_data
 from src.utils.gui_visualizer import visualize_battle_gui
 
 
@@ -24,6 +24,9 @@ def main():
     print("=" * 70)
     print()
 
+    # Load game data while waiting for the user's choice
+    preload_game_data("data")
+
     # Ask user for battle type
     print("Choose battle type:")
     print("  1. Encounter 133 vs Unit 530 Rank 6 (from previous test)")
@@ -59,10 +62,7 @@ def main():
         print("\nCreating simple 2v2 battle...")
 
         # Find units with weapons
-        units_with_weapons = [
-            uid for uid, unit in simulator.data_loader.units.items()
-            if unit.weapons and len(unit.weapons) > 0
-        ][:4]
+        units_with_weapons = simulator.data_loader.units_with_weapons[:4]
 
         if len(units_with_weapons) < 4:
             print("ERROR: Not enough units with weapons!")
@@ -82,10 +82,7 @@ def main():
         # Custom battle with random units
         print("\nCreating random battle...")
 
-        units_with_weapons = [
-            uid for uid, unit in simulator.data_loader.units.items()
-            if unit.weapons
-        ][:8]
+        units_with_weapons = simulator.data_loader.units_with_weapons[:8]
 
         if len(units_with_weapons) < 4:
             print("ERROR: Not enough units with weapons!")
@@ -14,11 +14,11 @@ __all__ = [
 try:
     from .train import (
         TrainingConfig, Trainer, BattleMetricsCallback,
-        train_simple_battle, curriculum_training
+        make_vec_env, train_simple_battle, curriculum_training
     )
     __all__.extend([
         "TrainingConfig", "Trainer", "BattleMetricsCallback",
-        "train_simple_battle", "curriculum_training"
+        "make_vec_env", "train_simple_battle", "curriculum_training"
     ])
 except ImportError:
     # torch or stable-baselines3 not installed
@@ -6,6 +6,82 @@ import random
 import numpy as np
 
 from src.simulator.battle import BattleState, Action, BattleResult
+from src.simulator.enums import UnitClass
+from . import scoring
+
+
+class _ClassModTable:
+    """Class-advantage matrix built once per data loader and reused across turns."""
+
+    def __init__(self):
+        self._data_loader = None
+        self._matrix: Optional[np.ndarray] = None
+
+    def get(self, battle: BattleState) -> np.ndarray:
+        if battle.data_loader is not self._data_loader:
+            self._matrix = scoring.class_mod_matrix(battle.data_loader)
+            self._data_loader = battle.data_loader
+        return self._matrix
+
+
+def _weapon_table(battle: BattleState) -> dict[tuple[int, int], tuple[float, int, UnitClass]]:
+    """
+    Per-turn weapon facts for the acting side.
+
+    Returns:
+        (unit_index, weapon_id) -> (average base damage, primary ability cooldown, unit class)
+    """
+    get_ability = battle.data_loader.get_ability
+    table = {}
+    for unit_idx, unit in enumerate(battle.current_side_units):
+        class_type = unit.template.class_type
+        for weapon_id, weapon in unit.template.weapons.items():
+            ability_id = weapon.abilities[0] if weapon.abilities else None
+            ability = get_ability(ability_id) if ability_id else None
+            table[unit_idx, weapon_id] = (
+                (weapon.stats.base_damage_min + weapon.stats.base_damage_max) / 2,
+                ability.stats.ability_cooldown if ability else 0,
+                class_type,
+            )
+    return table
+
+
+class _TargetTable(dict):
+    """
+    Per-turn target facts by position, looked up once per position.
+
+    Maps target_position -> (unit, current hp, max hp, power, class,
+    opposing-side index or None), or None when no unit is there.
+    """
+
+    def __init__(self, battle: BattleState):
+        super().__init__()
+        self._battle = battle
+        self._opposing_index = {id(unit): i for i, unit in enumerate(battle.opposing_side_units)}
+
+    def __missing__(self, pos):
+        target = self._battle.get_unit_at_position(pos)
+        row = (
+            target, target.current_hp, target.template.stats.hp, target.template.stats.power,
+            target.template.class_type, self._opposing_index.get(id(target)),
+        ) if target else None
+        self[pos] = row
+        return row
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in O(N).
+
+    Matches a stable descending sort truncated to k: everything tied with
+    the k-th best is kept in index order before the final small sort.
+    """
+    if len(scores) > k:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
 
 
 class BaseAgent(ABC):
@@ -25,112 +101,127 @@ class RandomAgent(BaseAgent):
     """Agent that selects random legal actions."""
 
     def __init__(self, seed: Optional[int] = None):
-        self.rng = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
 
     def select_action(self, battle: BattleState) -> Optional[Action]:
         legal_actions = battle.get_legal_actions()
         if not legal_actions:
             return None
-        return self.rng.choice(legal_actions)
+        return legal_actions[self.rng.integers(len(legal_actions))]
+
+    def batch_select(self, legal_action_lists: list[list[Action]]) -> np.ndarray:
+        """
+        Pick one random index into each list of legal actions with a single draw.
+
+        Args:
+            legal_action_lists: Legal actions per environment (e.g. one per VectorBattleEnv slot)
+
+        Returns:
+            int64 array of chosen indices, -1 where a list is empty
+        """
+        lengths = np.fromiter(map(len, legal_action_lists), dtype=np.int64, count=len(legal_action_lists))
+        indices = (self.rng.random(len(lengths)) * lengths).astype(np.int64)
+        indices[lengths == 0] = -1
+        return indices
 
 
 class GreedyDamageAgent(BaseAgent):
     """Agent that prioritizes dealing maximum damage."""
 
+    def __init__(self):
+        self._class_mods = _ClassModTable()
+        scoring.warmup()
+
     def select_action(self, battle: BattleState) -> Optional[Action]:
         legal_actions = battle.get_legal_actions()
         if not legal_actions:
             return None
 
-        best_action = None
-        best_score = -float('inf')
-
-        for action in legal_actions:
-            score = self._evaluate_action(battle, action)
-            if score > best_score:
-                best_score = score
-                best_action = action
-
-        return best_action
-
-    def _evaluate_action(self, battle: BattleState, action: Action) -> float:
-        """Evaluate an action based on potential damage."""
-        units = battle.current_side_units
-        if action.unit_index >= len(units):
-            return -float('inf')
-
-        unit = units[action.unit_index]
-        weapon = unit.template.weapons.get(action.weapon_id)
-        if not weapon:
-            return -float('inf')
-
-        # Base score from weapon damage
-        score = (weapon.stats.base_damage_min + weapon.stats.base_damage_max) / 2
-
-        # Bonus for targeting low HP enemies
-        target = battle.get_unit_at_position(action.target_position)
-        if target:
-            hp_ratio = target.current_hp / target.template.stats.hp
-            # Prefer low HP targets (finishing blows)
-            score += (1 - hp_ratio) * 50
-
-            # Bonus for class advantage
-            class_mod = battle.data_loader.get_class_damage_mod(
-                unit.template.class_type.value,
-                target.template.class_type.value
-            )
-            score *= class_mod
-
-        return score
+        scores = self._evaluate_actions(battle, legal_actions)
+        best = int(np.argmax(scores))
+        if scores[best] == -np.inf:
+            return None
+        return legal_actions[best]
+
+    def _evaluate_actions(self, battle: BattleState, actions: list[Action]) -> np.ndarray:
+        """Evaluate every action based on potential damage, -inf for invalid ones."""
+        n = len(actions)
+        avg_damage = np.empty(n, dtype=np.float64)
+        hp_ratio = np.zeros(n, dtype=np.float64)
+        class_mod = np.ones(n, dtype=np.float64)
+        has_target = np.zeros(n, dtype=np.bool_)
+        valid = np.ones(n, dtype=np.bool_)
+
+        weapons = _weapon_table(battle)
+        targets = _TargetTable(battle)
+        class_mods = self._class_mods.get(battle)
+        for i, action in enumerate(actions):
+            weapon = weapons.get((action.unit_index, action.weapon_id))
+            if weapon is None:
+                valid[i] = False
+                avg_damage[i] = 0.0
+                continue
+
+            # Base score from weapon damage
+            avg_damage[i], _, unit_class = weapon
+
+            target = targets[action.target_position]
+            if target:
+                # Prefer low HP targets (finishing blows) and class advantage
+                _, hp, max_hp, _, target_class, _ = target
+                has_target[i] = True
+                hp_ratio[i] = hp / max_hp
+                class_mod[i] = class_mods[unit_class, target_class]
+
+        scores = scoring.greedy_scores(avg_damage, hp_ratio, class_mod, has_target)
+        scores[~valid] = -np.inf
+        return scores
 
 
 class FocusFireAgent(BaseAgent):
     """Agent that focuses fire on single targets until dead."""
 
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.current_target: Optional[int] = None
+        self.rng = random.Random(seed)
 
     def select_action(self, battle: BattleState) -> Optional[Action]:
         legal_actions = battle.get_legal_actions()
         if not legal_actions:
             return None
 
-        # Group actions by target
-        targets = {}
+        # Best action per target in one pass (only units on the opposing side count)
+        weapons = _weapon_table(battle)
+        targets = _TargetTable(battle)
+        best = {}  # target_idx -> (score, action)
         for action in legal_actions:
-            target = battle.get_unit_at_position(action.target_position)
-            if target and target.is_alive:
-                target_idx = battle.opposing_side_units.index(target)
-                if target_idx not in targets:
-                    targets[target_idx] = []
-                targets[target_idx].append(action)
-
-        if not targets:
-            return random.choice(legal_actions)
+            target = targets[action.target_position]
+            if target and target[0].is_alive:
+                target_idx = target[5]
+                if target_idx is None:
+                    continue
+                weapon = weapons.get((action.unit_index, action.weapon_id))
+                score = weapon[0] if weapon else 0
+                current = best.get(target_idx)
+                if current is None or score > current[0]:
+                    best[target_idx] = (score, action)
+
+        if not best:
+            return self.rng.choice(legal_actions)
 
         # Check if current target is still valid
-        if self.current_target is not None and self.current_target in targets:
+        if self.current_target is not None and self.current_target in best:
             target_idx = self.current_target
         else:
             # Select new target (prefer lowest HP)
             target_idx = min(
-                targets.keys(),
+                best.keys(),
                 key=lambda i: battle.opposing_side_units[i].current_hp
             )
             self.current_target = target_idx
 
-        # Select best action against target
-        target_actions = targets[target_idx]
-        return max(target_actions, key=lambda a: self._action_damage_estimate(battle, a))
-
-    def _action_damage_estimate(self, battle: BattleState, action: Action) -> float:
-        """Estimate damage from an action."""
-        units = battle.current_side_units
-        unit = units[action.unit_index]
-        weapon = unit.template.weapons.get(action.weapon_id)
-        if not weapon:
-            return 0
-        return (weapon.stats.base_damage_min + weapon.stats.base_damage_max) / 2
+        # Best action against target
+        return best[target_idx][1]
 
     def reset(self) -> None:
         self.current_target = None
@@ -148,87 +239,60 @@ class HeuristicAgent(BaseAgent):
     5. Protect low HP friendly units (attack threats)
     """
 
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.current_target: Optional[int] = None
         self.priority_targets: list[int] = []
+        self.rng = random.Random(seed)
+        self._class_mods = _ClassModTable()
+        scoring.warmup()
 
     def select_action(self, battle: BattleState) -> Optional[Action]:
         legal_actions = battle.get_legal_actions()
         if not legal_actions:
             return None
 
-        # Score all actions
-        scored_actions = []
-        for action in legal_actions:
-            score = self._score_action(battle, action)
-            scored_actions.append((score, action))
-
-        scored_actions.sort(reverse=True, key=lambda x: x[0])
+        # Score all actions and take the best 3 (ties keep legal-action order)
+        scores = self._score_actions(battle, legal_actions)
+        order = _top_k(scores, 3)
 
         # Add some randomness among top actions
-        top_actions = [a for s, a in scored_actions[:3] if s > scored_actions[0][0] - 10]
-        return random.choice(top_actions) if top_actions else scored_actions[0][1]
-
-    def _score_action(self, battle: BattleState, action: Action) -> float:
-        """Score an action based on heuristics."""
-        units = battle.current_side_units
-        unit = units[action.unit_index]
-        weapon = unit.template.weapons.get(action.weapon_id)
-        if not weapon:
-            return -1000
-
-        target = battle.get_unit_at_position(action.target_position)
-        if not target:
-            return -1000
-
-        score = 0.0
-
-        # Base damage estimate
-        avg_damage = (weapon.stats.base_damage_min + weapon.stats.base_damage_max) / 2
-        score += avg_damage
-
-        # Huge bonus for potential kills
-        if target.current_hp <= avg_damage * 1.5:
-            score += 200
-
-        # Class advantage bonus
-        class_mod = battle.data_loader.get_class_damage_mod(
-            unit.template.class_type.value,
-            target.template.class_type.value
-        )
-        if class_mod > 1.0:
-            score += (class_mod - 1.0) * 50
-        elif class_mod < 1.0:
-            score -= (1.0 - class_mod) * 30
-
-        # Focus fire bonus (same target as before)
-        if self.current_target is not None:
-            try:
-                if battle.opposing_side_units.index(target) == self.current_target:
-                    score += 20
-            except (ValueError, IndexError):
-                pass
-
-        # HP-based targeting (prefer low HP)
-        hp_ratio = target.current_hp / target.template.stats.hp
-        score += (1 - hp_ratio) * 30
-
-        # Threat assessment (prioritize high damage enemies)
-        enemy_power = target.template.stats.power
-        score += enemy_power * 0.5
-
-        # Penalize overkill
-        if avg_damage > target.current_hp * 2:
-            score -= 20
-
-        # Cooldown efficiency (prefer abilities we can use again soon)
-        ability_id = weapon.abilities[0] if weapon.abilities else None
-        if ability_id:
-            ability = battle.data_loader.get_ability(ability_id)
-            if ability and ability.stats.ability_cooldown > 2:
-                score -= ability.stats.ability_cooldown * 5
-
-        return score
+        best = scores[order[0]]
+        top_actions = [legal_actions[i] for i in order if scores[i] > best - 10]
+        return self.rng.choice(top_actions) if top_actions else legal_actions[order[0]]
+
+    def _score_actions(self, battle: BattleState, actions: list[Action]) -> np.ndarray:
+        """Score every action based on heuristics."""
+        features = np.zeros((len(actions), scoring.N_FEATURES), dtype=np.float64)
+
+        weapons = _weapon_table(battle)
+        targets = _TargetTable(battle)
+        class_mods = self._class_mods.get(battle)
+        for row, action in zip(features, actions):
+            weapon = weapons.get((action.unit_index, action.weapon_id))
+            if weapon is None:
+                continue
+
+            target = targets[action.target_position]
+            if not target:
+                continue
+
+            avg_damage, cooldown, unit_class = weapon
+            _, hp, max_hp, power, target_class, target_idx = target
+            row[scoring.VALID] = 1.0
+            row[scoring.AVG_DAMAGE] = avg_damage
+            row[scoring.TARGET_HP] = hp
+            row[scoring.TARGET_MAX_HP] = max_hp
+            row[scoring.CLASS_MOD] = class_mods[unit_class, target_class]
+            row[scoring.TARGET_POWER] = power
+
+            # Focus fire bonus (same target as before)
+            if self.current_target is not None and target_idx == self.current_target:
+                row[scoring.FOCUS] = 1.0
+
+            # Cooldown efficiency (prefer abilities we can use again soon)
+            row[scoring.COOLDOWN] = cooldown
+
+        return scoring.heuristic_scores(features)
 
     def reset(self) -> None:
         self.current_target = None
@@ -248,7 +312,7 @@ class MaskablePPOAgent(BaseAgent):
         obs = battle.get_state_vector()
 
         # Get action mask
-        action_mask = self.env._get_action_mask()
+        action_mask = self.env.action_masks()
 
         # Predict action
         action, _ = self.model.predict(obs, action_masks=action_mask, deterministic=True)
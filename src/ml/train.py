@@ -94,9 +94,44 @@ def make_env(
     return _init
 
 
+def make_vec_env(
+    n_envs: int,
+    data_dir: str,
+    seed: int = 0,
+    start_method: Optional[str] = None,
+    **env_kwargs
+) -> DummyVecEnv | SubprocVecEnv:
+    """
+    Create a vectorized training environment with one battle per worker process.
+
+    Each worker builds its own BattleEnv (and loads game data) from the picklable
+    make_env thunk, so nothing heavy is sent across processes. Every env is
+    already Monitor-wrapped; wrap the result in VecMonitor instead if per-env
+    Monitor files are not needed.
+
+    Args:
+        n_envs: Number of environments; 1 runs in-process with DummyVecEnv
+        data_dir: Path to game data directory
+        seed: Base seed; env i is seeded with seed + i
+        start_method: Multiprocessing start method for SubprocVecEnv
+            (None uses SB3's default: forkserver where available, else spawn)
+        **env_kwargs: Passed to make_env (encounter_id, unit ids, positions)
+
+    Returns:
+        SubprocVecEnv for n_envs > 1, otherwise DummyVecEnv
+    """
+    env_fns = [
+        make_env(data_dir, rank=i, seed=seed, **env_kwargs)
+        for i in range(n_envs)
+    ]
+    if n_envs > 1:
+        return SubprocVecEnv(env_fns, start_method=start_method)
+    return DummyVecEnv(env_fns)
+
+
 def get_action_mask_fn(env: BattleEnv) -> np.ndarray:
     """Action mask function for MaskablePPO."""
-    return env._get_action_mask()
+    return env.action_masks()
 
 
 class TrainingConfig:
@@ -109,6 +144,7 @@ class TrainingConfig:
         algorithm: str = "ppo",  # "ppo", "maskable_ppo", "dqn"
         total_timesteps: int = 1_000_000,
         n_envs: int = 4,
+        start_method: Optional[str] = None,  # SubprocVecEnv start method
         learning_rate: float = 3e-4,
         batch_size: int = 64,
         n_epochs: int = 10,
@@ -129,6 +165,7 @@ class TrainingConfig:
         self.algorithm = algorithm
         self.total_timesteps = total_timesteps
         self.n_envs = n_envs
+        self.start_method = start_method
         self.learning_rate = learning_rate
         self.batch_size = batch_size
         self.n_epochs = n_epochs
@@ -153,6 +190,7 @@ class TrainingConfig:
             "algorithm": self.algorithm,
             "total_timesteps": self.total_timesteps,
             "n_envs": self.n_envs,
+            "start_method": self.start_method,
             "learning_rate": self.learning_rate,
             "batch_size": self.batch_size,
             "n_epochs": self.n_epochs,
@@ -191,24 +229,17 @@ class Trainer:
         enemy_positions: Optional[list[int]] = None
     ) -> None:
         """Set up training and evaluation environments."""
-        # Training environments (vectorized)
-        env_fns = [
-            make_env(
-                self.config.data_dir,
-                encounter_id=encounter_id,
-                player_unit_ids=player_unit_ids,
-                enemy_unit_ids=enemy_unit_ids,
-                enemy_positions=enemy_positions,
-                rank=i,
-                seed=self.config.seed
-            )
-            for i in range(self.config.n_envs)
-        ]
-
-        if self.config.n_envs > 1:
-            self.train_env = SubprocVecEnv(env_fns)
-        else:
-            self.train_env = DummyVecEnv(env_fns)
+        # Training environments (vectorized, one process per env)
+        self.train_env = make_vec_env(
+            self.config.n_envs,
+            self.config.data_dir,
+            seed=self.config.seed,
+            start_method=self.config.start_method,
+            encounter_id=encounter_id,
+            player_unit_ids=player_unit_ids,
+            enemy_unit_ids=enemy_unit_ids,
+            enemy_positions=enemy_positions
+        )
 
         # Evaluation environment
         eval_env = BattleEnv(
@@ -474,6 +505,9 @@ if __name__ == "__main__":
     parser.add_argument("--timesteps", type=int, default=500_000, help="Total training timesteps")
     parser.add_argument("--algorithm", default="ppo", choices=["ppo", "maskable_ppo", "dqn"])
     parser.add_argument("--encounter-id", type=int, help="Encounter ID to train on")
+    parser.add_argument("--num-envs", type=int, default=4, help="Parallel environments (worker processes)")
+    parser.add_argument("--start-method", choices=["fork", "forkserver", "spawn"],
+                        help="Worker start method (default: forkserver where available)")
 
     args = parser.parse_args()
 
@@ -483,7 +517,9 @@ if __name__ == "__main__":
             data_dir=args.data_dir,
             output_dir=args.output_dir,
             algorithm=args.algorithm,
-            total_timesteps=args.timesteps
+            total_timesteps=args.timesteps,
+            n_envs=args.num_envs,
+            start_method=args.start_method
         )
         trainer = Trainer(config)
         trainer.setup_environments(encounter_id=args.encounter_id)
@@ -3,7 +3,7 @@ from .enums import (
     DamageType, UnitClass, UnitTag, UnitStatusEffect, UnitBlocking,
     StatusEffectType, StatusEffectFamily,
     TargetType, AttackDirection, LineOfFire, Side, BattleSide, CellType, LayoutId,
-    DAMAGE_TYPE_NAMES, STATUS_EFFECT_NAMES, UNIT_TAG_NAMES, UNIT_CLASS_NAMES,
+    DAMAGE_TYPE_NAMES, DAMAGE_MOD_KEYS, STATUS_EFFECT_NAMES, UNIT_TAG_NAMES, UNIT_CLASS_NAMES,
     TARGETABLE_ALL, TARGETABLE_GROUND, TARGETABLE_AIR, TARGETABLE_BUILDINGS
 )
 from .models import (
@@ -11,12 +11,12 @@ from .models import (
     WeaponStats, Weapon, UnitStats, UnitTemplate, StatusEffect,
     GridLayout, EncounterUnit, Encounter, GameConfig
 )
-from .data_loader import GameDataLoader
+from .data_loader import GameDataLoader, get_game_data, preload_game_data
 from .battle import (
-    BattleResult, ActiveStatusEffect, BattleUnit, Action, ActionResult,
-    BattleState, BattleSimulator
+    BattleResult, BattleArrays, ActionHistory, ActiveStatusEffect, BattleUnit, Action, ActionResult,
+    RolloutBatch, BattleState, BattleSimulator
 )
-from .gym_env import BattleEnv, MultiWaveBattleEnv, register_envs
+from .gym_env import BattleEnv, MultiWaveBattleEnv, VectorBattleEnv, register_envs
 from .combat import (
     TagResolver, TargetingSystem, DamageCalculator, StatusEffectSystem,
     DamageResult
@@ -28,20 +28,20 @@ __all__ = [
     "StatusEffectType", "StatusEffectFamily",
     "TargetType", "AttackDirection", "LineOfFire", "Side", "BattleSide", "CellType", "LayoutId",
     # Enum name mappings
-    "DAMAGE_TYPE_NAMES", "STATUS_EFFECT_NAMES", "UNIT_TAG_NAMES", "UNIT_CLASS_NAMES",
+    "DAMAGE_TYPE_NAMES", "DAMAGE_MOD_KEYS", "STATUS_EFFECT_NAMES", "UNIT_TAG_NAMES", "UNIT_CLASS_NAMES",
     "TARGETABLE_ALL", "TARGETABLE_GROUND", "TARGETABLE_AIR", "TARGETABLE_BUILDINGS",
     # Models
     "Position", "DamageArea", "TargetArea", "AbilityStats", "Ability",
     "WeaponStats", "Weapon", "UnitStats", "UnitTemplate", "StatusEffect",
     "GridLayout", "EncounterUnit", "Encounter", "GameConfig",
     # Data loader
-    "GameDataLoader",
+    "GameDataLoader", "get_game_data", "preload_game_data",
     # Battle
-    "BattleResult", "ActiveStatusEffect", "BattleUnit", "Action", "ActionResult",
-    "BattleState", "BattleSimulator",
+    "BattleResult", "BattleArrays", "ActionHistory", "ActiveStatusEffect", "BattleUnit", "Action", "ActionResult",
+    "RolloutBatch", "BattleState", "BattleSimulator",
     # Combat systems
     "TagResolver", "TargetingSystem", "DamageCalculator", "StatusEffectSystem",
     "DamageResult",
     # Gym
-    "BattleEnv", "MultiWaveBattleEnv", "register_envs"
+    "BattleEnv", "MultiWaveBattleEnv", "VectorBattleEnv", "register_envs"
 ]
@@ -0,0 +1,46 @@
+"""Fast lookup of an action inside a packed legal-action array."""
+from __future__ import annotations
+
+import numpy as np
+
+# Try to import numba (optional dependency)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def pack_actions(actions) -> np.ndarray:
+    """
+    Pack actions into an (N, 4) int32 array of (unit_index, weapon_id, x, y).
+
+    Args:
+        actions: Sequence of Action objects
+
+    Returns:
+        Array with one row per action, in the same order
+    """
+    flat = np.fromiter(
+        (v for a in actions
+         for v in (a.unit_index, a.weapon_id, a.target_position.x, a.target_position.y)),
+        dtype=np.int32,
+        count=4 * len(actions)
+    )
+    return flat.reshape(-1, 4)
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def find_match(actions_arr, u, w, x, y):
+        """Return the index of the row equal to (u, w, x, y), or -1."""
+        for i in range(actions_arr.shape[0]):
+            if (actions_arr[i, 0] == u and actions_arr[i, 1] == w and
+                    actions_arr[i, 2] == x and actions_arr[i, 3] == y):
+                return i
+        return -1
+else:
+    def find_match(actions_arr: np.ndarray, u: int, w: int, x: int, y: int) -> int:
+        """Return the index of the row equal to (u, w, x, y), or -1."""
+        hits = np.flatnonzero((actions_arr == (u, w, x, y)).all(axis=1))
+        return int(hits[0]) if hits.size else -1
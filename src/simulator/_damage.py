@@ -0,0 +1,64 @@
+"""Scalar damage arithmetic shared by the battle engine."""
+from __future__ import annotations
+
+# Try to import numba (optional dependency)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def damage_kernel(base_damage, attack, defense, class_mod, damage_percent):
+    """
+    Turn a rolled base damage into final damage before crits.
+
+    Args:
+        base_damage: Weapon damage roll
+        attack: Attack stat contribution
+        defense: Defender's defense
+        class_mod: Attacker-vs-defender class multiplier
+        damage_percent: Share of damage for this target (100 = full)
+
+    Returns:
+        Damage, at least 1
+    """
+    damage = base_damage + attack - defense
+    damage = max(1, damage)  # Minimum 1 damage
+    damage = int(damage * class_mod)
+    damage = int(damage * damage_percent / 100)
+    return max(1, damage)
+
+
+def split_damage(damage, damage_mod, armor_mod, armor_piercing, current_armor):
+    """
+    Apply type modifiers and split incoming damage between armor and HP.
+
+    Args:
+        damage: Incoming damage
+        damage_mod: Defender's multiplier for the damage type
+        armor_mod: Defender's armor multiplier for the damage type
+        armor_piercing: Fraction of damage that ignores armor
+        current_armor: Defender's remaining armor
+
+    Returns:
+        (modified_damage, remaining_armor, hp_loss)
+    """
+    modified_damage = int(damage * damage_mod)
+
+    # Apply to armor first (if present)
+    if current_armor > 0 and armor_piercing < 1.0:
+        armor_damage = int(modified_damage * (1 - armor_piercing))
+        armor_damage = int(armor_damage * armor_mod)
+
+        if armor_damage >= current_armor:
+            # Armor broken, remaining damage goes to HP
+            return modified_damage, 0, armor_damage - current_armor
+        return modified_damage, current_armor - armor_damage, 0
+
+    return modified_damage, current_armor, modified_damage
+
+
+if HAS_NUMBA:
+    damage_kernel = njit(cache=True)(damage_kernel)
+    split_damage = njit(cache=True)(split_damage)
@@ -1,7 +1,8 @@
 """Core battle simulator engine."""
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Optional, Iterator
+from copy import deepcopy
+from dataclasses import dataclass, field, fields, replace
+from typing import Optional, Iterator, Sequence
 from enum import Enum
 import random
 import numpy as np
@@ -9,13 +10,14 @@ import numpy as np
 from .enums import (
     DamageType, UnitClass, Side, BattleSide, CellType, TargetType,
     LineOfFire, AttackDirection, StatusEffectType,
-    DAMAGE_TYPE_NAMES, TARGETABLE_ALL
+    DAMAGE_TYPE_NAMES, DAMAGE_MOD_KEYS, TARGETABLE_ALL
 )
 from .models import (
     Position, UnitTemplate, Ability, Weapon, StatusEffect,
     GridLayout, Encounter, GameConfig
 )
-from .data_loader import GameDataLoader
+from .data_loader import GameDataLoader, get_game_data
+from ._damage import damage_kernel, split_damage
 
 
 class BattleResult(Enum):
@@ -27,14 +29,190 @@ class BattleResult(Enum):
 
 
 @dataclass
+class BattleArrays:
+    """
+    Structure-of-arrays mirror of per-unit battle state.
+
+    Slots [0, num_player) hold player units and [num_player, n) hold enemy
+    units, in list order. BattleUnit writes through to these arrays, so hot
+    scans (alive counts, HP totals) can use vectorized reductions instead of
+    walking unit objects. Living units are also indexed by cell, so position
+    lookups are a dict hit rather than a scan.
+    """
+    hp: np.ndarray        # int32
+    max_hp: np.ndarray    # int32
+    pos_x: np.ndarray     # int32
+    pos_y: np.ndarray     # int32
+    is_alive: np.ndarray  # uint8
+    side: np.ndarray      # uint8: 0 = player team, 1 = enemy team
+    num_player: int = 0
+
+    # Living unit counts, maintained on is_alive transitions
+    alive_player: int = 0
+    alive_enemy: int = 0
+
+    # Uniform-grid index: (side, x, y) -> slot of the first living unit there
+    cells: dict[tuple[int, int, int], int] = field(default_factory=dict)
+
+    @classmethod
+    def bind(cls, player_units: list["BattleUnit"], enemy_units: list["BattleUnit"]) -> "BattleArrays":
+        """Build arrays from unit lists and attach each unit to its slot."""
+        units = player_units + enemy_units
+        is_alive = np.array([u.is_alive for u in units], dtype=np.uint8)
+        side = np.array([0] * len(player_units) + [1] * len(enemy_units), dtype=np.uint8)
+        alive_player, alive_enemy = np.bincount(side[is_alive.astype(bool)], minlength=2).tolist()
+        arrays = cls(
+            hp=np.array([u.current_hp for u in units], dtype=np.int32),
+            max_hp=np.array([u.template.stats.hp for u in units], dtype=np.int32),
+            pos_x=np.array([u.position.x for u in units], dtype=np.int32),
+            pos_y=np.array([u.position.y for u in units], dtype=np.int32),
+            is_alive=is_alive,
+            side=side,
+            num_player=len(player_units),
+            alive_player=alive_player,
+            alive_enemy=alive_enemy
+        )
+        for slot, unit in enumerate(units):
+            unit._arrays = arrays
+            unit._slot = slot
+            if unit.is_alive:
+                arrays._occupy(slot)
+        return arrays
+
+    def _cell_key(self, slot: int) -> tuple[int, int, int]:
+        return int(self.side[slot]), int(self.pos_x[slot]), int(self.pos_y[slot])
+
+    def _occupy(self, slot: int) -> None:
+        """Index a living unit at its cell (the lowest slot wins a shared cell)."""
+        key = self._cell_key(slot)
+        current = self.cells.get(key)
+        if current is None or slot < current:
+            self.cells[key] = slot
+
+    def _vacate(self, slot: int) -> None:
+        """Drop a unit from its cell, promoting any other living unit there."""
+        key = self._cell_key(slot)
+        if self.cells.get(key) != slot:
+            return
+        side, x, y = key
+        others = np.flatnonzero(
+            self.is_alive.astype(bool) & (self.side == side) & (self.pos_x == x) & (self.pos_y == y)
+        )
+        others = others[others != slot]
+        if others.size:
+            self.cells[key] = int(others[0])
+        else:
+            del self.cells[key]
+
+    def slot_at(self, side: int, x: int, y: int) -> int:
+        """Slot of the living unit at a cell on a side (0 = player team), or -1."""
+        return self.cells.get((side, x, y), -1)
+
+    @property
+    def player_slice(self) -> slice:
+        return slice(0, self.num_player)
+
+    @property
+    def enemy_slice(self) -> slice:
+        return slice(self.num_player, len(self.hp))
+
+    def hp_by_side(self) -> tuple[int, int]:
+        """Total current HP of (player team, enemy team) in one pass."""
+        player, enemy = np.bincount(self.side, weights=self.hp, minlength=2)
+        return int(player), int(enemy)
+
+    def max_hp_by_side(self) -> tuple[int, int]:
+        """Total max HP of (player team, enemy team) in one pass."""
+        player, enemy = np.bincount(self.side, weights=self.max_hp, minlength=2)
+        return int(player), int(enemy)
+
+    def update(self, slot: int, name: str, value) -> None:
+        """Mirror a BattleUnit attribute write into the arrays."""
+        if name == "current_hp":
+            self.hp[slot] = value
+        elif name == "is_alive":
+            delta = int(bool(value)) - int(self.is_alive[slot])
+            if delta:
+                if slot < self.num_player:
+                    self.alive_player += delta
+                else:
+                    self.alive_enemy += delta
+            self.is_alive[slot] = value
+            if delta > 0:
+                self._occupy(slot)
+            elif delta < 0:
+                self._vacate(slot)
+        elif name == "position":
+            alive = bool(self.is_alive[slot])
+            if alive:
+                self._vacate(slot)
+            self.pos_x[slot] = value.x
+            self.pos_y[slot] = value.y
+            if alive:
+                self._occupy(slot)
+
+
+class ActionHistory:
+    """
+    Compact record of executed actions.
+
+    Rows of (unit_index, weapon_id, target x, target y) are stored in a
+    growable int16 buffer rather than as Action objects; iterating
+    rebuilds Actions on demand.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._buf = np.empty((capacity, 4), dtype=np.int16)
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, action: "Action") -> None:
+        """Record an action, doubling the buffer when full."""
+        if self._len == len(self._buf):
+            grown = np.empty((2 * len(self._buf), 4), dtype=np.int16)
+            grown[:self._len] = self._buf[:self._len]
+            self._buf = grown
+        self._buf[self._len] = (
+            action.unit_index, action.weapon_id,
+            action.target_position.x, action.target_position.y
+        )
+        self._len += 1
+
+    def copy(self) -> "ActionHistory":
+        """Independent copy of the history."""
+        history = ActionHistory.__new__(ActionHistory)
+        history._buf = self._buf.copy()
+        history._len = self._len
+        return history
+
+    def as_array(self) -> np.ndarray:
+        """Get a view of the recorded rows, shape (len, 4)."""
+        return self._buf[:self._len]
+
+    def __iter__(self) -> Iterator["Action"]:
+        for u, w, x, y in self.as_array().tolist():
+            yield Action(u, w, Position(x, y))
+
+
+# BattleUnit attributes mirrored into BattleArrays
+_MIRRORED_FIELDS = frozenset(("current_hp", "is_alive", "position"))
+
+
+@dataclass(slots=True)
 class ActiveStatusEffect:
     """An active status effect on a unit."""
     effect: StatusEffect
     remaining_turns: int
     source_damage: float = 0.0  # For DOT calculation
 
+    def clone(self) -> "ActiveStatusEffect":
+        """Copy the countdown state; the effect definition is shared game data."""
+        return replace(self)
 
-@dataclass
+
+@dataclass(slots=True)
 class BattleUnit:
     """A unit instance in battle."""
     template: UnitTemplate
@@ -60,6 +238,21 @@ class BattleUnit:
     charging_weapon: Optional[int] = None
     charge_turns_remaining: int = 0
 
+    # Slot in the owning BattleState's arrays (attached by BattleArrays.bind)
+    _arrays: Optional[BattleArrays] = field(default=None, init=False, repr=False, compare=False)
+    _slot: int = field(default=-1, init=False, repr=False, compare=False)
+
+    # Defender class -> damage multiplier for this unit's class (attached by BattleState)
+    _class_mods: dict[int, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if name in _MIRRORED_FIELDS:
+            # _arrays is still unset while __init__ assigns the mirrored fields
+            arrays = getattr(self, "_arrays", None)
+            if arrays is not None:
+                arrays.update(self._slot, name, value)
+
     def __post_init__(self):
         self.current_hp = self.template.stats.hp
         self.current_armor = self.template.stats.armor_hp
@@ -68,6 +261,23 @@ class BattleUnit:
             if weapon.stats.ammo >= 0:
                 self.ammo[weapon_id] = weapon.stats.ammo
 
+    def clone(self) -> "BattleUnit":
+        """
+        Copy the unit's mutable battle state.
+
+        The template is shared, not copied. The clone is detached from any
+        BattleArrays until a BattleState binds it.
+        """
+        unit = object.__new__(BattleUnit)
+        for name in _UNIT_FIELDS:
+            object.__setattr__(unit, name, getattr(self, name))
+        unit._arrays = None
+        unit._slot = -1
+        unit.weapon_cooldowns = self.weapon_cooldowns.copy()
+        unit.ammo = self.ammo.copy()
+        unit.status_effects = [effect.clone() for effect in self.status_effects]
+        return unit
+
     @property
     def hp_percent(self) -> float:
         """Get current HP as percentage."""
@@ -80,33 +290,19 @@ class BattleUnit:
             return 0
 
         # Get damage type name for modifier lookup
-        dtype_name = {
-            DamageType.PIERCING: "piercing",
-            DamageType.CRUSHING: "crushing",
-            DamageType.EXPLOSIVE: "explosive",
-            DamageType.FIRE: "fire",
-            DamageType.COLD: "cold",
-        }.get(damage_type, "piercing")
-
-        # Apply damage modifiers
-        damage_mod = self.template.stats.damage_mods.get(dtype_name, 1.0)
-        modified_damage = int(damage * damage_mod)
-
-        # Apply to armor first (if present)
-        if self.current_armor > 0 and armor_piercing < 1.0:
-            armor_damage = int(modified_damage * (1 - armor_piercing))
-            armor_mod = self.template.stats.armor_damage_mods.get(dtype_name, 1.0)
-            armor_damage = int(armor_damage * armor_mod)
-
-            if armor_damage >= self.current_armor:
-                # Armor broken, remaining damage goes to HP
-                overflow = armor_damage - self.current_armor
-                self.current_armor = 0
-                self.current_hp -= overflow
-            else:
-                self.current_armor -= armor_damage
-        else:
-            self.current_hp -= modified_damage
+        dtype_name = DAMAGE_MOD_KEYS[damage_type] if 0 <= damage_type < len(DAMAGE_MOD_KEYS) else "piercing"
+
+        # Apply damage modifiers, armor first (if present)
+        stats = self.template.stats
+        damage_mod = stats.damage_mods.get(dtype_name, 1.0)
+        armor_mod = stats.armor_damage_mods.get(dtype_name, 1.0) if self.current_armor > 0 else 1.0
+        modified_damage, armor, hp_loss = split_damage(
+            damage, damage_mod, armor_mod, armor_piercing, self.current_armor
+        )
+        if armor != self.current_armor:
+            self.current_armor = armor
+        if hp_loss:
+            self.current_hp -= hp_loss
 
         # Check death
         if self.current_hp <= 0:
@@ -168,6 +364,9 @@ class BattleUnit:
 
     def tick_status_effects(self) -> int:
         """Process status effects. Returns DOT damage taken."""
+        if not self.status_effects:
+            return 0
+
         dot_damage = 0
         remaining_effects = []
 
@@ -190,7 +389,11 @@ class BattleUnit:
         return dot_damage
 
 
-@dataclass
+# BattleUnit field names, copied one by one by BattleUnit.clone
+_UNIT_FIELDS = tuple(f.name for f in fields(BattleUnit))
+
+
+@dataclass(slots=True)
 class Action:
     """A battle action (unit uses ability on target)."""
     unit_index: int
@@ -198,7 +401,7 @@ class Action:
     target_position: Position
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionResult:
     """Result of executing an action."""
     success: bool
@@ -208,6 +411,18 @@ class ActionResult:
     message: str = ""
 
 
+@dataclass
+class RolloutBatch:
+    """Outcomes of a batch of rollouts, one row per rollout."""
+    results: np.ndarray  # int8 BattleResult values
+    turns: np.ndarray    # int32 turns played
+    hp: np.ndarray       # int32 (n, units) final HP in BattleArrays slot order
+
+    def win_rate(self) -> float:
+        """Fraction of rollouts the player won."""
+        return float(np.mean(self.results == BattleResult.PLAYER_WIN.value)) if len(self.results) else 0.0
+
+
 class BattleState:
     """Complete state of a battle."""
 
@@ -225,6 +440,15 @@ class BattleState:
         self.enemy_units = enemy_units
         self.player_is_attacker = player_is_attacker
 
+        # Per-unit state as parallel arrays for vectorized scans
+        self.arrays = BattleArrays.bind(player_units, enemy_units)
+        self._units_by_slot = player_units + enemy_units
+
+        # Each unit's row of the class damage table, so damage rolls skip the config lookup
+        class_damage_mods = data_loader.config.class_damage_mods if data_loader.config else {}
+        for unit in self._units_by_slot:
+            unit._class_mods = class_damage_mods.get(unit.template.class_type.value, {})
+
         # Turn tracking
         self.turn_number = 0
         self.is_player_turn = True  # Player always goes first
@@ -233,102 +457,185 @@ class BattleState:
         self.result = BattleResult.IN_PROGRESS
 
         # Action history for replay
-        self.action_history: list[tuple[Action, ActionResult]] = []
+        self.action_history = ActionHistory()
 
-        # RNG state (for reproducibility)
+        # Splash cells per (ability id, target x, target y); shared with clones
+        self._aoe_cache: dict[tuple[int, int, int], tuple[tuple[int, int, float], ...]] = {}
+        # Targetable unit tags per ability id (None = unrestricted); shared with clones
+        self._tag_cache: dict[int, Optional[frozenset[int]]] = {}
+        # Summed tag crit bonus per (ability id, defender template id); shared with clones
+        self._crit_cache: dict[tuple[int, int], float] = {}
+
+        # Per-battle RNG state (for reproducibility); never the module-level generators,
+        # so battles can run side by side in threads or worker processes
         self.rng = random.Random()
+        self.np_rng = np.random.default_rng()
+
+    def clone(self) -> "BattleState":
+        """
+        Copy the battle for search or rollouts.
+
+        Units, history and RNG state are copied; game data, the layout and
+        unit templates are shared.
+        """
+        state = BattleState(
+            data_loader=self.data_loader,
+            layout=self.layout,
+            player_units=[unit.clone() for unit in self.player_units],
+            enemy_units=[unit.clone() for unit in self.enemy_units],
+            player_is_attacker=self.player_is_attacker
+        )
+        state.turn_number = self.turn_number
+        state.is_player_turn = self.is_player_turn
+        state.result = self.result
+        state.action_history = self.action_history.copy()
+        state._aoe_cache = self._aoe_cache
+        state._tag_cache = self._tag_cache
+        state._crit_cache = self._crit_cache
+        state.rng.setstate(self.rng.getstate())
+        state.np_rng.bit_generator.state = self.np_rng.bit_generator.state
+        return state
 
     def seed(self, seed: int) -> None:
         """Set RNG seed for reproducibility."""
         self.rng.seed(seed)
+        self.np_rng = np.random.default_rng(seed)
+
+    def alive_count(self, side: Side) -> int:
+        """Get the number of living units on a side (Side.PLAYER for the player team)."""
+        if side == Side.PLAYER:
+            return self.arrays.alive_player
+        return self.arrays.alive_enemy
+
+    @property
+    def is_player_turn(self) -> bool:
+        """Whether the player team acts this turn."""
+        return self._is_player_turn
+
+    @is_player_turn.setter
+    def is_player_turn(self, value: bool) -> None:
+        # Swap the cached side lists along with the flag, so hot paths read
+        # _acting / _targets instead of re-selecting on every call
+        self._is_player_turn = value
+        if value:
+            self._acting, self._targets = self.player_units, self.enemy_units
+        else:
+            self._acting, self._targets = self.enemy_units, self.player_units
 
     @property
     def current_side_units(self) -> list[BattleUnit]:
         """Get units for the current turn's side."""
-        return self.player_units if self.is_player_turn else self.enemy_units
+        return self._acting
 
     @property
     def opposing_side_units(self) -> list[BattleUnit]:
         """Get units for the opposing side."""
-        return self.enemy_units if self.is_player_turn else self.player_units
+        return self._targets
 
     def get_unit_at_position(self, pos: Position, side: Optional[Side] = None) -> Optional[BattleUnit]:
-        """Get unit at a specific position."""
-        units = (self.player_units + self.enemy_units) if side is None else (
-            self.player_units if side == Side.PLAYER else self.enemy_units
-        )
-        for unit in units:
-            if unit.is_alive and unit.position == pos:
-                return unit
-        return None
+        """Get the living unit at a position (player team first when side is None)."""
+        slot_at = self.arrays.slot_at
+        if side is None:
+            slot = slot_at(0, pos.x, pos.y)
+            if slot < 0:
+                slot = slot_at(1, pos.x, pos.y)
+        else:
+            slot = slot_at(0 if side == Side.PLAYER else 1, pos.x, pos.y)
+        return self._units_by_slot[slot] if slot >= 0 else None
 
-    def get_valid_targets(self, attacker: BattleUnit, weapon_id: int) -> list[Position]:
-        """Get all valid target positions for a weapon."""
+    def get_valid_targets(
+        self,
+        attacker: BattleUnit,
+        weapon_id: int,
+        candidates: Optional[list[tuple[BattleUnit, int, list[int]]]] = None
+    ) -> list[Position]:
+        """
+        Get all valid target positions for a weapon.
+
+        Args:
+            attacker: Unit using the weapon
+            weapon_id: Weapon to check
+            candidates: Living opposing units as (unit, cell, tags), from
+                _target_candidates(); built here when not given
+
+        Returns:
+            Positions of the units the weapon's ability can hit
+        """
         weapon = attacker.template.weapons.get(weapon_id)
         if not weapon or not weapon.abilities:
             return []
 
-        # Get ability stats (use first ability)
-        ability_id = weapon.abilities[0]
-        ability = self.data_loader.get_ability(ability_id)
+        # Get ability stats (use first ability, resolved at load time)
+        ability = weapon.primary_ability or self.data_loader.get_ability(weapon.abilities[0])
         if not ability:
             return []
 
+        if candidates is None:
+            candidates = self._target_candidates()
+
         stats = ability.stats
+        accepted_tags = self._accepted_tags(ability)
+        min_range, max_range = stats.min_range, stats.max_range
+        direct = stats.line_of_fire == LineOfFire.DIRECT
+        attacker_pos = attacker.position
+        attacker_cell = self.layout.cell_of(attacker_pos)
+        distances = self.layout.distance_rows[attacker_cell] if attacker_cell >= 0 else None
         valid_targets = []
 
-        # Determine which side to target
-        target_units = self.opposing_side_units
+        for target_unit, cell, tags in candidates:
+            # Check target tags (None means the ability hits any unit)
+            if accepted_tags is not None and accepted_tags.isdisjoint(tags):
+                continue
 
-        for target_unit in target_units:
-            if not target_unit.is_alive:
+            # Check range from the layout's distance table (off-grid units fall back)
+            if distances is not None and cell >= 0:
+                distance = distances[cell]
+            else:
+                distance = self._calculate_distance(attacker_pos, target_unit.position)
+            if distance < min_range or distance > max_range:
                 continue
 
-            # Check if unit can be targeted by this ability
-            if not self._can_target_unit(attacker, target_unit, stats):
+            # Check line of fire
+            if direct and not self._has_line_of_sight(attacker_pos, target_unit.position):
                 continue
 
             valid_targets.append(target_unit.position)
 
         return valid_targets
 
-    def _can_target_unit(self, attacker: BattleUnit, target: BattleUnit, stats) -> bool:
-        """Check if attacker can target this unit with given ability stats."""
-        # Check target tags
-        if stats.targets:
-            has_valid_tag = False
-
-            # Check if target has any of the required tags (or child tags via hierarchy)
-            for ability_tag in stats.targets:
-                # Direct tag match
-                if ability_tag in target.template.tags:
-                    has_valid_tag = True
-                    break
-
-                # Check tag hierarchy - does this ability tag include any of the target's tags?
-                child_tags = self.data_loader.config.tag_hierarchy.get(ability_tag, [])
-                if any(target_tag in child_tags for target_tag in target.template.tags):
-                    has_valid_tag = True
-                    break
-
-            # TARGETABLE_ALL (39) is a special tag that matches most units
-            if TARGETABLE_ALL in stats.targets:
-                has_valid_tag = True
-
-            if not has_valid_tag:
-                return False
-
-        # Check range
-        distance = self._calculate_distance(attacker.position, target.position)
-        if distance < stats.min_range or distance > stats.max_range:
-            return False
+    def _target_candidates(self) -> list[tuple[BattleUnit, int, list[int]]]:
+        """Living opposing units with their layout cell (-1 if off-grid) and tags, for target scans."""
+        cell_of = self.layout.cell_of
+        return [
+            (unit, cell_of(unit.position), unit.template.tags)
+            for unit in self._targets
+            if unit.is_alive
+        ]
 
-        # Check line of fire
-        if stats.line_of_fire == LineOfFire.DIRECT:
-            if not self._has_line_of_sight(attacker.position, target.position):
-                return False
+    def _accepted_tags(self, ability: Ability) -> Optional[frozenset[int]]:
+        """
+        Unit tags an ability may target, expanded through the tag hierarchy.
 
-        return True
+        Returns None when the ability has no tag restriction. Cached per
+        ability id and shared with clones, since game data never changes.
+        """
+        try:
+            return self._tag_cache[ability.id]
+        except KeyError:
+            pass
+
+        targets = ability.stats.targets
+        if not targets or TARGETABLE_ALL in targets:
+            # TARGETABLE_ALL is a special tag that matches most units
+            accepted = None
+        else:
+            hierarchy = self.data_loader.config.tag_hierarchy if self.data_loader.config else {}
+            # A target matches an ability tag directly or through that tag's children
+            accepted = frozenset(targets).union(
+                *(hierarchy.get(ability_tag, ()) for ability_tag in targets)
+            )
+        self._tag_cache[ability.id] = accepted
+        return accepted
 
     def _calculate_distance(
         self,
@@ -366,24 +673,36 @@ class BattleState:
             # Same column - check for blockers
             min_y = min(attacker_pos.y, target_pos.y)
             max_y = max(attacker_pos.y, target_pos.y)
+            # The cell index only holds living units, on either team
+            cells = self.arrays.cells
+            x = attacker_pos.x
             for y in range(min_y + 1, max_y):
-                blocking_pos = Position(attacker_pos.x, y)
-                blocking_unit = self.get_unit_at_position(blocking_pos)
-                if blocking_unit and blocking_unit.is_alive:
+                if (0, x, y) in cells or (1, x, y) in cells:
                     return False
         return True
 
+    def action_signature(self) -> tuple[int, int, bool]:
+        """
+        Cheap key for the legal-action set.
+
+        execute_action appends to the history and end_turn flips the side,
+        so the key changes on every move made through the battle API.
+        """
+        return len(self.action_history), self.turn_number, self.is_player_turn
+
     def get_legal_actions(self) -> list[Action]:
         """Get all legal actions for the current turn."""
         actions = []
-        units = self.current_side_units
+        units = self._acting
+        # The opposing side is fixed for the whole turn, so scan it once
+        candidates = self._target_candidates()
 
         for unit_idx, unit in enumerate(units):
             if not unit.can_act():
                 continue
 
             for weapon_id in unit.get_available_weapons():
-                valid_targets = self.get_valid_targets(unit, weapon_id)
+                valid_targets = self.get_valid_targets(unit, weapon_id, candidates)
                 for target_pos in valid_targets:
                     actions.append(Action(
                         unit_index=unit_idx,
@@ -393,9 +712,46 @@ class BattleState:
 
         return actions
 
+    def sample_random_action(self, rng: random.Random) -> Optional[Action]:
+        """
+        Pick a uniformly random legal action without building the full list.
+
+        Targets are gathered per weapon and a single index is drawn across
+        them, so only the chosen Action is created. The draw matches
+        rng.choice(get_legal_actions()) for the same RNG state.
+
+        Args:
+            rng: Random source for the pick
+
+        Returns:
+            The chosen action, or None if no action is legal
+        """
+        candidates = self._target_candidates()
+        groups = []
+        total = 0
+
+        for unit_idx, unit in enumerate(self._acting):
+            if not unit.can_act():
+                continue
+
+            for weapon_id in unit.get_available_weapons():
+                valid_targets = self.get_valid_targets(unit, weapon_id, candidates)
+                if valid_targets:
+                    groups.append((unit_idx, weapon_id, valid_targets))
+                    total += len(valid_targets)
+
+        if not total:
+            return None
+
+        k = rng.randrange(total)
+        for unit_idx, weapon_id, valid_targets in groups:
+            if k < len(valid_targets):
+                return Action(unit_index=unit_idx, weapon_id=weapon_id, target_position=valid_targets[k])
+            k -= len(valid_targets)
+
     def execute_action(self, action: Action) -> ActionResult:
         """Execute a battle action."""
-        units = self.current_side_units
+        units = self._acting
         if action.unit_index >= len(units):
             return ActionResult(success=False, message="Invalid unit index")
 
@@ -412,7 +768,7 @@ class BattleState:
         if not ability_id:
             return ActionResult(success=False, message="No ability for weapon")
 
-        ability = self.data_loader.get_ability(ability_id)
+        ability = weapon.primary_ability or self.data_loader.get_ability(ability_id)
         if not ability:
             return ActionResult(success=False, message="Ability not found")
 
@@ -429,7 +785,7 @@ class BattleState:
             unit.ammo[action.weapon_id] = unit.ammo.get(action.weapon_id, 0) - 1
 
         # Record action
-        self.action_history.append((action, result))
+        self.action_history.append(action)
 
         return result
 
@@ -445,23 +801,30 @@ class BattleState:
         stats = ability.stats
 
         # Get target unit(s) based on AOE pattern
-        targets = self._get_aoe_targets(target_pos, stats)
+        targets = self._get_aoe_targets(target_pos, ability)
+
+        # Scalar draws from the Mersenne Twister are cheaper than a batched
+        # numpy draw at 3-5 rolls per target, so just skip the method lookups
+        roll = self.rng.random
+        status_effects = stats.status_effects.items()
+        # Fixed for every target of this attack
+        attack = self._attack_power(attacker, weapon, ability)
 
         for target_unit, damage_percent in targets:
             if not target_unit.is_alive:
                 continue
 
             # Calculate damage
-            damage = self._calculate_damage(attacker, target_unit, weapon, ability, damage_percent)
+            damage = self._calculate_damage(attacker, target_unit, weapon, ability, damage_percent, attack)
 
             # Roll for hit/miss
             hit_chance = self._calculate_hit_chance(attacker, target_unit)
-            if self.rng.random() * 100 > hit_chance:
+            if roll() * 100 > hit_chance:
                 continue  # Miss
 
             # Roll for crit
             crit_chance = self._calculate_crit_chance(attacker, target_unit, ability)
-            is_crit = self.rng.random() * 100 < crit_chance
+            is_crit = roll() * 100 < crit_chance
             if is_crit:
                 damage = int(damage * 1.5)  # 50% crit bonus
 
@@ -480,8 +843,8 @@ class BattleState:
                 result.kills.append(target_idx)
 
             # Apply status effects
-            for effect_id, apply_chance in stats.status_effects.items():
-                if self.rng.random() * 100 < apply_chance:
+            for effect_id, apply_chance in status_effects:
+                if roll() * 100 < apply_chance:
                     effect = self.data_loader.status_effects.get(effect_id)
                     if effect and effect_id not in target_unit.template.stats.status_effect_immunities:
                         target_unit.status_effects.append(ActiveStatusEffect(
@@ -493,7 +856,7 @@ class BattleState:
 
         return result
 
-    def _get_aoe_targets(self, target_pos: Position, stats) -> list[tuple[BattleUnit, float]]:
+    def _get_aoe_targets(self, target_pos: Position, ability: Ability) -> list[tuple[BattleUnit, float]]:
         """Get all units affected by an AOE attack."""
         targets = []
 
@@ -502,18 +865,33 @@ class BattleState:
         if primary and primary.is_alive:
             targets.append((primary, 100.0))
 
-        # AOE splash from damage_area
-        for area in stats.damage_area:
-            if area.pos.x == 0 and area.pos.y == 0:
-                continue  # Skip primary target position
-
-            splash_pos = Position(
-                target_pos.x + area.pos.x,
-                target_pos.y + area.pos.y
+        # AOE splash from damage_area; the pattern is fixed per ability, so the
+        # absolute cells for a target tile are computed once and reused
+        key = (ability.id, target_pos.x, target_pos.y)
+        splash = self._aoe_cache.get(key)
+        if splash is None:
+            # Shift the ability's load-time offset array in one step instead of
+            # reading each entry's Position
+            stats = ability.stats
+            offsets = stats.damage_offsets
+            cells = (offsets + (target_pos.x, target_pos.y)).tolist()
+            splashes = offsets.any(axis=1).tolist()  # Skip primary target position
+            splash = tuple(
+                (x, y, area.damage_percent)
+                for (x, y), is_splash, area in zip(cells, splashes, stats.damage_area)
+                if is_splash
             )
-            splash_unit = self.get_unit_at_position(splash_pos)
-            if splash_unit and splash_unit.is_alive:
-                targets.append((splash_unit, area.damage_percent))
+            self._aoe_cache[key] = splash
+
+        slot_at = self.arrays.slot_at
+        units = self._units_by_slot
+        for x, y, damage_percent in splash:
+            # Same lookup as get_unit_at_position: player team first
+            slot = slot_at(0, x, y)
+            if slot < 0:
+                slot = slot_at(1, x, y)
+            if slot >= 0:
+                targets.append((units[slot], damage_percent))
 
         return targets
 
@@ -523,38 +901,44 @@ class BattleState:
         defender: BattleUnit,
         weapon: Weapon,
         ability: Ability,
-        damage_percent: float = 100.0
+        damage_percent: float = 100.0,
+        attack: Optional[float] = None
     ) -> int:
-        """Calculate damage dealt by an attack."""
-        stats = ability.stats
+        """
+        Calculate damage dealt by an attack.
+
+        Args:
+            attack: Precomputed _attack_power for this attacker and ability,
+                so multi-target attacks evaluate it once
+        """
         weapon_stats = weapon.stats
 
-        # Base damage from weapon
-        base_damage = self.rng.randint(weapon_stats.base_damage_min, weapon_stats.base_damage_max)
+        # Base damage from weapon, uniform over [min, max]; one random() is
+        # much cheaper than randint's rejection sampling
+        spread = max(0, weapon_stats.base_damage_max - weapon_stats.base_damage_min)
+        base_damage = weapon_stats.base_damage_min + int(self.rng.random() * (spread + 1))
 
         # Attack stat contribution
-        attack = (
-            stats.attack * stats.attack_from_weapon +
-            weapon_stats.base_atk * stats.attack_from_unit +
-            attacker.template.stats.power
-        )
+        if attack is None:
+            attack = self._attack_power(attacker, weapon, ability)
 
         # Defense reduction
         defense = defender.template.stats.defense
 
         # Class-based damage modifier
-        class_mod = self.data_loader.get_class_damage_mod(
-            attacker.template.class_type.value,
-            defender.template.class_type.value
-        )
+        class_mod = attacker._class_mods.get(defender.template.class_type.value, 1.0)
 
-        # Calculate final damage
-        damage = base_damage + attack - defense
-        damage = max(1, damage)  # Minimum 1 damage
-        damage = int(damage * class_mod)
-        damage = int(damage * damage_percent / 100)
+        return damage_kernel(base_damage, attack, defense, class_mod, damage_percent)
 
-        return max(1, damage)
+    @staticmethod
+    def _attack_power(attacker: BattleUnit, weapon: Weapon, ability: Ability) -> float:
+        """Attack stat contribution, which depends only on the attacker side."""
+        stats = ability.stats
+        return (
+            stats.attack * stats.attack_from_weapon +
+            weapon.stats.base_atk * stats.attack_from_unit +
+            attacker.template.stats.power
+        )
 
     def _calculate_hit_chance(self, attacker: BattleUnit, defender: BattleUnit) -> float:
         """Calculate chance to hit."""
@@ -575,16 +959,34 @@ class BattleState:
         base_crit = attacker.template.stats.critical
         ability_crit = ability.stats.critical_hit_percent
 
-        # Check for tag-based crit bonuses
-        bonus_crit = 0.0
-        for tag, bonus in ability.stats.critical_bonuses.items():
-            if tag in defender.template.tags:
-                bonus_crit += bonus
+        # Check for tag-based crit bonuses; tags are fixed per unit type, so
+        # the sum is memoized per ability and defender template
+        bonuses = ability.stats.critical_bonuses
+        if not bonuses:
+            return base_crit + ability_crit
+
+        key = (ability.id, defender.template.id)
+        bonus_crit = self._crit_cache.get(key)
+        if bonus_crit is None:
+            tags = defender.template.tags
+            bonus_crit = 0.0
+            for tag, bonus in bonuses.items():
+                if tag in tags:
+                    bonus_crit += bonus
+            self._crit_cache[key] = bonus_crit
 
         return base_crit + ability_crit + bonus_crit
 
     def _get_unit_index(self, unit: BattleUnit) -> int:
         """Get the index of a unit in its team list."""
+        # Fast path: read the index off the unit's array slot instead of an
+        # equality scan (dataclass __eq__ compares whole templates)
+        if unit._arrays is self.arrays:
+            num_player = self.arrays.num_player
+            in_player_list = unit._slot < num_player
+            if in_player_list == ((unit.battle_side == BattleSide.PLAYER_TEAM) == self.player_is_attacker):
+                return unit._slot if in_player_list else unit._slot - num_player
+
         if unit.battle_side == BattleSide.PLAYER_TEAM:
             return self.player_units.index(unit) if self.player_is_attacker else self.enemy_units.index(unit)
         else:
@@ -593,7 +995,7 @@ class BattleState:
     def end_turn(self) -> None:
         """End the current turn and switch sides."""
         # Tick cooldowns for current side
-        for unit in self.current_side_units:
+        for unit in self._acting:
             unit.tick_cooldowns()
             unit.tick_status_effects()
 
@@ -621,14 +1023,26 @@ class BattleState:
         """Player surrenders the battle."""
         self.result = BattleResult.SURRENDER
 
-    def get_state_vector(self) -> np.ndarray:
-        """Get a numerical representation of the battle state for ML."""
+    def get_state_vector(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get a numerical representation of the battle state for ML.
+
+        Args:
+            out: Optional float32 buffer of the vector's size to fill in place
+
+        Returns:
+            out if given, otherwise a new array
+        """
         # This creates a fixed-size observation vector
         # Max units per side assumed to be 8
         MAX_UNITS = 8
         UNIT_FEATURES = 10  # hp%, armor%, position, class, etc.
 
-        state = np.zeros(MAX_UNITS * UNIT_FEATURES * 2 + 10, dtype=np.float32)
+        if out is None:
+            state = np.zeros(MAX_UNITS * UNIT_FEATURES * 2 + 10, dtype=np.float32)
+        else:
+            state = out
+            state.fill(0.0)
 
         idx = 0
 
@@ -666,10 +1080,12 @@ class BattleState:
         idx = MAX_UNITS * UNIT_FEATURES * 2
         state[idx] = self.turn_number / 50
         state[idx + 1] = 1.0 if self.is_player_turn else 0.0
-        state[idx + 2] = sum(1 for u in self.player_units if u.is_alive) / MAX_UNITS
-        state[idx + 3] = sum(1 for u in self.enemy_units if u.is_alive) / MAX_UNITS
-        state[idx + 4] = sum(u.current_hp for u in self.player_units) / max(1, sum(u.template.stats.hp for u in self.player_units))
-        state[idx + 5] = sum(u.current_hp for u in self.enemy_units) / max(1, sum(u.template.stats.hp for u in self.enemy_units))
+        state[idx + 2] = self.arrays.alive_player / MAX_UNITS
+        state[idx + 3] = self.arrays.alive_enemy / MAX_UNITS
+        player_hp, enemy_hp = self.arrays.hp_by_side()
+        player_max_hp, enemy_max_hp = self.arrays.max_hp_by_side()
+        state[idx + 4] = player_hp / max(1, player_max_hp)
+        state[idx + 5] = enemy_hp / max(1, enemy_max_hp)
 
         return state
 
@@ -678,23 +1094,36 @@ class BattleSimulator:
     """High-level battle simulator that manages game flow."""
 
     def __init__(self, data_dir: str):
-        self.data_loader = GameDataLoader(data_dir)
-        self.data_loader.load_all()
+        self.data_loader = get_game_data(data_dir)
+
+        # Ranked template copies per (template id, rank); templates are
+        # read-only during battle, so units of the same type and rank share one
+        self._rank_templates: dict[tuple[int, int], UnitTemplate] = {}
 
     def _apply_rank_to_template(self, template: UnitTemplate, rank: int) -> UnitTemplate:
-        """Create a copy of the template with stats from the specified rank."""
-        from copy import deepcopy
-        template_copy = deepcopy(template)
-        template_copy.stats = template.get_stats_at_rank(rank)
+        """Get a copy of the template with stats from the specified rank (cached per type and rank)."""
+        key = (template.id, int(rank))
+        template_copy = self._rank_templates.get(key)
+        if template_copy is None:
+            template_copy = deepcopy(template)
+            template_copy.stats = template.get_stats_at_rank(rank)
+            self._rank_templates[key] = template_copy
         return template_copy
 
     def create_battle_from_encounter(
         self,
         encounter_id: int,
-        player_unit_ids: list[int],
-        player_ranks: Optional[list[int]] = None
+        player_unit_ids: Sequence[int] | np.ndarray,
+        player_ranks: Optional[Sequence[int] | np.ndarray] = None
     ) -> Optional[BattleState]:
-        """Create a battle state from an encounter definition."""
+        """
+        Create a battle state from an encounter definition.
+
+        Args:
+            encounter_id: Encounter to load the enemy side from
+            player_unit_ids: Player unit IDs, placed row-first (any int array-like)
+            player_ranks: Rank per player unit (defaults to rank 1)
+        """
         encounter = self.data_loader.get_encounter(encounter_id)
         if not encounter:
             return None
@@ -703,13 +1132,16 @@ class BattleSimulator:
         if not layout:
             return None
 
-        # Default to rank 1 for all player units if not specified
+        # Normalise once to int arrays; default to rank 1 if not specified
+        player_unit_ids = np.asarray(player_unit_ids, dtype=np.int32)
         if player_ranks is None:
-            player_ranks = [1] * len(player_unit_ids)
+            player_ranks = np.ones(len(player_unit_ids), dtype=np.int32)
+        else:
+            player_ranks = np.asarray(player_ranks, dtype=np.int32)
 
         # Create player units
         player_units = []
-        for i, (unit_id, rank) in enumerate(zip(player_unit_ids, player_ranks)):
+        for i, (unit_id, rank) in enumerate(zip(player_unit_ids.tolist(), player_ranks.tolist())):
             template = self.data_loader.get_unit(unit_id)
             if template:
                 # Apply rank to template stats
@@ -835,6 +1267,52 @@ class BattleSimulator:
 
         return battle.result
 
+    def simulate_random_battles(
+        self,
+        battle: BattleState,
+        n: int,
+        max_turns: int = 100,
+        seed: Optional[int] = None
+    ) -> RolloutBatch:
+        """
+        Play n uniformly random rollouts from a battle state.
+
+        Each rollout runs on its own clone with independently seeded battle
+        and policy RNGs; the starting battle is left untouched.
+
+        Args:
+            battle: State to roll out from
+            n: Number of rollouts
+            max_turns: Turn limit per rollout
+            seed: Seed for the whole batch (None for fresh entropy)
+
+        Returns:
+            Per-rollout results, turn counts and final HP as arrays
+        """
+        # Two words per rollout: even for the battle, odd for the policy, so the
+        # action draws never replay the battle's hit/crit/damage stream
+        seeds = np.random.SeedSequence(seed).generate_state(2 * n).tolist()
+        results = np.empty(n, dtype=np.int8)
+        turns = np.empty(n, dtype=np.int32)
+        hp = np.empty((n, len(battle.arrays.hp)), dtype=np.int32)
+
+        for i, (battle_seed, policy_seed) in enumerate(zip(seeds[::2], seeds[1::2])):
+            state = battle.clone()
+            state.seed(battle_seed)
+            policy_rng = random.Random(policy_seed)
+
+            while state.result == BattleResult.IN_PROGRESS and state.turn_number < max_turns:
+                action = state.sample_random_action(policy_rng)
+                if action is not None:
+                    state.execute_action(action)
+                state.end_turn()
+
+            results[i] = state.result.value
+            turns[i] = state.turn_number
+            hp[i] = state.arrays.hp
+
+        return RolloutBatch(results=results, turns=turns, hp=hp)
+
     def _action_matches_legal(self, action: Action, legal_actions: list[Action]) -> bool:
         """Check if action matches any legal action."""
         for legal in legal_actions:
@@ -4,17 +4,72 @@ from dataclasses import dataclass, field
 from typing import Optional, TYPE_CHECKING
 import random
 
+import numpy as np
+
+# Try to import numba (optional dependency)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 from .enums import (
-    DamageType, UnitClass, BattleSide, TargetType, LineOfFire,
-    StatusEffectType, DAMAGE_TYPE_NAMES
+    DamageType, UnitClass, BattleSide, TargetType, LineOfFire, AttackDirection,
+    StatusEffectType, DAMAGE_TYPE_NAMES, DAMAGE_MOD_KEYS
 )
 from .models import Position, Ability, Weapon, StatusEffect
 
 if TYPE_CHECKING:
     from .battle import BattleUnit, BattleState
 
+# Plain-int enum values for per-target checks (int compares skip IntEnum dispatch)
+_LOF_DIRECT = int(LineOfFire.DIRECT)
+
+# Attack direction -> allowed row relationships, as bits: 0b100 same row,
+# 0b010 target further back (dy > 0), 0b001 target further forward (dy < 0)
+_DIR_MASK = {
+    int(AttackDirection.ANY): 0b111,
+    int(AttackDirection.FORWARD): 0b010,
+    int(AttackDirection.BACKWARD): 0b001,
+}
+
+
+def _build_fire_table() -> bytes:
+    """
+    Precompute the combined direction / line-of-fire / blocking predicate.
+
+    Entry (direction << 3) | (line_of_fire << 1) | blocked holds the row
+    bits (as in _DIR_MASK) the shot may go to: the direction must allow
+    the row, and a DIRECT shot may not be blocked.
+    """
+    table = bytearray(len(AttackDirection) << 3)
+    for direction in AttackDirection:
+        for lof in LineOfFire:
+            for blocked in (0, 1):
+                if lof == LineOfFire.DIRECT and blocked:
+                    continue
+                table[(direction << 3) | (lof << 1) | blocked] = _DIR_MASK[int(direction)]
+    return bytes(table)
+
+
+_FIRE_TABLE = _build_fire_table()
+
 
-@dataclass
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _any_offset(offsets):
+        """Check whether any (dx, dy) row of an offsets array is non-zero."""
+        for i in range(offsets.shape[0]):
+            if offsets[i, 0] != 0 or offsets[i, 1] != 0:
+                return True
+        return False
+else:
+    def _any_offset(offsets: np.ndarray) -> bool:
+        """Check whether any (dx, dy) row of an offsets array is non-zero."""
+        return bool(offsets.any())
+
+
+@dataclass(slots=True)
 class DamageResult:
     """Result of a single damage application."""
     target_idx: int
@@ -81,6 +136,10 @@ class TargetingSystem:
     def __init__(self, tag_resolver: TagResolver):
         self.tag_resolver = tag_resolver
 
+    def warmup(self) -> None:
+        """Compile the numba kernels now rather than on the first targeting query."""
+        _any_offset(np.zeros((1, 2), dtype=np.int16))
+
     def get_valid_targets(
         self,
         attacker: "BattleUnit",
@@ -91,6 +150,7 @@ class TargetingSystem:
         """Get all valid target positions for an ability."""
         stats = ability.stats
         targets = []
+        needs_line_of_sight = int(stats.line_of_fire) == _LOF_DIRECT
 
         # Get opposing units
         if attacker.battle_side == BattleSide.PLAYER_TEAM:
@@ -112,7 +172,7 @@ class TargetingSystem:
                 continue
 
             # Check line of fire
-            if stats.line_of_fire == LineOfFire.DIRECT:
+            if needs_line_of_sight:
                 if not self._has_line_of_sight(attacker, target_unit, battle):
                     continue
 
@@ -120,6 +180,59 @@ class TargetingSystem:
 
         return targets
 
+    @staticmethod
+    def is_single_target(ability: Ability) -> bool:
+        """
+        Check whether an ability only ever hits the cell it is aimed at.
+
+        True when its damage area has no splash offsets and it has no
+        multi-cell target area (a random single pick still counts).
+        """
+        stats = ability.stats
+        if _any_offset(stats.damage_offsets):
+            return False
+        target_area = stats.target_area
+        return target_area is None or target_area.target_type == TargetType.SINGLE
+
+    @staticmethod
+    def can_attack_direction(attacker_pos: Position, target_pos: Position, direction: int) -> bool:
+        """
+        Check an attack direction constraint between two positions.
+
+        FORWARD requires the target to be on a higher row than the attacker,
+        BACKWARD on a lower row; ANY always passes.
+
+        Args:
+            attacker_pos: Attacker position
+            target_pos: Target position
+            direction: AttackDirection value (plain int accepted)
+        """
+        dy = target_pos.y - attacker_pos.y
+        bit = 0b010 if dy > 0 else (0b001 if dy < 0 else 0b100)
+        return bool(_DIR_MASK.get(int(direction), 0) & bit)
+
+    @staticmethod
+    def can_fire(
+        attacker_pos: Position,
+        target_pos: Position,
+        direction: int,
+        line_of_fire: int,
+        blocked: bool
+    ) -> bool:
+        """
+        Check attack direction and line of fire together with one table lookup.
+
+        Args:
+            attacker_pos: Attacker position
+            target_pos: Target position
+            direction: AttackDirection value (plain int accepted)
+            line_of_fire: LineOfFire value (plain int accepted)
+            blocked: Whether a unit stands between attacker and target
+        """
+        dy = target_pos.y - attacker_pos.y
+        bit = 0b010 if dy > 0 else (0b001 if dy < 0 else 0b100)
+        return bool(_FIRE_TABLE[(int(direction) << 3) | (int(line_of_fire) << 1) | bool(blocked)] & bit)
+
     def _calculate_distance(self, attacker_pos: Position, target_pos: Position) -> int:
         """
         Calculate cross-grid distance.
@@ -147,14 +260,15 @@ class TargetingSystem:
         if attacker.position.x != target.position.x:
             return True  # Different columns, no blocking
 
-        # Check for blocking units in front of target
-        target_units = battle.enemy_units if attacker.battle_side == BattleSide.PLAYER_TEAM else battle.player_units
+        # Check for blocking units in front of target, via the battle's index
+        # of living units by cell (side 1 is the enemy list)
+        side = 1 if attacker.battle_side == BattleSide.PLAYER_TEAM else 0
+        slot_at = battle.arrays.slot_at
+        x = target.position.x
 
-        for unit in target_units:
-            if unit == target or not unit.is_alive:
-                continue
+        for y in range(target.position.y):
             # Unit blocks if in same column and closer to attacker
-            if unit.position.x == target.position.x and unit.position.y < target.position.y:
+            if slot_at(side, x, y) >= 0:
                 return False
 
         return True
@@ -276,63 +390,121 @@ class DamageCalculator:
 
         Returns: (damage, is_critical, was_dodged)
         """
-        stats = ability.stats
         weapon_stats = weapon.stats
 
         # Check dodge first
-        dodge_chance = defender.template.stats.dodge - attacker.template.stats.accuracy
-        dodge_chance = max(0, min(95, dodge_chance))  # Cap at 0-95%
-
-        if rng.random() * 100 < dodge_chance:
+        if rng.random() * 100 < self._dodge_chance(attacker, defender):
             return (0, False, True)
 
         # Base damage from weapon (random within range)
         if weapon_stats.base_damage_max > weapon_stats.base_damage_min:
-            base_damage = rng.randint(weapon_stats.base_damage_min, weapon_stats.base_damage_max)
+            spread = weapon_stats.base_damage_max - weapon_stats.base_damage_min
+            base_damage = weapon_stats.base_damage_min + int(rng.random() * (spread + 1))
         else:
             base_damage = weapon_stats.base_damage_min
 
         # Add ability damage and attack stat contribution
-        damage = base_damage + stats.damage
+        damage = base_damage + self._flat_bonus(attacker, defender, weapon, ability)
+
+        # Critical hit check
+        is_critical = rng.random() * 100 < self._crit_chance(attacker, defender, weapon, ability)
+        if is_critical:
+            damage = int(damage * 1.5)
+
+        # Class-based damage modifier
+        damage = int(damage * self._class_mod(attacker, defender))
+
+        # Apply damage percentage (for AOE falloff)
+        damage = int(damage * damage_percent / 100)
+
+        # Minimum damage
+        damage = max(1, damage)
+
+        return (damage, is_critical, False)
+
+    def calculate_multi_hit(
+        self,
+        attacker: "BattleUnit",
+        defender: "BattleUnit",
+        weapon: Weapon,
+        ability: Ability,
+        damage_percent: float,
+        rng: np.random.Generator
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Roll every shot of an ability use at once.
+
+        Applies the calculate_damage rules to an (attacks_per_use,
+        shots_per_attack) grid of shots, drawing all dodge, damage and crit
+        rolls in three batched RNG calls.
+
+        Returns: (damage, is_critical, was_dodged) arrays of that shape;
+        dodged shots have damage 0
+        """
+        stats = ability.stats
+        weapon_stats = weapon.stats
+        shape = (max(1, stats.attacks_per_use), max(1, stats.shots_per_attack))
+
+        dodged = rng.random(shape) * 100 < self._dodge_chance(attacker, defender)
+
+        if weapon_stats.base_damage_max > weapon_stats.base_damage_min:
+            base_damage = rng.integers(
+                weapon_stats.base_damage_min, weapon_stats.base_damage_max,
+                size=shape, endpoint=True
+            )
+        else:
+            base_damage = np.full(shape, weapon_stats.base_damage_min, dtype=np.int64)
+
+        damage = base_damage + self._flat_bonus(attacker, defender, weapon, ability)
+
+        crits = rng.random(shape) * 100 < self._crit_chance(attacker, defender, weapon, ability)
+        damage = np.where(crits, np.trunc(damage * 1.5), damage)
+
+        # Same truncation steps as calculate_damage
+        damage = np.trunc(damage * self._class_mod(attacker, defender))
+        damage = np.trunc(damage * damage_percent / 100)
+        damage = np.maximum(1, damage).astype(np.int64)
+
+        damage[dodged] = 0
+        crits &= ~dodged
+        return damage, crits, dodged
 
-        # Attack stat contribution (attack vs defense)
+    @staticmethod
+    def _dodge_chance(attacker: "BattleUnit", defender: "BattleUnit") -> float:
+        """Dodge chance in percent, capped at 0-95%."""
+        dodge_chance = defender.template.stats.dodge - attacker.template.stats.accuracy
+        return max(0, min(95, dodge_chance))
+
+    @staticmethod
+    def _flat_bonus(attacker: "BattleUnit", defender: "BattleUnit", weapon: Weapon, ability: Ability) -> float:
+        """Ability damage plus attack-over-defense contribution."""
+        stats = ability.stats
         attack_bonus = (
             stats.attack * stats.attack_from_weapon +
-            weapon_stats.base_atk * stats.attack_from_unit +
+            weapon.stats.base_atk * stats.attack_from_unit +
             attacker.template.stats.power
         )
-        defense = defender.template.stats.defense
-        damage += max(0, attack_bonus - defense)
+        return stats.damage + max(0, attack_bonus - defender.template.stats.defense)
 
-        # Critical hit check
+    @staticmethod
+    def _crit_chance(attacker: "BattleUnit", defender: "BattleUnit", weapon: Weapon, ability: Ability) -> float:
+        """Crit chance in percent, including tag-specific bonuses."""
+        stats = ability.stats
         crit_chance = (
             attacker.template.stats.critical +
-            weapon_stats.base_crit_percent +
+            weapon.stats.base_crit_percent +
             stats.critical_hit_percent
         )
-
-        # Add tag-specific crit bonuses
         for tag, bonus in stats.critical_bonuses.items():
             if tag in defender.template.tags:
                 crit_chance += bonus
+        return crit_chance
 
-        is_critical = rng.random() * 100 < crit_chance
-        if is_critical:
-            damage = int(damage * 1.5)
-
-        # Class-based damage modifier
+    def _class_mod(self, attacker: "BattleUnit", defender: "BattleUnit") -> float:
+        """Class-based damage multiplier."""
         attacker_class = attacker.template.class_type.value
         defender_class = defender.template.class_type.value
-        class_mod = self.class_damage_mods.get(attacker_class, {}).get(defender_class, 1.0)
-        damage = int(damage * class_mod)
-
-        # Apply damage percentage (for AOE falloff)
-        damage = int(damage * damage_percent / 100)
-
-        # Minimum damage
-        damage = max(1, damage)
-
-        return (damage, is_critical, False)
+        return self.class_damage_mods.get(attacker_class, {}).get(defender_class, 1.0)
 
     def apply_damage(
         self,
@@ -350,15 +522,7 @@ class DamageCalculator:
             return 0
 
         # Get damage type modifier
-        dtype_name = {
-            DamageType.PIERCING: "piercing",
-            DamageType.CRUSHING: "crushing",
-            DamageType.SLASHING: "slashing",
-            DamageType.EXPLOSIVE: "explosive",
-            DamageType.FIRE: "fire",
-            DamageType.COLD: "cold",
-            DamageType.ELECTRIC: "electric",
-        }.get(damage_type, "piercing")
+        dtype_name = DAMAGE_MOD_KEYS[damage_type] if 0 <= damage_type < len(DAMAGE_MOD_KEYS) else "piercing"
 
         damage_mod = target.template.stats.damage_mods.get(dtype_name, 1.0)
         modified_damage = int(damage * damage_mod)
@@ -399,6 +563,10 @@ class StatusEffectSystem:
         """
         self.effects = status_effects
 
+        # Combined stun modifiers per tuple of active stun effect ids
+        self._damage_mod_cache: dict[tuple[int, ...], dict[int, float]] = {}
+        self._armor_mod_cache: dict[tuple[int, ...], dict[int, float]] = {}
+
     def try_apply_effect(
         self,
         target: "BattleUnit",
@@ -448,7 +616,7 @@ class StatusEffectSystem:
 
         Returns total DOT damage dealt.
         """
-        if not unit.is_alive:
+        if not unit.is_alive or not unit.status_effects:
             return 0
 
         total_dot = 0
@@ -486,13 +654,40 @@ class StatusEffectSystem:
         return False
 
     def get_damage_modifiers(self, unit: "BattleUnit") -> dict[int, float]:
-        """Get any damage modifiers from status effects."""
-        mods = {}
-        for status in unit.status_effects:
-            if status.effect.effect_type == StatusEffectType.STUN:
-                for dtype, mult in status.effect.stun_damage_mods.items():
+        """
+        Get any damage modifiers from status effects.
+
+        The result depends only on which stun effects are active, so it is
+        memoized per effect combination; treat the returned dict as read-only.
+        """
+        return self._combined_mods(unit, self._damage_mod_cache, armor=False)
+
+    def get_armor_damage_modifiers(self, unit: "BattleUnit") -> dict[int, float]:
+        """Get any armor damage modifiers from status effects (read-only, like get_damage_modifiers)."""
+        return self._combined_mods(unit, self._armor_mod_cache, armor=True)
+
+    @staticmethod
+    def _combined_mods(
+        unit: "BattleUnit",
+        cache: dict[tuple[int, ...], dict[int, float]],
+        armor: bool
+    ) -> dict[int, float]:
+        """Multiply together the stun modifiers of a unit's active effects, in order."""
+        stuns = [status.effect for status in unit.status_effects
+                 if status.effect.effect_type == StatusEffectType.STUN]
+        if not stuns:
+            return {}
+
+        key = tuple(effect.id for effect in stuns)
+        mods = cache.get(key)
+        if mods is None:
+            mods = {}
+            for effect in stuns:
+                source = effect.stun_armor_damage_mods if armor else effect.stun_damage_mods
+                for dtype, mult in source.items():
                     if dtype in mods:
                         mods[dtype] *= mult
                     else:
                         mods[dtype] = mult
+            cache[key] = mods
         return mods
@@ -1,15 +1,49 @@
 """Data loader for parsing game JSON files."""
 from __future__ import annotations
+import functools
+import hashlib
 import json
+import mmap
+import operator
+import os
+import pickle
+import stat
+import sys
+import tempfile
+import threading
 from pathlib import Path
-from typing import Optional
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generic, Iterator, Optional, TypeVar
 import numpy as np
 
+# Try to import orjson (optional dependency) for faster JSON parsing
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Try to import msgspec (optional dependency) for typed ability decoding
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+# Try to import pysimdjson (optional dependency) for lazy document access
+try:
+    import simdjson
+    HAS_SIMDJSON = True
+except ImportError:
+    HAS_SIMDJSON = False
+
 from .enums import (
     DamageType, UnitClass, StatusEffectType, StatusEffectFamily,
     TargetType, AttackDirection, LineOfFire, Side, CellType,
     DAMAGE_TYPE_NAMES
 )
+from . import models
 from .models import (
     Position, DamageArea, TargetArea, AbilityStats, Ability,
     WeaponStats, Weapon, UnitStats, UnitTemplate, StatusEffect,
@@ -17,59 +51,429 @@ from .models import (
 )
 
 
+# JSON files parsed by load_all()
+_SOURCE_FILES = (
+    "battle_config.json",
+    "status_effects.json",
+    "battle_abilities.json",
+    "battle_units.json",
+    "battle_encounters.json",
+)
+
+# Source files at least this large are memory-mapped for orjson instead of copied
+_MMAP_MIN_BYTES = 1 << 20
+
+
+def _parsed_by_orjson(filename: str) -> bool:
+    """Whether load_all() hands a source file to orjson rather than simdjson or msgspec."""
+    if filename == "battle_encounters.json":
+        return HAS_ORJSON and not HAS_SIMDJSON
+    if filename == "battle_abilities.json":
+        return HAS_ORJSON and not HAS_MSGSPEC
+    return HAS_ORJSON
+
+
+def _user_cache_dir() -> Path:
+    """Per-user cache directory: $XDG_CACHE_HOME/bnsim, else a uid-named temp dir."""
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    if xdg:
+        return Path(xdg) / "bnsim"
+    uid = os.getuid() if hasattr(os, "getuid") else None
+    return Path(tempfile.gettempdir()) / ("bnsim" if uid is None else f"bnsim-{uid}")
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """Whether a file or directory belongs to this user and is not group- or world-writable."""
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+# Loaded attributes stored in the pickle cache
+_CACHED_FIELDS = ("config", "abilities", "units", "status_effects", "encounters")
+
+# Encounter JSON fields kept for lazy parsing; the rest is display-only
+_ENCOUNTER_FIELDS = (
+    "name", "level", "layout_id", "units", "player_units", "attacker_slots",
+    "attacker_defense_slots", "is_player_attacker", "regen"
+)
+
+# Encounter unit placement fields -> default (rank 1 is the first/lowest rank)
+_UNIT_PLACEMENT_DEFAULTS = {"grid_id": 0, "unit_id": 0, "rank": 1}
+_get_unit_placement = operator.itemgetter(*_UNIT_PLACEMENT_DEFAULTS)
+
+# Scalar ability stats: JSON key (same as the AbilityStats field) -> default
+_ABILITY_STATS_DEFAULTS = {
+    "ability_cooldown": 0,
+    "global_cooldown": 0,
+    "ammo_required": 0,
+    "charge_time": 0,
+    "attack": 0,
+    "attacks_per_use": 1,
+    "shots_per_attack": 1,
+    "damage": 0,
+    "damage_type": 1,
+    "secondary_damage_percent": 0.0,
+    "armor_piercing_percent": 0.0,
+    "attack_from_unit": 1.0,
+    "attack_from_weapon": 1.0,
+    "damage_from_unit": 1.0,
+    "damage_from_weapon": 1.0,
+    "crit_from_unit": 1.0,
+    "crit_from_weapon": 1.0,
+    "critical_hit_percent": 0.0,
+    "min_range": 1,
+    "max_range": 5,
+    "max_range_mod_atk": 0.0,
+    "line_of_fire": 3,
+    "attack_direction": 1,
+    "damage_distraction": 0.0,
+    "damage_distraction_bonus": 0.0,
+    "capture": False,
+    "min_hp_percent": 0.0,
+}
+_ABILITY_STATS_KEYS = tuple(_ABILITY_STATS_DEFAULTS)
+# Fetches every scalar from a defaults-merged stats dict in one C-level call
+_get_ability_stats = operator.itemgetter(*_ABILITY_STATS_KEYS)
+
+if HAS_MSGSPEC:
+    # Typed mirror of an ability's JSON: decoding fills these directly, applies
+    # the defaults, and skips fields the simulator never reads (hit sounds, reqs)
+    _AbilityStatsStruct = msgspec.defstruct(
+        "_AbilityStatsStruct",
+        [(key, type(default), default) for key, default in _ABILITY_STATS_DEFAULTS.items()] + [
+            ("critical_bonuses", dict[int, float], {}),
+            ("status_effects", dict[int, float], {}),
+            ("damage_area", list[dict], []),
+            ("target_area", Optional[dict], None),
+            ("targets", list[int], []),
+        ],
+    )
+
+    class _AbilityStruct(msgspec.Struct):
+        name: Optional[str] = None
+        icon: str = ""
+        damage_animation_type: str = ""
+        stats: _AbilityStatsStruct = msgspec.field(default_factory=_AbilityStatsStruct)
+
+    _ABILITIES_DECODER = msgspec.json.Decoder(dict[int, _AbilityStruct])
+
+# Raw value -> member for each enum the loader converts; a dict lookup per
+# record instead of going through EnumMeta.__call__
+_DAMAGE_TYPES = {member.value: member for member in DamageType}
+_UNIT_CLASSES = {member.value: member for member in UnitClass}
+_SIDES = {member.value: member for member in Side}
+_STATUS_EFFECT_TYPES = {member.value: member for member in StatusEffectType}
+_STATUS_EFFECT_FAMILIES = {member.value: member for member in StatusEffectFamily}
+_TARGET_TYPES = {member.value: member for member in TargetType}
+_LINES_OF_FIRE = {member.value: member for member in LineOfFire}
+_ATTACK_DIRECTIONS = {member.value: member for member in AttackDirection}
+
+# int() for JSON object keys: ids repeat across files and records, so equal
+# strings map to one shared int object after the first conversion
+_str_to_int = functools.lru_cache(maxsize=8192)(int)
+
+# Config sections of a unit record, in the order _load_units unpacks them
+_UNIT_CONFIG_TYPES = (
+    "battle_unit_identity_config",
+    "battle_unit_stats_config",
+    "battle_unit_weapons_config",
+)
+
+T = TypeVar("T")
+
+
+class LazyRecords(Mapping[int, T], Generic[T]):
+    """
+    Read-only id -> record mapping that parses each raw record on first access.
+
+    Keys, len() and membership come straight from the raw data, so only the
+    records a caller actually touches are built. Pickling keeps the raw data
+    only; parsed records are rebuilt on demand.
+    """
+
+    def __init__(self, raw: dict[int, dict], parse: Callable[[int, dict], T]):
+        """
+        Args:
+            raw: Raw JSON record per id
+            parse: Module-level function building a record from (id, raw)
+        """
+        self._raw = raw
+        self._parse = parse
+        self._parsed: dict[int, T] = {}
+
+    def __getitem__(self, key: int) -> T:
+        record = self._parsed.get(key)
+        if record is None:
+            record = self._parsed[key] = self._parse(key, self._raw[key])
+        return record
+
+    def __contains__(self, key) -> bool:
+        return key in self._raw
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getstate__(self) -> dict:
+        return {"_raw": self._raw, "_parse": self._parse, "_parsed": {}}
+
+
+def _parse_encounter_units(units_data: list[dict]) -> list[EncounterUnit]:
+    """Parse an encounter's unit placements."""
+    # One C-level fetch per placement, in EncounterUnit field order
+    return [
+        EncounterUnit(*_get_unit_placement(_UNIT_PLACEMENT_DEFAULTS | unit_data))
+        for unit_data in units_data
+    ]
+
+
+def _parse_encounter(enc_id: int, enc_data: dict) -> Encounter:
+    """Build an Encounter from its raw JSON record."""
+    return Encounter(
+        id=enc_id,
+        name=enc_data.get("name", f"encounter_{enc_id}"),
+        level=enc_data.get("level", 1),
+        layout_id=enc_data.get("layout_id", 2),
+        enemy_units=_parse_encounter_units(enc_data.get("units", [])),
+        # Player units are only present for story battles
+        player_units=_parse_encounter_units(enc_data.get("player_units", [])),
+        attacker_slots=enc_data.get("attacker_slots", 8),
+        attacker_defense_slots=enc_data.get("attacker_defense_slots", 0),
+        is_player_attacker=enc_data.get("is_player_attacker", True),
+        regen=enc_data.get("regen", True)
+    )
+
+
 class GameDataLoader:
     """Loads and parses all game data from JSON files."""
 
-    def __init__(self, data_dir: str | Path):
+    def __init__(self, data_dir: str | Path, cache_dir: Optional[str | Path] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            data_dir: Path to the game data directory
+            cache_dir: Where to keep the parsed-data cache (defaults to data_dir/.cache)
+        """
         self.data_dir = Path(data_dir)
         self.battle_dir = self.data_dir / "Assets" / "Config" / "battle"
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else self.data_dir / ".cache"
 
         # Loaded data
         self.config: Optional[GameConfig] = None
         self.abilities: dict[int, Ability] = {}
         self.units: dict[int, UnitTemplate] = {}
         self.status_effects: dict[int, StatusEffect] = {}
-        self.encounters: dict[int, Encounter] = {}
+        self.encounters: Mapping[int, Encounter] = {}
+
+        # Source file bytes read ahead by load_all(), consumed by _load_json()
+        self._prefetched: dict[str, bytes] = {}
+
+        # Shared Position per damage-area offset while parsing abilities
+        self._positions: dict[tuple[int, int], Position] = {}
+        # Abilities with identical area geometry share one list / TargetArea
+        self._areas: dict[tuple, list[DamageArea]] = {}
+        self._target_areas: dict[tuple, TargetArea] = {}
+
+        # Indexes derived from units, rebuilt by load_all()
+        self.units_with_weapons: list[int] = []
+        self.units_by_side: dict[Side, list[UnitTemplate]] = {}
+
+    def load_all(self, use_cache: bool = True) -> None:
+        """
+        Load all game data.
+
+        Args:
+            use_cache: Reuse (and refresh) the pickled copy of the parsed data.
+                The cache is keyed on the source JSON and loader module mtimes,
+                so edits to either trigger a re-parse.
+        """
+        if not (use_cache and self._load_cache()):
+            # Read every source file concurrently, then parse and build serially
+            self._prefetched = self._read_sources()
+            try:
+                self._load_config()
+                self._load_status_effects()
+                self._load_abilities()
+                self._load_units()
+                self._load_encounters()
+            finally:
+                self._prefetched = {}
+
+            if use_cache:
+                self._save_cache()
+
+        self._build_unit_indexes()
+
+    def _build_unit_indexes(self) -> None:
+        """Precompute unit lookups used by scripts and environments."""
+        self.units_with_weapons = []
+        # Both sides always present, so side lookups never miss after a load
+        self.units_by_side = {Side.PLAYER: [], Side.HOSTILE: []}
+        for unit_id, unit in self.units.items():
+            if unit.weapons:
+                self.units_with_weapons.append(unit_id)
+            self.units_by_side.setdefault(unit.side, []).append(unit)
+
+    @property
+    def cache_path(self) -> Path:
+        """Path of the pickled game data cache."""
+        return self.cache_dir / "gamedata.pkl"
+
+    @property
+    def fallback_cache_path(self) -> Path:
+        """Per-user, per-data-dir cache, used only when cache_dir is not writable."""
+        digest = hashlib.sha1(str(self.data_dir.resolve()).encode()).hexdigest()[:16]
+        return _user_cache_dir() / f"bnsim_{digest}.pkl"
+
+    def _cache_dir_writable(self) -> bool:
+        """Whether cache_dir exists (creating it if needed) and can be written."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return False
+        return os.access(self.cache_dir, os.W_OK)
+
+    def _source_signature(self) -> tuple:
+        """Modification time and size of every file the parsed data depends on."""
+        paths = [self._resolve_json_path(name) for name in _SOURCE_FILES]
+        paths += [Path(__file__), Path(models.__file__)]
+        stats = [(str(p), p.stat()) for p in paths]
+        return tuple((name, st.st_mtime_ns, st.st_size) for name, st in stats)
+
+    def _load_cache(self) -> bool:
+        """
+        Populate from the cache if it matches the sources. Returns True on success.
+
+        The fallback cache is only read when cache_dir is unwritable, and only
+        if it and its directory belong to this user and nobody else can write
+        them, since unpickling runs arbitrary code.
+        """
+        if self._cache_dir_writable():
+            candidates = [(self.cache_path, False)]
+        else:
+            candidates = [(self.cache_path, False), (self.fallback_cache_path, True)]
+
+        for path, private_only in candidates:
+            try:
+                with open(path, "rb") as f:
+                    # Check the opened file itself, so it cannot be swapped after the check
+                    if private_only and not (_is_private(os.fstat(f.fileno())) and
+                                             _is_private(path.parent.stat())):
+                        continue
+                    cached = pickle.load(f)
+                if cached.get("signature") != self._source_signature():
+                    continue
+            except Exception:
+                # Missing, stale-format or unreadable cache: try the next one
+                continue
 
-    def load_all(self) -> None:
-        """Load all game data."""
-        self._load_config()
-        self._load_status_effects()
-        self._load_abilities()
-        self._load_units()
-        self._load_encounters()
+            for name in _CACHED_FIELDS:
+                setattr(self, name, cached[name])
+            return True
+        return False
+
+    def _save_cache(self) -> None:
+        """Write the parsed data to the cache, falling back to the temp dir on filesystem errors."""
+        cached = {name: getattr(self, name) for name in _CACHED_FIELDS}
+        try:
+            cached["signature"] = self._source_signature()
+        except OSError:
+            return
+
+        for path, private_only in ((self.cache_path, False), (self.fallback_cache_path, True)):
+            # Write beside the target and rename, so a concurrent reader never
+            # sees a half-written file
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            try:
+                path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+                if private_only and not _is_private(path.parent.stat()):
+                    # Someone else's directory: don't leave a cache where they can reach it
+                    return
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with open(fd, "wb") as f:
+                    pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+                return
+            except OSError:
+                try:
+                    tmp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+                continue
 
-    def _load_json(self, filename: str) -> dict:
-        """Load a JSON file from the battle config directory."""
+    def _resolve_json_path(self, filename: str) -> Path:
+        """Locate a JSON file in the battle config directory or the root config dir."""
         filepath = self.battle_dir / filename
         if not filepath.exists():
             # Try root config dir
             filepath = self.data_dir / "Assets" / "Config" / filename
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return filepath
+
+    def _read_bytes(self, filename: str) -> bytes | mmap.mmap:
+        """
+        Read a config file's raw bytes in one call, with no text decoding layer.
+
+        Files orjson will parse are memory-mapped instead when at least
+        _MMAP_MIN_BYTES, so it reads them from the page cache without a copy;
+        _load_json parses and closes the mapping.
+        """
+        path = self._resolve_json_path(filename)
+        if _parsed_by_orjson(filename) and path.stat().st_size >= _MMAP_MIN_BYTES:
+            with open(path, "rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return path.read_bytes()
+
+    def _read_sources(self) -> dict[str, bytes | mmap.mmap]:
+        """Read all source JSON files in parallel; disk reads release the GIL."""
+        with ThreadPoolExecutor(max_workers=len(_SOURCE_FILES)) as pool:
+            return dict(zip(_SOURCE_FILES, pool.map(self._read_bytes, _SOURCE_FILES)))
+
+    def _source_bytes(self, filename: str) -> bytes | mmap.mmap:
+        """Raw bytes of a source file, from the prefetch buffer when available."""
+        data = self._prefetched.get(filename)
+        if data is None:
+            data = self._read_bytes(filename)
+        return data
+
+    def _load_json(self, filename: str) -> dict:
+        """Load a JSON file from the battle config directory."""
+        data = self._source_bytes(filename)
+        if HAS_ORJSON:
+            if isinstance(data, mmap.mmap):
+                # Parse straight from the mapping, then release it
+                with data, memoryview(data) as view:
+                    return orjson.loads(view)
+            # orjson parses the raw bytes directly, skipping the str decode
+            return orjson.loads(data)
+        return json.loads(data)
 
     def _load_config(self) -> None:
         """Load battle configuration."""
         data = self._load_json("battle_config.json")
 
         # Parse class damage modifiers
-        class_damage_mods = {}
-        for class_id, class_data in data.get("classes", {}).get("class_types", {}).items():
-            class_id = int(class_id)
-            mods = {}
-            for target_class, mult in class_data.get("damage_mods", {}).items():
-                mods[int(target_class)] = float(mult)
-            class_damage_mods[class_id] = mods
+        class_damage_mods = {
+            _str_to_int(class_id): {
+                _str_to_int(target_class): float(mult)
+                for target_class, mult in class_data.get("damage_mods", {}).items()
+            }
+            for class_id, class_data in data.get("classes", {}).get("class_types", {}).items()
+        }
 
         # Parse tag hierarchy
-        tag_hierarchy = {}
-        for parent_tag, child_tags in data.get("tag_hierarchy", {}).items():
-            tag_hierarchy[int(parent_tag)] = [int(t) for t in child_tags]
+        tag_hierarchy = {
+            _str_to_int(parent_tag): [_str_to_int(t) for t in child_tags]
+            for parent_tag, child_tags in data.get("tag_hierarchy", {}).items()
+        }
 
         # Parse layouts
         layouts = {}
         for layout_id, layout_data in data.get("layouts", {}).items():
-            layout_id = int(layout_id)
+            layout_id = _str_to_int(layout_id)
             base_grids = layout_data.get("base_grids", {})
 
             attacker_grid = np.array(base_grids.get("attacker", []), dtype=np.int8)
@@ -99,24 +503,25 @@ class GameDataLoader:
         data = self._load_json("status_effects.json")
 
         for effect_id, effect_data in data.items():
-            effect_id = int(effect_id)
-            effect_type = StatusEffectType(effect_data.get("status_effect_type", 1))
+            effect_id = _str_to_int(effect_id)
+            effect_type = _STATUS_EFFECT_TYPES[effect_data.get("status_effect_type", 1)]
 
             # Parse DOT damage mods
-            stun_damage_mods = {}
-            for dtype, mult in effect_data.get("stun_damage_mods", {}).items():
-                stun_damage_mods[int(dtype)] = float(mult)
-
-            stun_armor_damage_mods = {}
-            for dtype, mult in effect_data.get("stun_armor_damage_mods", {}).items():
-                stun_armor_damage_mods[int(dtype)] = float(mult)
+            stun_damage_mods = {
+                _str_to_int(dtype): float(mult)
+                for dtype, mult in effect_data.get("stun_damage_mods", {}).items()
+            }
+            stun_armor_damage_mods = {
+                _str_to_int(dtype): float(mult)
+                for dtype, mult in effect_data.get("stun_armor_damage_mods", {}).items()
+            }
 
             self.status_effects[effect_id] = StatusEffect(
                 id=effect_id,
                 effect_type=effect_type,
-                family=StatusEffectFamily(effect_data.get("family", 5)),
+                family=_STATUS_EFFECT_FAMILIES[effect_data.get("family", 5)],
                 duration=effect_data.get("duration", 1),
-                dot_damage_type=DamageType(effect_data.get("dot_damage_type", 5)),
+                dot_damage_type=_DAMAGE_TYPES[effect_data.get("dot_damage_type", 5)],
                 dot_ability_damage_mult=effect_data.get("dot_ability_damage_mult", 1.0),
                 dot_bonus_damage=effect_data.get("dot_bonus_damage", 0),
                 dot_ap_percent=effect_data.get("dot_ap_percent", 0.0),
@@ -128,126 +533,176 @@ class GameDataLoader:
                 stun_armor_damage_mods=stun_armor_damage_mods
             )
 
-    def _parse_damage_area(self, area_data: list[dict]) -> list[DamageArea]:
-        """Parse damage area pattern."""
-        result = []
+    def _area_signature(self, area_data: list[dict]) -> tuple:
+        """
+        Hashable (x, y, damage_percent, order) tuple per entry of an area pattern.
+
+        Percents are normalized to float so 100 and 100.0 give one signature.
+        """
+        signature = []
         for entry in area_data:
             pos_data = entry.get("pos", {})
-            result.append(DamageArea(
-                pos=Position(x=pos_data.get("x", 0), y=pos_data.get("y", 0)),
-                damage_percent=entry.get("damage_percent", 100.0),
-                order=entry.get("order", 1)
+            signature.append((
+                pos_data.get("x", 0), pos_data.get("y", 0),
+                float(entry.get("damage_percent", 100.0)), entry.get("order", 1)
             ))
-        return result
+        return tuple(signature)
+
+    def _area_from_signature(self, signature: tuple) -> list[DamageArea]:
+        """Damage area list for a signature, shared by every pattern with that geometry."""
+        area = self._areas.get(signature)
+        if area is None:
+            # Positions are immutable, so patterns share one instance per offset
+            positions = self._positions
+            area = []
+            for x, y, damage_percent, order in signature:
+                pos = positions.get((x, y))
+                if pos is None:
+                    pos = positions[(x, y)] = Position(x, y)
+                area.append(DamageArea(pos, damage_percent, order))
+            self._areas[signature] = area
+        return area
+
+    def _parse_damage_area(self, area_data: list[dict]) -> list[DamageArea]:
+        """Parse damage area pattern."""
+        return self._area_from_signature(self._area_signature(area_data))
 
     def _parse_target_area(self, area_data: dict) -> Optional[TargetArea]:
         """Parse targeting area configuration."""
         if not area_data:
             return None
 
-        data_list = self._parse_damage_area(area_data.get("data", []))
-
-        return TargetArea(
-            target_type=TargetType(area_data.get("target_type", 2)),
-            data=data_list,
-            random=area_data.get("random", False),
-            aoe_order_delay=area_data.get("aoe_order_delay", 0.0)
+        key = (
+            area_data.get("target_type", 2),
+            area_data.get("random", False),
+            area_data.get("aoe_order_delay", 0.0),
+            self._area_signature(area_data.get("data", []))
         )
+        target_area = self._target_areas.get(key)
+        if target_area is None:
+            target_type, random, aoe_order_delay, signature = key
+            target_area = self._target_areas[key] = TargetArea(
+                target_type=_TARGET_TYPES[target_type],
+                data=self._area_from_signature(signature),
+                random=random,
+                aoe_order_delay=aoe_order_delay
+            )
+        return target_area
 
     def _load_abilities(self) -> None:
         """Load ability definitions."""
+        if HAS_MSGSPEC:
+            self._load_abilities_msgspec()
+            return
+
         data = self._load_json("battle_abilities.json")
 
+        # Loop-invariant globals and bound methods as locals
+        str_to_int = _str_to_int
+        defaults, keys, get_scalars = _ABILITY_STATS_DEFAULTS, _ABILITY_STATS_KEYS, _get_ability_stats
+        build_stats, add_ability = self._build_ability_stats, self._add_ability
+
         for ability_id, ability_data in data.items():
-            ability_id = int(ability_id)
+            ability_id = str_to_int(ability_id)
             stats_data = ability_data.get("stats", {})
 
             # Parse critical bonuses (tag-based crit bonus)
-            critical_bonuses = {}
-            for tag, bonus in stats_data.get("critical_bonuses", {}).items():
-                critical_bonuses[int(tag)] = float(bonus)
+            critical_bonuses = {
+                str_to_int(tag): float(bonus)
+                for tag, bonus in stats_data.get("critical_bonuses", {}).items()
+            }
 
             # Parse status effects
-            status_effects = {}
-            for effect_id, chance in stats_data.get("status_effects", {}).items():
-                status_effects[int(effect_id)] = float(chance)
-
-            # Parse damage area
-            damage_area = self._parse_damage_area(stats_data.get("damage_area", []))
-
-            # Parse target area
-            target_area = self._parse_target_area(stats_data.get("target_area"))
-
-            stats = AbilityStats(
-                ability_cooldown=stats_data.get("ability_cooldown", 0),
-                global_cooldown=stats_data.get("global_cooldown", 0),
-                ammo_required=stats_data.get("ammo_required", 0),
-                charge_time=stats_data.get("charge_time", 0),
-                attack=stats_data.get("attack", 0),
-                attacks_per_use=stats_data.get("attacks_per_use", 1),
-                shots_per_attack=stats_data.get("shots_per_attack", 1),
-                damage=stats_data.get("damage", 0),
-                damage_type=DamageType(stats_data.get("damage_type", 1)),
-                secondary_damage_percent=stats_data.get("secondary_damage_percent", 0.0),
-                armor_piercing_percent=stats_data.get("armor_piercing_percent", 0.0),
-                attack_from_unit=stats_data.get("attack_from_unit", 1.0),
-                attack_from_weapon=stats_data.get("attack_from_weapon", 1.0),
-                damage_from_unit=stats_data.get("damage_from_unit", 1.0),
-                damage_from_weapon=stats_data.get("damage_from_weapon", 1.0),
-                crit_from_unit=stats_data.get("crit_from_unit", 1.0),
-                crit_from_weapon=stats_data.get("crit_from_weapon", 1.0),
-                critical_hit_percent=stats_data.get("critical_hit_percent", 0.0),
+            status_effects = {
+                str_to_int(effect_id): float(chance)
+                for effect_id, chance in stats_data.get("status_effects", {}).items()
+            }
+
+            # Scalars: overlay the JSON on the defaults and fetch them all at once
+            scalars = dict(zip(keys, get_scalars(defaults | stats_data)))
+
+            stats = build_stats(
+                scalars,
                 critical_bonuses=critical_bonuses,
-                min_range=stats_data.get("min_range", 1),
-                max_range=stats_data.get("max_range", 5),
-                max_range_mod_atk=stats_data.get("max_range_mod_atk", 0.0),
-                line_of_fire=LineOfFire(stats_data.get("line_of_fire", 3)),
-                attack_direction=AttackDirection(stats_data.get("attack_direction", 1)),
-                damage_area=damage_area,
-                target_area=target_area,
-                targets=stats_data.get("targets", []),
                 status_effects=status_effects,
-                damage_distraction=stats_data.get("damage_distraction", 0.0),
-                damage_distraction_bonus=stats_data.get("damage_distraction_bonus", 0.0),
-                capture=stats_data.get("capture", False),
-                min_hp_percent=stats_data.get("min_hp_percent", 0.0)
+                damage_area=stats_data.get("damage_area", []),
+                target_area=stats_data.get("target_area"),
+                targets=stats_data.get("targets", [])
             )
-
-            self.abilities[ability_id] = Ability(
-                id=ability_id,
-                name=ability_data.get("name", f"ability_{ability_id}"),
-                icon=ability_data.get("icon", ""),
-                damage_animation_type=ability_data.get("damage_animation_type", ""),
-                stats=stats
+            add_ability(ability_id, ability_data.get("name"), ability_data.get("icon", ""),
+                        ability_data.get("damage_animation_type", ""), stats)
+
+    def _load_abilities_msgspec(self) -> None:
+        """Load ability definitions, decoding the JSON straight into typed structs."""
+        records = _ABILITIES_DECODER.decode(self._source_bytes("battle_abilities.json"))
+        n_scalars = len(_ABILITY_STATS_KEYS)
+
+        for ability_id, record in records.items():
+            raw = record.stats
+            # Scalar fields come first in the struct, in _ABILITY_STATS_KEYS order
+            scalars = dict(zip(_ABILITY_STATS_KEYS, msgspec.structs.astuple(raw)[:n_scalars]))
+
+            stats = self._build_ability_stats(
+                scalars,
+                critical_bonuses=raw.critical_bonuses,
+                status_effects=raw.status_effects,
+                damage_area=raw.damage_area,
+                target_area=raw.target_area,
+                targets=raw.targets
             )
+            self._add_ability(ability_id, record.name, record.icon,
+                              record.damage_animation_type, stats)
+
+    def _build_ability_stats(self, scalars: dict, *, critical_bonuses: dict[int, float],
+                             status_effects: dict[int, float], damage_area: list[dict],
+                             target_area: Optional[dict], targets: list[int]) -> AbilityStats:
+        """Build AbilityStats from raw scalars and the nested JSON sections."""
+        scalars["damage_type"] = _DAMAGE_TYPES[scalars["damage_type"]]
+        scalars["line_of_fire"] = _LINES_OF_FIRE[scalars["line_of_fire"]]
+        scalars["attack_direction"] = _ATTACK_DIRECTIONS[scalars["attack_direction"]]
+
+        return AbilityStats(
+            **scalars,
+            critical_bonuses=critical_bonuses,
+            damage_area=self._parse_damage_area(damage_area),
+            target_area=self._parse_target_area(target_area),
+            targets=targets,
+            status_effects=status_effects
+        )
+
+    def _add_ability(self, ability_id: int, name: Optional[str], icon: str,
+                     damage_animation_type: str, stats: AbilityStats) -> None:
+        """Register an ability, interning its display strings."""
+        self.abilities[ability_id] = Ability(
+            id=ability_id,
+            # Names, icons and animation types repeat across records;
+            # interning keeps one copy of each
+            name=sys.intern(name if name is not None else f"ability_{ability_id}"),
+            icon=sys.intern(icon),
+            damage_animation_type=sys.intern(damage_animation_type),
+            stats=stats
+        )
 
     def _parse_damage_mods(self, mods_data: dict) -> dict[str, float]:
         """Parse damage modifier dictionary."""
-        result = {}
-        for dtype_name, mult in mods_data.items():
-            result[dtype_name] = float(mult)
-        return result
+        # Interned: thousands of rank tables share the same few type names
+        intern = sys.intern
+        return {intern(dtype_name): float(mult) for dtype_name, mult in mods_data.items()}
 
     def _load_units(self) -> None:
         """Load unit definitions."""
         data = self._load_json("battle_units.json")
 
         for unit_id, unit_configs in data.items():
-            unit_id = int(unit_id)
-
-            # Unit data is a list of config objects
-            identity = None
-            stats_config = None
-            weapons_config = None
+            unit_id = _str_to_int(unit_id)
 
+            # Unit data is a list of config objects, keyed by their "_t" type
+            sections = dict.fromkeys(_UNIT_CONFIG_TYPES)
             for config in unit_configs:
-                config_type = config.get("_t", "")
-                if config_type == "battle_unit_identity_config":
-                    identity = config
-                elif config_type == "battle_unit_stats_config":
-                    stats_config = config
-                elif config_type == "battle_unit_weapons_config":
-                    weapons_config = config
+                config_type = config.get("_t")
+                if config_type in sections:
+                    sections[config_type] = config
+            identity, stats_config, weapons_config = sections.values()
 
             if not identity:
                 continue
@@ -255,9 +710,14 @@ class GameDataLoader:
             # Store all rank stats for this unit
             all_rank_stats = []
             if stats_config:
-                stats_list = stats_config.get("stats", [])
-                for rank_idx, s in enumerate(stats_list):
-                    rank_stats = UnitStats(
+                # Unit-level values, shared by every rank
+                blocking = stats_config.get("blocking", 0)
+                status_effect_immunities = stats_config.get("status_effect_immunities", [])
+                preferred_row = stats_config.get("preferred_row", 1)
+                parse_mods = self._parse_damage_mods
+
+                all_rank_stats = [
+                    UnitStats(
                         hp=s.get("hp", 100),
                         defense=s.get("defense", 0),
                         accuracy=s.get("accuracy", 0),
@@ -265,18 +725,19 @@ class GameDataLoader:
                         critical=s.get("critical", 0.0),
                         bravery=s.get("bravery", 0),
                         power=s.get("power", 0),
-                        blocking=stats_config.get("blocking", 0),
+                        blocking=blocking,
                         armor_hp=s.get("armor_hp", 0),
                         armor_def_style=s.get("armor_def_style", 0),
-                        damage_mods=self._parse_damage_mods(s.get("damage_mods", {})),
-                        armor_damage_mods=self._parse_damage_mods(s.get("armor_damage_mods", {})),
-                        status_effect_immunities=stats_config.get("status_effect_immunities", []),
+                        damage_mods=parse_mods(s.get("damage_mods", {})),
+                        armor_damage_mods=parse_mods(s.get("armor_damage_mods", {})),
+                        status_effect_immunities=status_effect_immunities,
                         size=s.get("size", 1),
                         ability_slots=s.get("ability_slots", 2),
-                        preferred_row=stats_config.get("preferred_row", 1),
+                        preferred_row=preferred_row,
                         pv=s.get("pv", 0)
                     )
-                    all_rank_stats.append(rank_stats)
+                    for s in stats_config.get("stats", [])
+                ]
 
             # Default to rank 1 (index 0) if no stats specified
             unit_stats = all_rank_stats[0] if all_rank_stats else UnitStats()
@@ -285,12 +746,13 @@ class GameDataLoader:
             weapons = {}
             if weapons_config:
                 for weapon_id, weapon_data in weapons_config.get("weapons", {}).items():
-                    weapon_id = int(weapon_id)
+                    weapon_id = _str_to_int(weapon_id)
                     w_stats = weapon_data.get("stats", {})
+                    ability_ids = weapon_data.get("abilities", [])
                     weapons[weapon_id] = Weapon(
                         id=weapon_id,
-                        name=weapon_data.get("name", f"weapon_{weapon_id}"),
-                        abilities=weapon_data.get("abilities", []),
+                        name=sys.intern(weapon_data.get("name", f"weapon_{weapon_id}")),
+                        abilities=ability_ids,
                         stats=WeaponStats(
                             ammo=w_stats.get("ammo", -1),
                             base_atk=w_stats.get("base_atk", 0),
@@ -298,17 +760,18 @@ class GameDataLoader:
                             base_damage_max=w_stats.get("base_damage_max", 0),
                             base_crit_percent=w_stats.get("base_crit_percent", 0.0),
                             range_bonus=w_stats.get("range_bonus", 0)
-                        )
+                        ),
+                        primary_ability=self.abilities.get(ability_ids[0]) if ability_ids else None
                     )
 
             self.units[unit_id] = UnitTemplate(
                 id=unit_id,
-                name=identity.get("name", f"unit_{unit_id}"),
-                short_name=identity.get("short_name", ""),
-                description=identity.get("description", ""),
-                icon=identity.get("icon", ""),
-                class_type=UnitClass(identity.get("class_name", 13)),
-                side=Side(identity.get("side", 2)),
+                name=sys.intern(identity.get("name", f"unit_{unit_id}")),
+                short_name=sys.intern(identity.get("short_name", "")),
+                description=sys.intern(identity.get("description", "")),
+                icon=sys.intern(identity.get("icon", "")),
+                class_type=_UNIT_CLASSES[identity.get("class_name", 13)],
+                side=_SIDES[identity.get("side", 2)],
                 tags=identity.get("tags", []),
                 stats=unit_stats,
                 all_rank_stats=all_rank_stats,  # Store all rank stats
@@ -317,48 +780,56 @@ class GameDataLoader:
             )
 
     def _load_encounters(self) -> None:
-        """Load encounter definitions."""
-        data = self._load_json("battle_encounters.json")
-        armies = data.get("armies", data)  # Handle both formats
-
+        """Load encounter definitions (parsed lazily, on first lookup)."""
+        if HAS_SIMDJSON:
+            raw = self._encounter_records_simdjson()
+        else:
+            data = self._load_json("battle_encounters.json")
+            armies = data.get("armies", data)  # Handle both formats
+            raw = {
+                _str_to_int(enc_id): {key: enc_data[key] for key in _ENCOUNTER_FIELDS if key in enc_data}
+                for enc_id, enc_data in armies.items()
+            }
+        self.encounters = LazyRecords(raw, _parse_encounter)
+
+    def _encounter_records_simdjson(self) -> dict[int, dict]:
+        """
+        Raw encounter records via simdjson proxies.
+
+        Only the fields in _ENCOUNTER_FIELDS are turned into Python objects;
+        the rest of each record stays in the parsed document and is dropped.
+        """
+        parser = simdjson.Parser()
+        doc = parser.parse(self._source_bytes("battle_encounters.json"))
+        armies = doc.get("armies", doc)  # Handle both formats
+
+        raw = {}
         for enc_id, enc_data in armies.items():
-            enc_id = int(enc_id)
-
-            # Parse enemy units
-            enemy_units = []
-            for unit_data in enc_data.get("units", []):
-                enemy_units.append(EncounterUnit(
-                    grid_id=unit_data.get("grid_id", 0),
-                    unit_id=unit_data.get("unit_id", 0),
-                    rank=unit_data.get("rank", 1)  # Default to rank 1 if not specified
-                ))
-
-            # Parse player units (for story battles)
-            player_units = []
-            for unit_data in enc_data.get("player_units", []):
-                player_units.append(EncounterUnit(
-                    grid_id=unit_data.get("grid_id", 0),
-                    unit_id=unit_data.get("unit_id", 0),
-                    rank=unit_data.get("rank", 1)  # Default to rank 1 if not specified
-                ))
-
-            self.encounters[enc_id] = Encounter(
-                id=enc_id,
-                name=enc_data.get("name", f"encounter_{enc_id}"),
-                level=enc_data.get("level", 1),
-                layout_id=enc_data.get("layout_id", 2),
-                enemy_units=enemy_units,
-                player_units=player_units,
-                attacker_slots=enc_data.get("attacker_slots", 8),
-                attacker_defense_slots=enc_data.get("attacker_defense_slots", 0),
-                is_player_attacker=enc_data.get("is_player_attacker", True),
-                regen=enc_data.get("regen", True)
-            )
+            record = {}
+            for key in _ENCOUNTER_FIELDS:
+                if key not in enc_data:
+                    continue
+                value = enc_data[key]
+                if isinstance(value, simdjson.Array):
+                    value = value.as_list()
+                elif isinstance(value, simdjson.Object):
+                    value = value.as_dict()
+                record[key] = value
+            raw[_str_to_int(enc_id)] = record
+        return raw
 
     def get_unit(self, unit_id: int) -> Optional[UnitTemplate]:
         """Get a unit template by ID."""
         return self.units.get(unit_id)
 
+    def iter_player_units(self) -> Iterator[UnitTemplate]:
+        """Iterate over player-side unit templates without building a list."""
+        return iter(self.units_by_side.get(Side.PLAYER, ()))
+
+    def iter_enemy_units(self) -> Iterator[UnitTemplate]:
+        """Iterate over hostile unit templates without building a list."""
+        return iter(self.units_by_side.get(Side.HOSTILE, ()))
+
     def get_ability(self, ability_id: int) -> Optional[Ability]:
         """Get an ability by ID."""
         return self.abilities.get(ability_id)
@@ -378,3 +849,54 @@ class GameDataLoader:
         if self.config:
             return self.config.class_damage_mods.get(attacker_class, {}).get(defender_class, 1.0)
         return 1.0
+
+
+@functools.lru_cache(maxsize=None)
+def _get_game_data(data_dir: Path) -> GameDataLoader:
+    loader = GameDataLoader(data_dir)
+    loader.load_all()
+    return loader
+
+
+# Background loads started by preload_game_data(), by resolved data directory
+_preloads: dict[Path, threading.Thread] = {}
+
+
+def preload_game_data(data_dir: str | Path) -> None:
+    """
+    Start loading game data in a background thread.
+
+    A later get_game_data() for the same directory waits for this load
+    instead of starting its own, so callers can overlap the load with
+    other setup (imports, user input). Calling it again is a no-op.
+
+    Args:
+        data_dir: Path to the game data directory
+    """
+    path = Path(data_dir).resolve()
+    if path in _preloads:
+        return
+    thread = threading.Thread(
+        target=_get_game_data, args=(path,), name="game-data-preload", daemon=True
+    )
+    _preloads[path] = thread
+    thread.start()
+
+
+def get_game_data(data_dir: str | Path) -> GameDataLoader:
+    """
+    Get a loaded GameDataLoader shared by everything in this process.
+
+    Args:
+        data_dir: Path to the game data directory
+
+    Returns:
+        The loader for that directory, loaded on first request
+    """
+    path = Path(data_dir).resolve()
+    preload = _preloads.get(path)
+    if preload is not None:
+        # Only blocks while a background load is still running; if it
+        # failed, the load below retries and raises here
+        preload.join()
+    return _get_game_data(path)
@@ -273,6 +273,19 @@ DAMAGE_TYPE_NAMES = {
     "shell": DamageType.SHELL,
 }
 
+# DamageType value -> key in UnitStats.damage_mods / armor_damage_mods.
+# Types without their own modifier entry use the piercing modifiers.
+DAMAGE_MOD_KEYS = tuple(
+    {
+        DamageType.PIERCING: "piercing",
+        DamageType.COLD: "cold",
+        DamageType.CRUSHING: "crushing",
+        DamageType.EXPLOSIVE: "explosive",
+        DamageType.FIRE: "fire",
+    }.get(damage_type, "piercing")
+    for damage_type in DamageType
+)
+
 
 # Status effect string mapping for JSON parsing
 STATUS_EFFECT_NAMES = {
@@ -4,6 +4,8 @@ from typing import Optional, Any
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
 
 from .battle import BattleSimulator, BattleState, BattleResult, Action, BattleUnit
 from .models import Position
@@ -95,6 +97,17 @@ class BattleEnv(gym.Env):
         self.action_size = self.MAX_UNITS * self.MAX_WEAPONS * self.MAX_TARGETS
         self.action_space = spaces.Discrete(self.action_size)
 
+        # Buffer observations are written into (None allocates one per call);
+        # VectorBattleEnv points this at the env's row of its batch
+        self._obs_out: Optional[np.ndarray] = None
+
+        # Legal actions for the battle state they were computed for; mask,
+        # validation and the enemy policy often ask for the same state
+        self._legal_actions: list[Action] = []
+        self._legal_key: Optional[tuple] = None
+        self._mask = np.zeros(self.action_size, dtype=np.int8)
+        self._mask_key: Optional[tuple] = None
+
         # Track previous state for reward calculation
         self._prev_player_hp = 0
         self._prev_enemy_hp = 0
@@ -121,37 +134,58 @@ class BattleEnv(gym.Env):
         """Convert grid position to target index."""
         return pos.to_grid_id(width=5)
 
+    def _get_legal_actions(self) -> list[Action]:
+        """Legal actions for the current state, reused until the battle changes."""
+        key = (id(self.battle), self.battle.action_signature())
+        if key != self._legal_key:
+            self._legal_actions = self.battle.get_legal_actions()
+            self._legal_key = key
+        return self._legal_actions
+
     def _get_action_mask(self) -> np.ndarray:
-        """Get mask of valid actions."""
-        mask = np.zeros(self.action_size, dtype=np.int8)
+        """
+        Get mask of valid actions.
 
+        Built once per battle state and then reused, so the returned array is
+        read-only; copy it before modifying.
+        """
         if self.battle is None or self.battle.result != BattleResult.IN_PROGRESS:
-            return mask
+            return np.zeros(self.action_size, dtype=np.int8)
 
-        legal_actions = self.battle.get_legal_actions()
+        legal_actions = self._get_legal_actions()
+        if self._mask_key == self._legal_key:
+            return self._mask
 
+        # Weapon id -> weapon_idx (0-based) per acting unit, then all flat
+        # indices at once and a single scatter into the mask
+        units = self.battle.player_units
+        weapon_indices = {}
+        flat = []
         for action in legal_actions:
-            # Map weapon_id to weapon_idx (0-based)
-            unit = self.battle.player_units[action.unit_index]
-            weapon_ids = list(unit.template.weapons.keys())
-            if action.weapon_id in weapon_ids:
-                weapon_idx = weapon_ids.index(action.weapon_id)
-            else:
-                continue
-
-            target_idx = self._position_to_target_idx(action.target_position)
-
-            flat_action = self._encode_action(
-                action.unit_index,
-                weapon_idx,
-                target_idx
-            )
-
-            if 0 <= flat_action < self.action_size:
-                mask[flat_action] = 1
+            unit_idx = action.unit_index
+            indices = weapon_indices.get(unit_idx)
+            if indices is None:
+                indices = weapon_indices[unit_idx] = {
+                    weapon_id: i for i, weapon_id in enumerate(units[unit_idx].template.weapons)
+                }
+            weapon_idx = indices.get(action.weapon_id)
+            if weapon_idx is not None:
+                flat.append(self._encode_action(
+                    unit_idx, weapon_idx, self._position_to_target_idx(action.target_position)
+                ))
+
+        flat = np.asarray(flat, dtype=np.intp)
+        mask = np.zeros(self.action_size, dtype=np.int8)
+        mask[flat[(flat >= 0) & (flat < self.action_size)]] = 1
+        mask.flags.writeable = False
 
+        self._mask, self._mask_key = mask, self._legal_key
         return mask
 
+    def action_masks(self) -> np.ndarray:
+        """Get the current valid-action mask (MaskablePPO interface)."""
+        return self._get_action_mask()
+
     def _action_to_battle_action(self, action: int) -> Optional[Action]:
         """Convert environment action to battle Action."""
         unit_idx, weapon_idx, target_idx = self._decode_action(action)
@@ -174,16 +208,20 @@ class BattleEnv(gym.Env):
             target_position=target_pos
         )
 
+    def _get_observation(self) -> np.ndarray:
+        """Current observation, written into the shared buffer when one is set."""
+        return self.battle.get_state_vector(out=self._obs_out)
+
     def _get_random_enemy_action(self) -> Optional[Action]:
         """Get a random valid action for the enemy."""
         if self.battle is None:
             return None
 
-        legal_actions = self.battle.get_legal_actions()
+        legal_actions = self._get_legal_actions()
         if not legal_actions:
             return None
 
-        return self.battle.rng.choice(legal_actions)
+        return legal_actions[self.battle.np_rng.integers(len(legal_actions))]
 
     def _calculate_reward(self) -> float:
         """Calculate reward for the current step."""
@@ -204,8 +242,7 @@ class BattleEnv(gym.Env):
         reward += self.reward_config["turn_penalty"]
 
         # Damage dealt/taken rewards
-        current_player_hp = sum(u.current_hp for u in self.battle.player_units)
-        current_enemy_hp = sum(u.current_hp for u in self.battle.enemy_units)
+        current_player_hp, current_enemy_hp = self.battle.arrays.hp_by_side()
 
         damage_dealt = max(0, self._prev_enemy_hp - current_enemy_hp)
         damage_taken = max(0, self._prev_player_hp - current_player_hp)
@@ -214,8 +251,8 @@ class BattleEnv(gym.Env):
         reward += damage_taken * self.reward_config["damage_taken"]
 
         # Unit count changes
-        current_player_count = sum(1 for u in self.battle.player_units if u.is_alive)
-        current_enemy_count = sum(1 for u in self.battle.enemy_units if u.is_alive)
+        current_player_count = self.battle.alive_count(Side.PLAYER)
+        current_enemy_count = self.battle.alive_count(Side.HOSTILE)
 
         units_killed = self._prev_enemy_count - current_enemy_count
         units_lost = self._prev_player_count - current_player_count
@@ -231,6 +268,22 @@ class BattleEnv(gym.Env):
 
         return reward
 
+    def _get_info(self) -> dict:
+        """
+        Step/reset info for the current battle.
+
+        Alive counts come straight from the incrementally maintained battle
+        arrays. A new dict is built each call because wrappers such as
+        Monitor write episode stats into it.
+        """
+        arrays = self.battle.arrays
+        return {
+            "action_mask": self._get_action_mask(),
+            "turn": self.battle.turn_number,
+            "player_units_alive": arrays.alive_player,
+            "enemy_units_alive": arrays.alive_enemy
+        }
+
     def reset(
         self,
         *,
@@ -259,25 +312,17 @@ class BattleEnv(gym.Env):
 
         if self.battle is None:
             raise RuntimeError("Failed to create battle")
+        self._legal_key = self._mask_key = None
 
         if seed is not None:
             self.battle.seed(seed)
 
         # Initialize tracking variables
-        self._prev_player_hp = sum(u.current_hp for u in self.battle.player_units)
-        self._prev_enemy_hp = sum(u.current_hp for u in self.battle.enemy_units)
-        self._prev_player_count = len([u for u in self.battle.player_units if u.is_alive])
-        self._prev_enemy_count = len([u for u in self.battle.enemy_units if u.is_alive])
+        self._prev_player_hp, self._prev_enemy_hp = self.battle.arrays.hp_by_side()
+        self._prev_player_count = self.battle.alive_count(Side.PLAYER)
+        self._prev_enemy_count = self.battle.alive_count(Side.HOSTILE)
 
-        obs = self.battle.get_state_vector()
-        info = {
-            "action_mask": self._get_action_mask(),
-            "turn": self.battle.turn_number,
-            "player_units_alive": self._prev_player_count,
-            "enemy_units_alive": self._prev_enemy_count
-        }
-
-        return obs, info
+        return self._get_observation(), self._get_info()
 
     def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
         """Execute one step in the environment."""
@@ -290,7 +335,7 @@ class BattleEnv(gym.Env):
         # Check if battle already ended
         if self.battle.result != BattleResult.IN_PROGRESS:
             terminated = True
-            obs = self.battle.get_state_vector()
+            obs = self._get_observation()
             return obs, 0.0, terminated, truncated, {"action_mask": self._get_action_mask()}
 
         # Execute player action
@@ -298,7 +343,7 @@ class BattleEnv(gym.Env):
             battle_action = self._action_to_battle_action(action)
             if battle_action:
                 # Validate action
-                legal_actions = self.battle.get_legal_actions()
+                legal_actions = self._get_legal_actions()
                 is_legal = any(
                     a.unit_index == battle_action.unit_index and
                     a.weapon_id == battle_action.weapon_id and
@@ -326,16 +371,10 @@ class BattleEnv(gym.Env):
         elif self.battle.turn_number >= self.max_turns:
             truncated = True
 
-        obs = self.battle.get_state_vector()
-        info = {
-            "action_mask": self._get_action_mask(),
-            "turn": self.battle.turn_number,
-            "player_units_alive": sum(1 for u in self.battle.player_units if u.is_alive),
-            "enemy_units_alive": sum(1 for u in self.battle.enemy_units if u.is_alive),
-            "result": self.battle.result.name
-        }
+        info = self._get_info()
+        info["result"] = self.battle.result.name
 
-        return obs, reward, terminated, truncated, info
+        return self._get_observation(), reward, terminated, truncated, info
 
     def render(self) -> Optional[str]:
         """Render the current battle state."""
@@ -352,14 +391,9 @@ class BattleEnv(gym.Env):
         for y in range(3):
             row_str = "  "
             for x in range(5):
-                pos = Position(x, y)
-                unit = None
-                for u in self.battle.enemy_units:
-                    if u.position == pos:
-                        unit = u
-                        break
-
-                if unit and unit.is_alive:
+                unit = self.battle.get_unit_at_position(Position(x, y), Side.HOSTILE)
+
+                if unit:
                     hp_pct = int(unit.current_hp / unit.template.stats.hp * 100)
                     row_str += f"[{unit.template.class_type.name[:3]}{hp_pct:3d}%] "
                 else:
@@ -375,14 +409,9 @@ class BattleEnv(gym.Env):
         for y in range(3):
             row_str = "  "
             for x in range(5):
-                pos = Position(x, y)
-                unit = None
-                for u in self.battle.player_units:
-                    if u.position == pos:
-                        unit = u
-                        break
-
-                if unit and unit.is_alive:
+                unit = self.battle.get_unit_at_position(Position(x, y), Side.PLAYER)
+
+                if unit:
                     hp_pct = int(unit.current_hp / unit.template.stats.hp * 100)
                     row_str += f"[{unit.template.class_type.name[:3]}{hp_pct:3d}%] "
                 else:
@@ -529,12 +558,127 @@ class MultiWaveBattleEnv(BattleEnv):
         return obs, surrender_penalty, False, False, info
 
 
+class VectorBattleEnv(VectorEnv):
+    """
+    A batch of BattleEnv battles stepped together.
+
+    Observations, rewards, done flags and action masks live in preallocated
+    (num_envs, ...) arrays that every reset/step fills in place. Finished
+    battles are reset within the same step (gymnasium's SAME_STEP autoreset):
+    the returned observation starts the new episode, and the terminal one is
+    in infos["final_obs"] for the rows flagged by infos["_final_obs"].
+
+    The returned arrays are reused by the next call; copy them to keep them.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs: int, data_dir: str, **env_kwargs):
+        """
+        Args:
+            num_envs: Number of battles in the batch
+            data_dir: Path to the game data directory
+            **env_kwargs: Passed to every BattleEnv (units, encounter, rewards, ...)
+        """
+        self.envs = [BattleEnv(data_dir, **env_kwargs) for _ in range(num_envs)]
+        self.num_envs = num_envs
+
+        first = self.envs[0]
+        self.single_observation_space = first.observation_space
+        self.single_action_space = first.action_space
+        self.observation_space = batch_space(first.observation_space, num_envs)
+        self.action_space = batch_space(first.action_space, num_envs)
+
+        # Batch buffers, reused across calls
+        self._obs = np.zeros((num_envs, first.state_size), dtype=np.float32)
+        self._final_obs = np.zeros_like(self._obs)
+        self._rewards = np.zeros(num_envs, dtype=np.float64)
+        self._terminated = np.zeros(num_envs, dtype=np.bool_)
+        self._truncated = np.zeros(num_envs, dtype=np.bool_)
+        self._masks = np.zeros((num_envs, first.action_size), dtype=np.int8)
+
+        # Each battle writes its observation straight into its row
+        for env, row in zip(self.envs, self._obs):
+            env._obs_out = row
+
+    def _reset_env(self, i: int, seed: Optional[int] = None, options: Optional[dict] = None) -> None:
+        """Reset one battle and write its first observation and mask into the buffers."""
+        _, info = self.envs[i].reset(seed=seed, options=options)
+        self._masks[i] = info["action_mask"]
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int | list[Optional[int]]] = None,
+        options: Optional[dict] = None
+    ) -> tuple[np.ndarray, dict]:
+        """
+        Reset every battle.
+
+        Args:
+            seed: One seed per battle, or a base seed (battle i gets seed + i)
+            options: Passed to each BattleEnv.reset
+
+        Returns:
+            (observations, infos) with infos["action_mask"] of shape (num_envs, action_size)
+        """
+        if seed is None or isinstance(seed, int):
+            seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        else:
+            seeds = seed
+
+        for i, env_seed in enumerate(seeds):
+            self._reset_env(i, env_seed, options)
+        self._rewards[:] = 0.0
+        self._terminated[:] = False
+        self._truncated[:] = False
+
+        return self._obs, {"action_mask": self._masks}
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Step every battle with its action, resetting the ones that finish.
+
+        Args:
+            actions: One flat action index per battle
+
+        Returns:
+            (observations, rewards, terminated, truncated, infos)
+        """
+        obs, rewards, masks = self._obs, self._rewards, self._masks
+        terminated, truncated = self._terminated, self._truncated
+
+        for i, (env, action) in enumerate(zip(self.envs, np.asarray(actions).tolist())):
+            _, rewards[i], terminated[i], truncated[i], info = env.step(action)
+            masks[i] = info["action_mask"]
+
+        done = terminated | truncated
+        finished = np.flatnonzero(done)
+        if finished.size:
+            self._final_obs[finished] = obs[finished]
+            for i in finished.tolist():
+                self._reset_env(i)
+
+        infos = {"action_mask": masks, "final_obs": self._final_obs, "_final_obs": done}
+        return obs, rewards, terminated, truncated, infos
+
+    def action_masks(self) -> np.ndarray:
+        """Current valid-action masks, one row per battle (MaskablePPO interface)."""
+        return self._masks
+
+    def close_extras(self, **kwargs: Any) -> None:
+        """Close every battle."""
+        for env in self.envs:
+            env.close()
+
+
 # Register environments with gymnasium
 def register_envs():
     """Register custom environments with gymnasium."""
     gym.register(
         id="BattleSimulator-v0",
         entry_point="src.simulator.gym_env:BattleEnv",
+        vector_entry_point="src.simulator.gym_env:VectorBattleEnv",
     )
 
     gym.register(
@@ -10,9 +10,9 @@ from .enums import (
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
-    """Grid position (x=column, y=row)."""
+    """Grid position (x=column, y=row). Immutable, so it is safe to share and hash."""
     x: int
     y: int
 
@@ -34,7 +34,7 @@ class Position:
         return cls(x=grid_id % width, y=grid_id // width)
 
 
-@dataclass
+@dataclass(slots=True)
 class DamageArea:
     """AOE damage pattern relative to target."""
     pos: Position
@@ -42,7 +42,15 @@ class DamageArea:
     order: int = 1
 
 
-@dataclass
+def _area_arrays(areas: list[DamageArea]) -> tuple[np.ndarray, np.ndarray]:
+    """Pack an area pattern into (N, 2) int16 offsets and (N,) uint8 whole percents."""
+    offsets = np.array([(area.pos.x, area.pos.y) for area in areas], dtype=np.int16).reshape(-1, 2)
+    # Game data only uses whole percents up to 100, so a byte each is exact
+    percents = np.clip(np.rint([area.damage_percent for area in areas]), 0, 255).astype(np.uint8)
+    return offsets, percents
+
+
+@dataclass(slots=True)
 class TargetArea:
     """Targeting pattern configuration."""
     target_type: TargetType
@@ -51,7 +59,7 @@ class TargetArea:
     aoe_order_delay: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class AbilityStats:
     """Combat statistics for an ability."""
     # Cooldown and ammo
@@ -108,18 +116,31 @@ class AbilityStats:
     capture: bool = False
     min_hp_percent: float = 0.0
 
+    # Parallel arrays mirroring damage_area, built in __post_init__
+    damage_offsets: np.ndarray = field(init=False, repr=False, compare=False)  # (N, 2) int16 dx, dy
+    damage_percents: np.ndarray = field(init=False, repr=False, compare=False)  # (N,) uint8 whole percents
+
+    def __post_init__(self):
+        self.damage_offsets, self.damage_percents = _area_arrays(self.damage_area)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Ability:
-    """A combat ability/attack."""
+    """A combat ability/attack. Immutable and shared: copies of a unit reuse the same instance."""
     id: int
     name: str
     icon: str = ""
     damage_animation_type: str = ""
     stats: AbilityStats = field(default_factory=AbilityStats)
 
+    def __hash__(self):
+        return hash(self.id)
+
+    def __deepcopy__(self, memo):
+        return self
+
 
-@dataclass
+@dataclass(slots=True)
 class WeaponStats:
     """Weapon statistics."""
     ammo: int = -1  # -1 means unlimited
@@ -130,7 +151,7 @@ class WeaponStats:
     range_bonus: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Weapon:
     """A unit's weapon."""
     id: int
@@ -138,8 +159,11 @@ class Weapon:
     abilities: list[int]  # Ability IDs
     stats: WeaponStats = field(default_factory=WeaponStats)
 
+    # Resolved abilities[0], filled in by the data loader
+    primary_ability: Optional[Ability] = field(default=None, repr=False, compare=False)
 
-@dataclass
+
+@dataclass(slots=True)
 class UnitStats:
     """Combat statistics for a unit at a specific level."""
     hp: int = 100
@@ -171,7 +195,7 @@ class UnitStats:
     pv: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class UnitTemplate:
     """Template for a unit type (from JSON data)."""
     id: int
@@ -214,9 +238,14 @@ class UnitTemplate:
         return self.all_rank_stats[index]
 
 
-@dataclass
+@dataclass(slots=True)
 class StatusEffect:
-    """A status effect definition."""
+    """
+    A status effect definition.
+
+    Shared by every active instance, so its stun modifier dicts are
+    read-only at runtime and copies of a battle reuse the same object.
+    """
     id: int
     effect_type: StatusEffectType
     family: StatusEffectFamily
@@ -236,8 +265,11 @@ class StatusEffect:
     stun_damage_mods: dict[int, float] = field(default_factory=dict)
     stun_armor_damage_mods: dict[int, float] = field(default_factory=dict)
 
+    def __deepcopy__(self, memo):
+        return self
 
-@dataclass
+
+@dataclass(slots=True)
 class GridLayout:
     """Battle grid layout configuration."""
     id: int
@@ -245,6 +277,20 @@ class GridLayout:
     defender_grid: np.ndarray
     defender_wall: list[int]  # Wall heights per column
 
+    # Cross-grid attack distance between cells by grid id, built in __post_init__
+    distances: np.ndarray = field(init=False, repr=False, compare=False)  # (cells, cells) int16
+    distance_rows: list[list[int]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        height, width = self._shape()
+        rows, cols = np.divmod(np.arange(width * height), max(width, 1))
+        # Front rows face each other: attacker row + target row + 1, plus half the column offset
+        self.distances = (
+            rows[:, None] + rows[None, :] + 1 + np.abs(cols[:, None] - cols[None, :]) // 2
+        ).astype(np.int16)
+        # Plain lists for scalar lookups in the targeting loop
+        self.distance_rows = self.distances.tolist()
+
     @property
     def width(self) -> int:
         return self.attacker_grid.shape[1]
@@ -253,6 +299,17 @@ class GridLayout:
     def height(self) -> int:
         return self.attacker_grid.shape[0]
 
+    def _shape(self) -> tuple[int, int]:
+        """(height, width) of the grid, or (0, 0) for a layout without one."""
+        return self.attacker_grid.shape if self.attacker_grid.ndim == 2 else (0, 0)
+
+    def cell_of(self, pos: Position) -> int:
+        """Grid id of a position inside the layout, or -1 if it falls outside."""
+        height, width = self._shape()
+        if 0 <= pos.x < width and 0 <= pos.y < height:
+            return pos.y * width + pos.x
+        return -1
+
     def is_valid_cell(self, battle_side: BattleSide, pos: Position) -> bool:
         """Check if position is a valid cell for the given battle side."""
         grid = self.attacker_grid if battle_side == BattleSide.PLAYER_TEAM else self.defender_grid
@@ -261,7 +318,7 @@ class GridLayout:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class EncounterUnit:
     """Unit placement in an encounter."""
     grid_id: int
@@ -269,7 +326,7 @@ class EncounterUnit:
     rank: int = 1  # Unit rank (1-based: rank 1 is the first/lowest rank)
 
 
-@dataclass
+@dataclass(slots=True)
 class Encounter:
     """An enemy encounter definition."""
     id: int
@@ -290,7 +347,7 @@ class Encounter:
     regen: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassDamageMod:
     """Damage modifiers between unit classes."""
     attacker_class: UnitClass
@@ -298,7 +355,7 @@ class ClassDamageMod:
     multiplier: float
 
 
-@dataclass
+@dataclass(slots=True)
 class GameConfig:
     """Global game configuration."""
     # Class-based damage modifiers
@@ -2,7 +2,7 @@
 from __future__ import annotations
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 
 class LocalizationManager:
@@ -31,6 +31,9 @@ class LocalizationManager:
         # Direct key -> text cache
         self._cache: dict[str, dict[str, str]] = {}
 
+        # Language -> [(key_lower, text_lower, key, text)], built on first search
+        self._search_index: dict[str, list[tuple[str, str, str, str]]] = {}
+
         # Current language
         self.current_language = "en"
 
@@ -43,6 +46,7 @@ class LocalizationManager:
             language: Language code (e.g., "en", "de", "fr")
         """
         self.current_language = language
+        self._search_index.clear()
 
         # Load shared data (key -> ID mapping)
         shared_file = self.tables_dir / f"{table_name} Shared Data.json"
@@ -159,17 +163,26 @@ class LocalizationManager:
         query_lower = query.lower()
         results = []
 
-        lang_data = self.id_to_text.get(self.current_language, {})
-
-        for key, entry_id in self.key_to_id.items():
-            text = lang_data.get(entry_id, "")
-            if query_lower in key.lower() or query_lower in text.lower():
+        for key_lower, text_lower, key, text in self._get_search_index():
+            if query_lower in key_lower or query_lower in text_lower:
                 results.append((key, text))
                 if len(results) >= limit:
                     break
 
         return results
 
+    def _get_search_index(self) -> list[tuple[str, str, str, str]]:
+        """Get the lowercased search entries for the current language, building them once."""
+        index = self._search_index.get(self.current_language)
+        if index is None:
+            lang_data = self.id_to_text.get(self.current_language, {})
+            index = []
+            for key, entry_id in self.key_to_id.items():
+                text = lang_data.get(entry_id, "")
+                index.append((key.lower(), text.lower(), key, text))
+            self._search_index[self.current_language] = index
+        return index
+
     def get_all_keys_with_prefix(self, prefix: str) -> list[tuple[str, str]]:
         """
         Get all keys starting with a prefix.
@@ -211,6 +224,9 @@ class LocalizedDataLoader:
         self.data_loader = data_loader
         self.loc = localization
 
+        # [(display_name_lower, unit)], built on first name lookup
+        self._unit_names: Optional[list[tuple[str, object]]] = None
+
     def get_unit_display_name(self, unit_id: int) -> str:
         """Get the display name for a unit."""
         unit = self.data_loader.get_unit(unit_id)
@@ -218,6 +234,27 @@ class LocalizedDataLoader:
             return self.loc.resolve_unit_name(unit.name)
         return f"Unit {unit_id}"
 
+    def find_unit_by_name(self, name_part: str) -> Iterator:
+        """
+        Find units whose display name contains the given text.
+
+        Matches are yielded lazily, so callers wanting only the first few
+        can stop early (e.g. with itertools.islice).
+
+        Args:
+            name_part: Name fragment (case-insensitive)
+
+        Yields:
+            Matching UnitTemplates
+        """
+        if self._unit_names is None:
+            self._unit_names = [
+                (self.loc.resolve_unit_name(unit.name).lower(), unit)
+                for unit in self.data_loader.units.values()
+            ]
+        name_lower = name_part.lower()
+        return (unit for name, unit in self._unit_names if name_lower in name)
+
     def get_ability_display_name(self, ability_id: int) -> str:
         """Get the display name for an ability."""
         ability = self.data_loader.get_ability(ability_id)
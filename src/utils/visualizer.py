@@ -1,6 +1,7 @@
 """Interactive battle visualizer for debugging and verification."""
 from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
+import random
 import sys
 from pathlib import Path
 
@@ -44,6 +45,11 @@ class BattleVisualizer:
     GRID_HEIGHT = 3
     CELL_WIDTH = 12
 
+    # Static pieces of the grid, built once
+    _COLUMN_HEADER = "     " + "".join(f"  Col {x}   " for x in range(GRID_WIDTH))
+    _SEPARATOR = "─" * (CELL_WIDTH * GRID_WIDTH + GRID_WIDTH + 1)
+    _ROW_LABELS = ["Front", "Mid  ", "Back "]
+
     def __init__(self, battle: "BattleState"):
         self.battle = battle
         self.selected_unit_idx: Optional[int] = None
@@ -51,6 +57,9 @@ class BattleVisualizer:
         self.highlighted_targets: set[tuple[int, int]] = set()
         self.aoe_pattern: dict[tuple[int, int], float] = {}
 
+        # is_enemy -> (state signature, rendered rows) of the last side render
+        self._side_cache: dict[bool, tuple[tuple, list[str]]] = {}
+
         # Initialize localization
         self.loc = None
         try:
@@ -88,7 +97,7 @@ class BattleVisualizer:
             lines.append("")
 
         # Separator
-        lines.append("─" * (self.CELL_WIDTH * self.GRID_WIDTH + self.GRID_WIDTH + 1))
+        lines.append(self._SEPARATOR)
         lines.append("")
 
         # Player grid (bottom)
@@ -110,25 +119,33 @@ class BattleVisualizer:
         show_targets: bool,
         show_aoe: bool
     ) -> list[str]:
-        """Render one side's grid."""
-        lines = []
+        """Render one side's grid, reusing the previous rows if nothing visible changed."""
+        signature = (
+            # Template id fixes the class label; max hp varies by rank within one id
+            tuple(
+                (u.position.x, u.position.y, u.is_alive, u.current_hp, u.template.id, u.template.stats.hp)
+                for u in units
+            ),
+            show_targets and frozenset(self.highlighted_targets),
+            show_aoe and tuple(self.aoe_pattern.items()),
+            None if is_enemy else self.selected_unit_idx,
+        )
+        cached = self._side_cache.get(is_enemy)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
 
-        # Column headers
-        header = "     "
-        for x in range(self.GRID_WIDTH):
-            header += f"  Col {x}   "
-        lines.append(header)
+        lines = [self._COLUMN_HEADER]
 
-        # Create grid lookup
+        # Create grid lookup (unit and its index in the side's list)
         unit_at = {}
-        for unit in units:
+        for idx, unit in enumerate(units):
             key = (unit.position.x, unit.position.y)
-            unit_at[key] = unit
+            unit_at[key] = (idx, unit)
 
         # Render rows - both sides now show back to front (flipped) so front rows are at bottom
         # This makes both sides face toward each other (enemy faces down, player faces up)
         row_order = range(self.GRID_HEIGHT - 1, -1, -1)
-        row_labels = ["Front", "Mid  ", "Back "]
+        row_labels = self._ROW_LABELS
 
         for y in row_order:
             row_str = f"{row_labels[y]} │"
@@ -140,7 +157,7 @@ class BattleVisualizer:
                 is_blocked = is_back_row and is_corner
 
                 pos = (x, y)
-                unit = unit_at.get(pos)
+                unit_idx, unit = unit_at.get(pos, (None, None))
 
                 # Determine cell styling
                 cell_bg = ""
@@ -176,7 +193,7 @@ class BattleVisualizer:
 
                     # Check if this is the selected unit
                     if not is_enemy and self.selected_unit_idx is not None:
-                        if units.index(unit) == self.selected_unit_idx:
+                        if unit_idx == self.selected_unit_idx:
                             cell_fg = Colors.BOLD + Colors.WHITE
                             cell_bg = Colors.BG_BLUE
 
@@ -190,6 +207,7 @@ class BattleVisualizer:
 
             lines.append(row_str)
 
+        self._side_cache[is_enemy] = (signature, lines)
         return lines
 
     def _get_localized(self, key: str) -> str:
@@ -445,8 +463,6 @@ class InteractiveBattleSession:
 
     def _random_action(self):
         """Take a random legal action."""
-        import random
-
         actions = self.battle.get_legal_actions()
         if not actions:
             print("No legal actions available!")
@@ -0,0 +1,12 @@
+"""Shared test fixtures."""
+import pytest
+
+from src.simulator.combat import TagResolver, TargetingSystem
+
+
+@pytest.fixture(scope="session")
+def targeting():
+    """Targeting system shared across the session, with its kernels compiled up front."""
+    system = TargetingSystem(TagResolver({}))
+    system.warmup()
+    return system
@@ -1,12 +1,17 @@
 """Tests for battle simulation functionality."""
+import random
+
 import pytest
 import numpy as np
 
 from src.simulator.battle import (
-    BattleSimulator, BattleState, BattleResult, BattleUnit, Action
+    BattleSimulator, BattleState, BattleResult, BattleUnit, Action, ActionHistory
+)
+from src.simulator.models import (
+    Position, UnitTemplate, UnitStats, Ability, AbilityStats, DamageArea
 )
-from src.simulator.models import Position, UnitTemplate, UnitStats
-from src.simulator.enums import Side, UnitClass, DamageType
+from src.simulator._action_match import pack_actions, find_match
+from src.simulator.enums import Side, UnitClass, DamageType, TARGETABLE_ALL
 from src.simulator.data_loader import GameDataLoader
 
 
@@ -152,6 +157,47 @@ class TestBattleState:
         assert len(battle.enemy_units) > 0
         assert battle.result == BattleResult.IN_PROGRESS
 
+    def test_create_battle_from_encounter_arrays(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that unit IDs and ranks may be passed as numpy arrays."""
+        if not sample_unit_ids:
+            pytest.skip("No sample units available")
+
+        enc_id = next(iter(data_loader.encounters.keys()))
+        ids = sample_unit_ids[:3]
+
+        from_list = battle_simulator.create_battle_from_encounter(enc_id, ids, [1] * len(ids))
+        from_array = battle_simulator.create_battle_from_encounter(
+            enc_id,
+            np.asarray(ids, dtype=np.int32),
+            np.ones(len(ids), dtype=np.int8)
+        )
+
+        assert [u.template.id for u in from_array.player_units] == \
+            [u.template.id for u in from_list.player_units]
+        assert [u.current_hp for u in from_array.player_units] == \
+            [u.current_hp for u in from_list.player_units]
+
+    def test_rank_copies_share_abilities(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that ranked template copies reuse the immutable ability objects."""
+        if not sample_unit_ids:
+            pytest.skip("No sample units available")
+
+        template = data_loader.get_unit(sample_unit_ids[0])
+        ranked = battle_simulator._apply_rank_to_template(template, 1)
+
+        assert ranked is not template
+        for weapon_id, weapon in template.weapons.items():
+            assert ranked.weapons[weapon_id] is not weapon
+            assert ranked.weapons[weapon_id].primary_ability is weapon.primary_ability
+
+        ability = next(w.primary_ability for w in template.weapons.values())
+        with pytest.raises(AttributeError):
+            ability.name = "changed"
+
+        # Same type and rank reuse one copy; other ranks get their own
+        assert battle_simulator._apply_rank_to_template(template, 1) is ranked
+        assert battle_simulator._apply_rank_to_template(template, 2) is not ranked
+
     def test_create_custom_battle(self, battle_simulator, data_loader, sample_unit_ids):
         """Test creating custom battle."""
         if len(sample_unit_ids) < 2:
@@ -230,6 +276,29 @@ class TestBattleState:
         assert battle.is_player_turn
         assert battle.turn_number == 1
 
+    def test_side_lists_follow_turn(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that the acting and opposing lists swap with is_player_turn."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:1],
+            player_positions=[0],
+            enemy_unit_ids=sample_unit_ids[1:2],
+            enemy_positions=[0]
+        )
+        assert battle.current_side_units is battle.player_units
+        assert battle.opposing_side_units is battle.enemy_units
+
+        battle.end_turn()
+        assert battle.current_side_units is battle.enemy_units
+        assert battle.opposing_side_units is battle.player_units
+
+        clone = battle.clone()
+        assert not clone.is_player_turn
+        assert clone.current_side_units is clone.enemy_units
+
     def test_state_vector(self, battle_simulator, data_loader, sample_unit_ids):
         """Test state vector generation."""
         if len(sample_unit_ids) < 2:
@@ -252,6 +321,365 @@ class TestBattleState:
         assert state.min() >= 0.0
         assert state.max() <= 1.0 or np.isclose(state.max(), 1.0, atol=0.1)
 
+    def test_state_vector_into_buffer(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that a stale buffer is overwritten with the same vector."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+
+        expected = battle.get_state_vector()
+        buffer = np.full_like(expected, 7.0)
+
+        assert battle.get_state_vector(out=buffer) is buffer
+        np.testing.assert_array_equal(buffer, expected)
+
+    def test_arrays_track_unit_state(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that the SoA arrays mirror unit HP and alive state."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+        arrays = battle.arrays
+
+        assert arrays.num_player == len(battle.player_units)
+        assert len(arrays.hp) == len(battle.player_units) + len(battle.enemy_units)
+
+        target = battle.enemy_units[0]
+        target.take_damage(99999, DamageType.EXPLOSIVE)
+
+        slot = arrays.num_player
+        assert arrays.hp[slot] == target.current_hp == 0
+        assert arrays.is_alive[slot] == 0
+        assert int(arrays.is_alive[arrays.enemy_slice].sum()) == len(battle.enemy_units) - 1
+        assert arrays.hp_by_side() == (
+            sum(u.current_hp for u in battle.player_units),
+            sum(u.current_hp for u in battle.enemy_units)
+        )
+
+    def test_unit_at_position_index(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that position lookups follow deaths and moves."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+        player, enemy = battle.player_units[0], battle.enemy_units[1]
+
+        # Both grids share coordinates; no side means player team first
+        assert battle.get_unit_at_position(player.position) is player
+        assert battle.get_unit_at_position(enemy.position, Side.HOSTILE) is enemy
+
+        enemy.take_damage(99999, DamageType.EXPLOSIVE)
+        assert battle.get_unit_at_position(enemy.position, Side.HOSTILE) is None
+
+        player.position = Position(4, 2)
+        assert battle.get_unit_at_position(Position(4, 2), Side.PLAYER) is player
+        assert battle.get_unit_at_position(Position(0, 0), Side.PLAYER) is None
+
+    def test_accepted_tags_follow_hierarchy(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that ability target tags expand through the tag hierarchy."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+        hierarchy = data_loader.config.tag_hierarchy
+        parent = next((tag for tag in hierarchy if tag != TARGETABLE_ALL), None)
+        if parent is None:
+            pytest.skip("No tag hierarchy available")
+        children = hierarchy[parent]
+
+        assert battle._accepted_tags(Ability(id=-1, name="any")) is None
+        assert battle._accepted_tags(
+            Ability(id=-2, name="tagged", stats=AbilityStats(targets=[parent]))
+        ) == frozenset([parent, *children])
+
+        # Precomputed candidates give the same targets as a fresh scan
+        unit = battle.player_units[0]
+        candidates = battle._target_candidates()
+        for weapon_id in unit.get_available_weapons():
+            assert battle.get_valid_targets(unit, weapon_id, candidates) == \
+                battle.get_valid_targets(unit, weapon_id)
+
+    def test_aoe_targets_cached(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that splash cells are cached per ability and tile and still track deaths."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+        ability = Ability(id=-1, name="splash", stats=AbilityStats(damage_area=[
+            DamageArea(Position(0, 0), 100.0),
+            DamageArea(Position(1, 0), 50.0),
+            DamageArea(Position(2, 0), 25.0),
+        ]))
+        first, second = battle.player_units
+
+        targets = battle._get_aoe_targets(first.position, ability)
+        assert targets == [(first, 100.0), (second, 50.0)]
+        assert (-1, first.position.x, first.position.y) in battle._aoe_cache
+
+        # Grids share coordinates, so clear both sides of the splash cell
+        second.take_damage(99999, DamageType.EXPLOSIVE)
+        battle.enemy_units[1].take_damage(99999, DamageType.EXPLOSIVE)
+        clone = battle.clone()
+        assert clone._get_aoe_targets(first.position, ability) == [(clone.player_units[0], 100.0)]
+        assert clone._aoe_cache is battle._aoe_cache
+
+    def test_line_of_sight_uses_living_units(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that only living units in between block line of sight."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 5],
+            enemy_unit_ids=sample_unit_ids[:1],
+            enemy_positions=[4]
+        )
+        blocker = battle.player_units[1]
+        assert blocker.position == Position(0, 1)
+
+        assert not battle._has_line_of_sight(Position(0, 0), Position(0, 2))
+        assert battle._has_line_of_sight(Position(1, 0), Position(0, 2))
+
+        blocker.take_damage(99999, DamageType.EXPLOSIVE)
+        assert battle._has_line_of_sight(Position(0, 0), Position(0, 2))
+
+    def test_crit_bonus_by_target_tags(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that tag crit bonuses apply only to matching defenders and are memoized."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:1],
+            player_positions=[0],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+        attacker = battle.player_units[0]
+        defender = battle.enemy_units[0]
+        tag = defender.template.tags[0] if defender.template.tags else -1
+        ability = Ability(id=-1, name="crit", stats=AbilityStats(
+            critical_hit_percent=5.0, critical_bonuses={tag: 10.0, -2: 50.0}
+        ))
+        base = attacker.template.stats.critical + 5.0
+
+        expected = base + (10.0 if defender.template.tags else 0.0)
+        assert battle._calculate_crit_chance(attacker, defender, ability) == expected
+        assert battle._crit_cache[(-1, defender.template.id)] == expected - base
+        assert battle._calculate_crit_chance(attacker, defender, ability) == expected
+
+    def test_seeded_battles_are_independent(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that each battle carries its own seeded RNGs."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        def make(seed):
+            battle = battle_simulator.create_custom_battle(
+                layout_id=2,
+                player_unit_ids=sample_unit_ids[:2],
+                player_positions=[0, 1],
+                enemy_unit_ids=sample_unit_ids[:2],
+                enemy_positions=[0, 1]
+            )
+            battle.seed(seed)
+            return battle
+
+        first, second, other = make(7), make(7), make(8)
+        first_rolls = (first.rng.random(), first.np_rng.random(4).tolist())
+        assert (second.rng.random(), second.np_rng.random(4).tolist()) == first_rolls
+        assert (other.rng.random(), other.np_rng.random(4).tolist()) != first_rolls
+
+    def test_clone_is_independent(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that a cloned battle shares templates but not unit state."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+        battle.seed(3)
+        actions = battle.get_legal_actions()
+        if actions:
+            battle.execute_action(actions[0])
+
+        clone = battle.clone()
+        assert clone.player_units[0].template is battle.player_units[0].template
+        assert list(clone.action_history) == list(battle.action_history)
+        assert clone.rng.random() == battle.rng.random()
+        assert clone.np_rng.random() == battle.np_rng.random()
+
+        original_hp = battle.enemy_units[0].current_hp
+        alive_before = battle.alive_count(Side.HOSTILE)
+        clone.enemy_units[0].take_damage(99999, DamageType.EXPLOSIVE)
+        clone.player_units[0].weapon_cooldowns[-1] = 5
+
+        assert battle.enemy_units[0].current_hp == original_hp
+        assert battle.alive_count(Side.HOSTILE) == alive_before
+        assert clone.alive_count(Side.HOSTILE) == alive_before - (1 if original_hp > 0 else 0)
+        assert -1 not in battle.player_units[0].weapon_cooldowns
+
+    def test_unit_index_distinguishes_equal_units(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that identical stacked units still report their own index."""
+        if not sample_unit_ids:
+            pytest.skip("No sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:1],
+            player_positions=[0],
+            enemy_unit_ids=[sample_unit_ids[0]] * 2,
+            enemy_positions=[3, 3]
+        )
+        for unit in battle.enemy_units:
+            unit.take_damage(99999, DamageType.EXPLOSIVE)
+
+        first, second = battle.enemy_units
+        assert first == second
+        assert battle._get_unit_index(first) == 0
+        assert battle._get_unit_index(second) == 1
+
+    def test_simulate_random_battles(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test batched random rollouts are reproducible and leave the start state alone."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+        start_hp = battle.arrays.hp.copy()
+
+        batch = battle_simulator.simulate_random_battles(battle, n=4, max_turns=5, seed=11)
+        again = battle_simulator.simulate_random_battles(battle, n=4, max_turns=5, seed=11)
+
+        assert batch.results.shape == batch.turns.shape == (4,)
+        assert batch.hp.shape == (4, len(start_hp))
+        assert (batch.turns <= 5).all()
+        assert 0.0 <= batch.win_rate() <= 1.0
+        np.testing.assert_array_equal(batch.hp, again.hp)
+        np.testing.assert_array_equal(battle.arrays.hp, start_hp)
+        assert battle.turn_number == 0
+
+    def test_rollout_policy_and_battle_streams_differ(self, battle_simulator, data_loader,
+                                                      sample_unit_ids, monkeypatch):
+        """Test that each rollout's policy RNG is not a copy of its battle RNG."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+
+        battle_rolls, policy_rolls = {}, {}
+        seed, sample = BattleState.seed, BattleState.sample_random_action
+
+        def spy_seed(state, value):
+            seed(state, value)
+            battle_rolls[id(state)] = random.Random(value).random()
+
+        def spy_sample(state, rng):
+            if id(state) not in policy_rolls:
+                probe = random.Random()
+                probe.setstate(rng.getstate())
+                policy_rolls[id(state)] = probe.random()
+            return sample(state, rng)
+
+        monkeypatch.setattr(BattleState, "seed", spy_seed)
+        monkeypatch.setattr(BattleState, "sample_random_action", spy_sample)
+        battle_simulator.simulate_random_battles(battle, n=4, max_turns=1, seed=11)
+
+        assert policy_rolls
+        for state_id, roll in policy_rolls.items():
+            assert roll != battle_rolls[state_id]
+
+    def test_sample_random_action_matches_choice(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that sampling picks the same action as choosing from the full list."""
+        if len(sample_unit_ids) < 4:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:4],
+            player_positions=[0, 1, 2, 3],
+            enemy_unit_ids=sample_unit_ids[:4],
+            enemy_positions=[0, 1, 2, 3]
+        )
+        legal_actions = battle.get_legal_actions()
+        if not legal_actions:
+            pytest.skip("No legal actions available")
+
+        for seed in range(20):
+            assert battle.sample_random_action(random.Random(seed)) == \
+                random.Random(seed).choice(legal_actions)
+
+    def test_alive_count(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that alive counts follow kills and revives."""
+        if len(sample_unit_ids) < 2:
+            pytest.skip("Not enough sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:2],
+            player_positions=[0, 1],
+            enemy_unit_ids=sample_unit_ids[:2],
+            enemy_positions=[0, 1]
+        )
+
+        assert battle.alive_count(Side.PLAYER) == 2
+        assert battle.alive_count(Side.HOSTILE) == 2
+
+        target = battle.enemy_units[1]
+        target.take_damage(99999, DamageType.EXPLOSIVE)
+        target.take_damage(99999, DamageType.EXPLOSIVE)
+        assert battle.alive_count(Side.HOSTILE) == 1
+        assert battle.alive_count(Side.PLAYER) == 2
+
+        target.is_alive = True
+        assert battle.alive_count(Side.HOSTILE) == 2
+
     def test_surrender(self, battle_simulator, data_loader, sample_unit_ids):
         """Test surrender functionality."""
         if len(sample_unit_ids) < 2:
@@ -305,6 +733,43 @@ class TestBattleSimulator:
         assert result in [BattleResult.PLAYER_WIN, BattleResult.ENEMY_WIN, BattleResult.IN_PROGRESS]
 
 
+class TestActionMatch:
+    """Tests for packed legal-action lookup."""
+
+    def test_find_match(self):
+        """Test locating an action in the packed array."""
+        actions = [
+            Action(0, 10, Position(1, 2)),
+            Action(1, 11, Position(3, 0)),
+            Action(1, 11, Position(4, 1)),
+        ]
+        packed = pack_actions(actions)
+
+        assert packed.shape == (3, 4)
+        assert find_match(packed, 1, 11, 4, 1) == 2
+        assert find_match(packed, 0, 10, 1, 2) == 0
+        assert find_match(packed, 2, 10, 1, 2) == -1
+
+    def test_find_match_empty(self):
+        """Test lookup against no legal actions."""
+        assert find_match(pack_actions([]), 0, 0, 0, 0) == -1
+
+
+class TestActionHistory:
+    """Tests for the compact action history buffer."""
+
+    def test_append_and_iterate(self):
+        """Test that recorded actions round-trip past the initial capacity."""
+        history = ActionHistory(capacity=2)
+        actions = [Action(i % 3, i % 2, Position(i % 5, i % 3)) for i in range(5)]
+        for action in actions:
+            history.append(action)
+
+        assert len(history) == 5
+        assert history.as_array().shape == (5, 4)
+        assert list(history) == actions
+
+
 class TestPosition:
     """Tests for Position class."""
 
@@ -344,3 +809,38 @@ class TestPosition:
                 grid_id = pos.to_grid_id(width)
                 restored = Position.from_grid_id(grid_id, width)
                 assert pos == restored, f"Failed for pos {pos}"
+
+
+class TestGridLayout:
+    """Tests for GridLayout helpers."""
+
+    def test_distance_table_matches_formula(self, battle_simulator, data_loader, sample_unit_ids):
+        """Test that the precomputed distances match the cross-grid distance rule."""
+        if not sample_unit_ids:
+            pytest.skip("No sample units available")
+
+        battle = battle_simulator.create_custom_battle(
+            layout_id=2,
+            player_unit_ids=sample_unit_ids[:1],
+            player_positions=[0],
+            enemy_unit_ids=sample_unit_ids[:1],
+            enemy_positions=[0]
+        )
+        layout = battle.layout
+        cells = layout.width * layout.height
+        assert layout.distances.shape == (cells, cells)
+
+        for a in range(cells):
+            for t in range(cells):
+                expected = battle._calculate_distance(
+                    Position.from_grid_id(a, layout.width), Position.from_grid_id(t, layout.width)
+                )
+                assert layout.distance_rows[a][t] == expected
+
+    def test_cell_of(self, data_loader):
+        """Test grid ids for positions inside and outside the layout."""
+        layout = data_loader.config.layouts[2]
+
+        assert layout.cell_of(Position(1, 1)) == layout.width + 1
+        assert layout.cell_of(Position(layout.width, 0)) == -1
+        assert layout.cell_of(Position(0, layout.height)) == -1
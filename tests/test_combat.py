@@ -0,0 +1,252 @@
+"""Tests for combat mechanics."""
+import copy
+import random
+
+import pytest
+import numpy as np
+
+from src.simulator.battle import BattleUnit
+from src.simulator.combat import TargetingSystem, DamageCalculator, StatusEffectSystem
+from src.simulator._damage import damage_kernel, split_damage
+from src.simulator.enums import (
+    AttackDirection, BattleSide, DamageType, LineOfFire, TargetType,
+    StatusEffectType, StatusEffectFamily
+)
+from src.simulator.models import (
+    Position, Ability, AbilityStats, DamageArea, TargetArea,
+    Weapon, WeaponStats, UnitTemplate, UnitStats, StatusEffect
+)
+
+
+def make_unit(dodge: int = 0, accuracy: int = 0, critical: float = 0.0, defense: int = 0) -> BattleUnit:
+    """Create a standalone battle unit with controlled stats."""
+    template = UnitTemplate(
+        id=1,
+        name="test_unit",
+        stats=UnitStats(hp=1000, dodge=dodge, accuracy=accuracy, critical=critical, defense=defense)
+    )
+    return BattleUnit(template=template, position=Position(0, 0), battle_side=BattleSide.PLAYER_TEAM)
+
+
+def make_weapon(damage_min: int = 10, damage_max: int = 20) -> Weapon:
+    """Create a weapon with a fixed damage range."""
+    return Weapon(id=1, name="test_weapon", abilities=[1],
+                  stats=WeaponStats(base_damage_min=damage_min, base_damage_max=damage_max))
+
+
+class TestTargetingSystem:
+    """Tests for TargetingSystem helpers."""
+
+    @pytest.mark.parametrize("attacker_pos, target_pos, direction, expected", [
+        # ANY allows every row relationship
+        (Position(0, 1), Position(0, 0), AttackDirection.ANY, True),
+        (Position(0, 1), Position(0, 1), AttackDirection.ANY, True),
+        (Position(0, 1), Position(0, 2), AttackDirection.ANY, True),
+        # FORWARD requires the target on a higher row
+        (Position(0, 0), Position(0, 2), AttackDirection.FORWARD, True),
+        (Position(0, 1), Position(0, 1), AttackDirection.FORWARD, False),
+        (Position(0, 2), Position(0, 0), AttackDirection.FORWARD, False),
+        # BACKWARD requires the target on a lower row
+        (Position(0, 2), Position(3, 0), AttackDirection.BACKWARD, True),
+        (Position(0, 1), Position(0, 1), AttackDirection.BACKWARD, False),
+        (Position(0, 0), Position(0, 2), AttackDirection.BACKWARD, False),
+    ])
+    def test_attack_direction(self, targeting, attacker_pos, target_pos, direction, expected):
+        """Test attack direction constraints between rows."""
+        assert targeting.can_attack_direction(attacker_pos, target_pos, direction) == expected
+
+    def test_attack_direction_accepts_int(self):
+        """Test that raw int directions match their enum counterparts."""
+        attacker, target = Position(1, 0), Position(1, 1)
+        for direction in AttackDirection:
+            assert TargetingSystem.can_attack_direction(attacker, target, int(direction)) == \
+                TargetingSystem.can_attack_direction(attacker, target, direction)
+
+    def test_can_fire_matches_separate_checks(self, targeting):
+        """Test the combined table agrees with the direction and line-of-fire rules."""
+        attacker = Position(1, 1)
+        for target in (Position(1, 0), Position(2, 1), Position(1, 2)):
+            for direction in AttackDirection:
+                for lof in LineOfFire:
+                    for blocked in (False, True):
+                        expected = (
+                            targeting.can_attack_direction(attacker, target, direction)
+                            and not (lof == LineOfFire.DIRECT and blocked)
+                        )
+                        assert targeting.can_fire(attacker, target, direction, lof, blocked) == expected
+
+    def test_single_target(self):
+        """Test single-target detection from damage and target areas."""
+        plain = Ability(id=1, name="plain")
+        assert TargetingSystem.is_single_target(plain)
+
+        centered = Ability(id=2, name="centered", stats=AbilityStats(
+            damage_area=[DamageArea(pos=Position(0, 0))]))
+        assert TargetingSystem.is_single_target(centered)
+
+        splash = Ability(id=3, name="splash", stats=AbilityStats(
+            damage_area=[DamageArea(pos=Position(0, 0)), DamageArea(pos=Position(1, 0), damage_percent=50.0)]))
+        assert not TargetingSystem.is_single_target(splash)
+
+        row = Ability(id=4, name="row", stats=AbilityStats(
+            target_area=TargetArea(target_type=TargetType.ROW, data=[])))
+        assert not TargetingSystem.is_single_target(row)
+
+    def test_damage_area_arrays(self):
+        """Test the damage area is mirrored into parallel arrays."""
+        stats = AbilityStats(damage_area=[
+            DamageArea(pos=Position(0, 0)),
+            DamageArea(pos=Position(-1, 1), damage_percent=50.0),
+        ])
+        assert stats.damage_offsets.dtype == np.int16
+        assert stats.damage_offsets.tolist() == [[0, 0], [-1, 1]]
+        assert stats.damage_percents.dtype == np.uint8
+        assert stats.damage_percents.tolist() == [100, 50]
+        assert AbilityStats().damage_offsets.shape == (0, 2)
+
+
+class TestDamageCalculator:
+    """Tests for DamageCalculator."""
+
+    def test_multi_hit_shape_and_range(self):
+        """Test that every shot is rolled and lands in the weapon's range."""
+        calc = DamageCalculator({})
+        ability = Ability(id=1, name="burst", stats=AbilityStats(attacks_per_use=2, shots_per_attack=5))
+
+        damage, crits, dodged = calc.calculate_multi_hit(
+            make_unit(), make_unit(), make_weapon(10, 20), ability, 100.0, np.random.default_rng(0)
+        )
+
+        assert damage.shape == crits.shape == dodged.shape == (2, 5)
+        assert not dodged.any() and not crits.any()
+        assert damage.min() >= 10 and damage.max() <= 20
+
+    def test_single_shot_covers_range(self):
+        """Test that single-shot base damage rolls reach both ends of the weapon's range."""
+        calc = DamageCalculator({})
+        attacker, defender, weapon = make_unit(), make_unit(), make_weapon(10, 14)
+        ability = Ability(id=1, name="shot")
+        rng = random.Random(0)
+
+        rolled = {calc.calculate_damage(attacker, defender, weapon, ability, 100.0, rng)[0]
+                  for _ in range(500)}
+
+        assert rolled == {10, 11, 12, 13, 14}
+
+    def test_multi_hit_shot_counts(self):
+        """Test that each (attacks, shots) configuration rolls attacks * shots hits."""
+        calc = DamageCalculator({})
+        attacker, defender, weapon = make_unit(), make_unit(), make_weapon(10, 20)
+        configs = np.array([(1, 1), (1, 3), (2, 5), (4, 2), (3, 10)])
+        rng = np.random.default_rng(0)
+
+        totals = np.array([
+            calc.calculate_multi_hit(
+                attacker, defender, weapon,
+                Ability(id=1, name="burst", stats=AbilityStats(attacks_per_use=attacks, shots_per_attack=shots)),
+                100.0, rng
+            )[0].size
+            for attacks, shots in configs.tolist()
+        ])
+
+        np.testing.assert_array_equal(totals, configs[:, 0] * configs[:, 1])
+
+    def test_apply_damage_uses_type_modifier(self):
+        """Test that apply_damage picks the modifier matching the damage type."""
+        calc = DamageCalculator({})
+        target = make_unit()
+        target.template.stats.damage_mods = {"fire": 0.5, "piercing": 2.0}
+
+        assert calc.apply_damage(target, 100, DamageType.FIRE) == 50
+        # Types without their own modifier fall back to piercing
+        assert calc.apply_damage(target, 100, DamageType.SHELL) == 200
+
+    def test_multi_hit_dodges_and_crits(self):
+        """Test that dodged shots deal nothing and crits apply the 1.5x bonus."""
+        calc = DamageCalculator({})
+        ability = Ability(id=1, name="burst", stats=AbilityStats(attacks_per_use=4, shots_per_attack=50))
+
+        damage, crits, dodged = calc.calculate_multi_hit(
+            make_unit(critical=50.0), make_unit(dodge=50), make_weapon(10, 10), ability, 100.0,
+            np.random.default_rng(1)
+        )
+
+        assert dodged.any() and crits.any()
+        assert (damage[dodged] == 0).all()
+        assert (damage[crits] == 15).all()
+        assert (damage[~dodged & ~crits] == 10).all()
+
+    def test_multi_hit_matches_single_shot_rules(self):
+        """Test that a deterministic shot matches calculate_damage."""
+        calc = DamageCalculator({})
+        attacker, defender, weapon = make_unit(), make_unit(defense=3), make_weapon(12, 12)
+        ability = Ability(id=1, name="shot", stats=AbilityStats(damage=5, attack=10))
+
+        single, _, _ = calc.calculate_damage(attacker, defender, weapon, ability, 50.0, random.Random(0))
+        multi, _, _ = calc.calculate_multi_hit(
+            attacker, defender, weapon, ability, 50.0, np.random.default_rng(0)
+        )
+
+        assert multi.shape == (1, 1)
+        assert int(multi[0, 0]) == single
+
+
+class TestDamageKernels:
+    """Tests for the scalar damage kernels."""
+
+    def test_damage_kernel(self):
+        """Test flat bonus, class and percent scaling with the 1-damage floor."""
+        assert damage_kernel(10, 5.0, 3, 1.0, 100.0) == 12
+        assert damage_kernel(10, 5.0, 3, 1.5, 50.0) == 9
+        assert damage_kernel(1, 0.0, 50, 1.0, 100.0) == 1
+
+    def test_split_damage(self):
+        """Test armor absorbs first and overflow reaches HP."""
+        # No armor: everything hits HP
+        assert split_damage(20, 1.0, 1.0, 0.0, 0) == (20, 0, 20)
+        # Armor absorbs the hit
+        assert split_damage(20, 1.0, 0.5, 0.0, 30) == (20, 20, 0)
+        # Armor breaks and the overflow goes to HP
+        assert split_damage(40, 1.0, 1.0, 0.0, 30) == (40, 0, 10)
+        # Full piercing skips armor
+        assert split_damage(20, 0.5, 1.0, 1.0, 30) == (10, 30, 10)
+
+
+class TestStatusEffectSystem:
+    """Tests for status effect application."""
+
+    def test_applied_effects_share_definition(self):
+        """Test that active effects reuse the definition and its stun modifier dicts."""
+        effect = StatusEffect(
+            id=7, effect_type=StatusEffectType.STUN, family=StatusEffectFamily.FREEZE, duration=2,
+            stun_damage_mods={DamageType.FIRE.value: 2.0}
+        )
+        system = StatusEffectSystem({7: effect})
+        first, second = make_unit(), make_unit()
+
+        assert system.try_apply_effect(first, 7, 100.0, 10.0, random.Random(0))
+        assert system.try_apply_effect(second, 7, 100.0, 10.0, random.Random(0))
+        assert first.status_effects[0].effect is effect
+        assert second.status_effects[0].effect.stun_damage_mods is effect.stun_damage_mods
+        assert copy.deepcopy(first.status_effects)[0].effect is effect
+
+    def test_damage_modifiers_combine_stuns(self):
+        """Test that stun modifiers multiply across effects and are reused per combination."""
+        effects = {
+            effect_id: StatusEffect(
+                id=effect_id, effect_type=StatusEffectType.STUN, family=StatusEffectFamily.FREEZE,
+                duration=2, stun_damage_mods={DamageType.FIRE.value: mult},
+                stun_armor_damage_mods={DamageType.COLD.value: mult}
+            )
+            for effect_id, mult in ((1, 2.0), (2, 1.5))
+        }
+        system = StatusEffectSystem(effects)
+        first, second, clean = make_unit(), make_unit(), make_unit()
+        for unit in (first, second):
+            for effect_id in effects:
+                system.try_apply_effect(unit, effect_id, 100.0, 0.0, random.Random(0))
+
+        assert system.get_damage_modifiers(first) == {DamageType.FIRE.value: 3.0}
+        assert system.get_armor_damage_modifiers(first) == {DamageType.COLD.value: 3.0}
+        assert system.get_damage_modifiers(second) is system.get_damage_modifiers(first)
+        assert system.get_damage_modifiers(clean) == {}
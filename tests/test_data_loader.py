@@ -1,11 +1,19 @@
 """Tests for data loading functionality."""
+import pickle
+
 import pytest
 from pathlib import Path
 
-from src.simulator.data_loader import GameDataLoader
+from src.simulator import data_loader as data_loader_module
+from src.simulator.data_loader import GameDataLoader, LazyRecords, get_game_data, preload_game_data
 from src.simulator.enums import UnitClass, DamageType
 
 
+def _name_of(record_id, raw):
+    """Picklable parser for LazyRecords tests."""
+    return f"{record_id}:{raw['name']}"
+
+
 @pytest.fixture
 def data_loader():
     """Create a data loader with the test data."""
@@ -93,6 +101,24 @@ class TestGameDataLoader:
         unit = data_loader.get_unit(99999)
         assert unit is None
 
+    def test_iter_units_by_side(self, data_loader):
+        """Test lazy player/enemy unit iteration."""
+        from itertools import islice
+        from src.simulator.enums import Side
+
+        first = list(islice(data_loader.iter_player_units(), 5))
+        assert all(u.side == Side.PLAYER for u in first)
+        assert sum(1 for _ in data_loader.iter_enemy_units()) == sum(
+            1 for u in data_loader.units.values() if u.side == Side.HOSTILE
+        )
+
+    def test_unit_indexes(self, data_loader):
+        """Test the precomputed weapon and side indexes."""
+        assert data_loader.units_with_weapons == [
+            uid for uid, unit in data_loader.units.items() if unit.weapons
+        ]
+        assert sum(len(units) for units in data_loader.units_by_side.values()) == len(data_loader.units)
+
     def test_get_ability(self, data_loader):
         """Test getting a specific ability."""
         first_id = next(iter(data_loader.abilities.keys()))
@@ -107,6 +133,115 @@ class TestGameDataLoader:
         assert encounter is not None
         assert encounter.id == first_id
 
+    def test_repeated_strings_are_shared(self, tmp_path):
+        """Test that equal names and damage type keys are stored once."""
+        loader = GameDataLoader("data", cache_dir=tmp_path)
+        loader.load_all(use_cache=False)
+
+        icons = [unit.icon for unit in loader.units.values()]
+        assert len({id(icon) for icon in icons}) == len(set(icons))
+
+        mod_keys = [key for unit in loader.units.values()
+                    for stats in unit.all_rank_stats for key in stats.damage_mods]
+        assert len({id(key) for key in mod_keys}) == len(set(mod_keys))
+
+    def test_identical_area_patterns_are_shared(self, data_loader):
+        """Test that abilities with the same area geometry share one list."""
+        areas = {}
+        for ability in data_loader.abilities.values():
+            area = ability.stats.damage_area
+            key = tuple((e.pos.x, e.pos.y, e.damage_percent, e.order) for e in area)
+            assert areas.setdefault(key, area) is area
+
+    def test_target_area_signature_normalizes_percents(self):
+        """Test that int and float percents parse to the same shared pattern."""
+        loader = GameDataLoader("data")
+        first = loader._parse_target_area(
+            {"target_type": 2, "data": [{"pos": {"x": 0, "y": 1}, "damage_percent": 50}]}
+        )
+        second = loader._parse_target_area(
+            {"target_type": 2, "data": [{"pos": {"x": 0, "y": 1}, "damage_percent": 50.0}]}
+        )
+        assert first is second
+        assert first.data[0].damage_percent == 50.0
+
+    def test_prefetched_sources_are_released(self, tmp_path):
+        """Test that a fresh parse reads every source and drops the bytes afterwards."""
+        loader = GameDataLoader("data", cache_dir=tmp_path)
+        assert set(loader._read_sources()) == {
+            "battle_config.json", "status_effects.json", "battle_abilities.json",
+            "battle_units.json", "battle_encounters.json"
+        }
+
+        loader.load_all(use_cache=False)
+        assert loader._prefetched == {}
+        assert loader.units and loader.abilities
+
+    def test_large_sources_are_memory_mapped_for_orjson(self, monkeypatch):
+        """Test that only large files are mapped, and only when orjson will parse them."""
+        import mmap
+
+        loader = GameDataLoader("data")
+        expected = loader._resolve_json_path("battle_config.json").read_bytes()
+
+        monkeypatch.setattr(data_loader_module, "HAS_ORJSON", False)
+        monkeypatch.setattr(data_loader_module, "_MMAP_MIN_BYTES", 1)
+        assert loader._read_bytes("battle_config.json") == expected
+
+        monkeypatch.setattr(data_loader_module, "HAS_ORJSON", True)
+        mapped = loader._read_bytes("battle_config.json")
+        assert isinstance(mapped, mmap.mmap)
+        with mapped:
+            assert mapped[:] == expected
+
+        monkeypatch.setattr(data_loader_module, "_MMAP_MIN_BYTES", len(expected) + 1)
+        assert isinstance(loader._read_bytes("battle_config.json"), bytes)
+
+    def test_sources_for_other_parsers_are_not_memory_mapped(self, monkeypatch):
+        """Test that files simdjson or msgspec will parse are read as plain bytes."""
+        loader = GameDataLoader("data")
+        monkeypatch.setattr(data_loader_module, "HAS_ORJSON", True)
+        monkeypatch.setattr(data_loader_module, "_MMAP_MIN_BYTES", 1)
+
+        monkeypatch.setattr(data_loader_module, "HAS_SIMDJSON", True)
+        assert isinstance(loader._read_bytes("battle_encounters.json"), bytes)
+
+        monkeypatch.setattr(data_loader_module, "HAS_MSGSPEC", True)
+        assert isinstance(loader._read_bytes("battle_abilities.json"), bytes)
+
+    def test_encounters_parse_lazily(self, data_loader):
+        """Test that encounters are built on first lookup and then reused."""
+        encounters = data_loader.encounters
+        first_id = next(iter(encounters))
+
+        assert isinstance(encounters, LazyRecords)
+        assert first_id in encounters
+        assert data_loader.get_encounter(first_id) is encounters[first_id]
+        assert data_loader.get_encounter(-1) is None
+
+    @pytest.mark.skipif(not data_loader_module.HAS_MSGSPEC, reason="msgspec not installed")
+    def test_msgspec_abilities_match_dict_parse(self, monkeypatch):
+        """Test that typed msgspec decoding builds the same abilities as the dict path."""
+        typed = GameDataLoader("data")
+        typed._load_abilities()
+
+        monkeypatch.setattr(data_loader_module, "HAS_MSGSPEC", False)
+        plain = GameDataLoader("data")
+        plain._load_abilities()
+
+        assert typed.abilities == plain.abilities
+        for ability_id, ability in plain.abilities.items():
+            assert typed.abilities[ability_id].stats == ability.stats
+
+    def test_lazy_records_pickle_raw_only(self):
+        """Test that pickling drops parsed records but keeps every key."""
+        records = LazyRecords({1: {"name": "a"}, 2: {"name": "b"}}, _name_of)
+        assert records[1] == "1:a"
+
+        restored = pickle.loads(pickle.dumps(records))
+        assert restored._parsed == {}
+        assert dict(restored) == {1: "1:a", 2: "2:b"}
+
 
 class TestDataIntegrity:
     """Tests for data integrity and relationships."""
@@ -123,6 +258,13 @@ class TestDataIntegrity:
         # Allow some missing abilities (game data might have deprecated ones)
         assert len(errors) < len(data_loader.units) * 0.1, f"Too many missing abilities: {errors[:10]}"
 
+    def test_weapon_primary_ability_resolved(self, data_loader):
+        """Test that each weapon's primary ability matches its first ability ID."""
+        for unit in data_loader.units.values():
+            for weapon in unit.weapons.values():
+                expected = data_loader.get_ability(weapon.abilities[0]) if weapon.abilities else None
+                assert weapon.primary_ability is expected
+
     def test_encounters_reference_valid_units(self, data_loader):
         """Test that encounters reference valid units."""
         errors = []
@@ -138,3 +280,88 @@ class TestDataIntegrity:
         for enc_id, encounter in data_loader.encounters.items():
             layout = data_loader.get_layout(encounter.layout_id)
             assert layout is not None, f"Encounter {enc_id} references missing layout {encounter.layout_id}"
+
+
+class TestDataCache:
+    """Tests for the pickled game data cache."""
+
+    def test_cache_round_trip(self, tmp_path):
+        """Test that a cached load matches a fresh parse."""
+        fresh = GameDataLoader("data", cache_dir=tmp_path)
+        fresh.load_all()
+        assert fresh.cache_path.exists()
+        assert list(tmp_path.glob("*.tmp")) == []
+
+        cached = GameDataLoader("data", cache_dir=tmp_path)
+        cached.load_all()
+
+        assert cached.units.keys() == fresh.units.keys()
+        assert cached.abilities.keys() == fresh.abilities.keys()
+        assert cached.encounters.keys() == fresh.encounters.keys()
+        assert cached.config.class_damage_mods == fresh.config.class_damage_mods
+
+    def test_stale_cache_is_ignored(self, tmp_path):
+        """Test that a cache with a mismatched signature triggers a re-parse."""
+        loader = GameDataLoader("data", cache_dir=tmp_path)
+        loader.load_all()
+        tmp_path.joinpath("gamedata.pkl").write_bytes(b"not a pickle")
+
+        reloaded = GameDataLoader("data", cache_dir=tmp_path)
+        reloaded.load_all()
+
+        assert len(reloaded.units) == len(loader.units)
+
+    def test_unwritable_cache_dir_falls_back_to_tempdir(self, tmp_path, monkeypatch):
+        """Test that the cache moves to the temp dir when cache_dir cannot be created."""
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path / "tmp"))
+        (tmp_path / "tmp").mkdir()
+        blocked = tmp_path / "blocked"
+        blocked.write_text("a file where the cache dir should be")
+
+        loader = GameDataLoader("data", cache_dir=blocked)
+        loader.load_all()
+        assert loader.fallback_cache_path.exists()
+
+        reloaded = GameDataLoader("data", cache_dir=blocked)
+        assert reloaded._load_cache()
+        assert reloaded.units.keys() == loader.units.keys()
+
+    def test_fallback_cache_ignored_when_cache_dir_writable(self, tmp_path, monkeypatch):
+        """Test that a valid fallback cache is not read while cache_dir can be written."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        blocked = tmp_path / "blocked"
+        blocked.write_text("a file where the cache dir should be")
+        GameDataLoader("data", cache_dir=blocked).load_all()
+
+        loader = GameDataLoader("data", cache_dir=tmp_path / "cache")
+        assert loader.fallback_cache_path.exists()
+        assert not loader._load_cache()
+
+    def test_shared_fallback_cache_is_not_unpickled(self, tmp_path, monkeypatch):
+        """Test that a group- or world-writable fallback cache is rejected."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        blocked = tmp_path / "blocked"
+        blocked.write_text("a file where the cache dir should be")
+        loader = GameDataLoader("data", cache_dir=blocked)
+        loader.load_all()
+        assert loader.fallback_cache_path.parent == tmp_path / "xdg" / "bnsim"
+        assert oct(loader.fallback_cache_path.stat().st_mode & 0o777) == oct(0o600)
+
+        loader.fallback_cache_path.chmod(0o666)
+        assert not GameDataLoader("data", cache_dir=blocked)._load_cache()
+
+    def test_get_game_data_is_shared(self):
+        """Test that get_game_data returns one loader per directory."""
+        assert get_game_data("data") is get_game_data(Path("data"))
+
+    def test_preload_is_shared_with_get_game_data(self):
+        """Test that get_game_data waits for and reuses a background preload."""
+        preload_game_data("data")
+        preload_game_data("data")
+        thread = data_loader_module._preloads[Path("data").resolve()]
+
+        loader = get_game_data("data")
+        assert not thread.is_alive()
+        assert loader.units
+        assert get_game_data(Path("data")) is loader
@@ -3,7 +3,7 @@ import pytest
 import numpy as np
 import gymnasium as gym
 
-from src.simulator.gym_env import BattleEnv, MultiWaveBattleEnv
+from src.simulator.gym_env import BattleEnv, MultiWaveBattleEnv, VectorBattleEnv
 from src.simulator.data_loader import GameDataLoader
 
 
@@ -111,6 +111,49 @@ class TestBattleEnv:
         assert action_mask.dtype == np.int8
         assert np.all((action_mask == 0) | (action_mask == 1))
 
+    def test_action_masks_method(self, battle_env):
+        """Test that action_masks() matches the mask returned in info."""
+        obs, info = battle_env.reset(seed=0)
+
+        mask = battle_env.action_masks()
+
+        assert isinstance(mask, np.ndarray)
+        np.testing.assert_array_equal(mask, info["action_mask"])
+
+    def test_action_mask_matches_legal_actions(self, battle_env):
+        """Test the mask marks exactly the legal actions and is shared read-only."""
+        battle_env.reset(seed=1)
+        mask = battle_env.action_masks()
+
+        expected = set()
+        for action in battle_env.battle.get_legal_actions():
+            weapon_ids = list(battle_env.battle.player_units[action.unit_index].template.weapons)
+            expected.add(battle_env._encode_action(
+                action.unit_index, weapon_ids.index(action.weapon_id),
+                battle_env._position_to_target_idx(action.target_position)
+            ))
+        assert set(np.flatnonzero(mask).tolist()) == expected
+
+        assert battle_env.action_masks() is mask
+        assert not mask.flags.writeable
+
+    def test_legal_actions_reused_until_state_changes(self, battle_env, monkeypatch):
+        """Test that mask and validation share one legal-action scan per state."""
+        obs, info = battle_env.reset(seed=3)
+        calls = []
+        original = battle_env.battle.get_legal_actions
+        monkeypatch.setattr(battle_env.battle, "get_legal_actions",
+                            lambda: calls.append(1) or original())
+
+        mask = battle_env.action_masks()
+        np.testing.assert_array_equal(mask, info["action_mask"])
+        assert calls == []
+
+        battle_env.battle.end_turn()
+        battle_env.action_masks()
+        battle_env.action_masks()
+        assert len(calls) == 1
+
     def test_invalid_action_handling(self, battle_env):
         """Test handling of invalid actions."""
         obs, info = battle_env.reset()
@@ -283,6 +326,81 @@ class TestMultiWaveBattleEnv:
         env.close()
 
 
+class TestVectorBattleEnv:
+    """Tests for the batched environment."""
+
+    @pytest.fixture
+    def vector_env(self, sample_unit_ids):
+        if len(sample_unit_ids) < 4:
+            pytest.skip("Not enough sample units")
+        env = VectorBattleEnv(
+            3,
+            data_dir="data",
+            player_unit_ids=sample_unit_ids[:2],
+            enemy_unit_ids=sample_unit_ids[2:4],
+            enemy_positions=[0, 1]
+        )
+        yield env
+        env.close()
+
+    def test_spaces(self, vector_env):
+        """Test that the batch spaces stack the single-battle spaces."""
+        single = vector_env.envs[0]
+        assert vector_env.observation_space.shape == (3, single.state_size)
+        assert vector_env.action_space.shape == (3,)
+        assert vector_env.single_action_space == single.action_space
+
+    def test_reset_matches_single_env(self, vector_env, sample_unit_ids):
+        """Test that a base seed gives battle i the same start as BattleEnv with seed + i."""
+        obs, info = vector_env.reset(seed=7)
+        assert obs.shape == (3, vector_env.envs[0].state_size)
+        assert info["action_mask"].shape == (3, vector_env.envs[0].action_size)
+
+        single = BattleEnv(
+            data_dir="data",
+            player_unit_ids=sample_unit_ids[:2],
+            enemy_unit_ids=sample_unit_ids[2:4],
+            enemy_positions=[0, 1]
+        )
+        single_obs, single_info = single.reset(seed=8)
+        np.testing.assert_array_equal(obs[1], single_obs)
+        np.testing.assert_array_equal(info["action_mask"][1], single_info["action_mask"])
+
+    def test_step_autoresets_finished_battles(self, vector_env):
+        """Test batched stepping, buffer reuse and same-step autoreset."""
+        obs, info = vector_env.reset(seed=0)
+        rng = np.random.default_rng(0)
+        finished = False
+
+        for _ in range(500):
+            masks = vector_env.action_masks()
+            actions = [
+                rng.choice(np.flatnonzero(mask)) if mask.any() else 0
+                for mask in masks
+            ]
+            step_obs, rewards, terminated, truncated, info = vector_env.step(actions)
+            assert step_obs is obs
+            assert rewards.shape == terminated.shape == truncated.shape == (3,)
+
+            done = info["_final_obs"]
+            np.testing.assert_array_equal(done, terminated | truncated)
+            if done.any():
+                finished = True
+                # Reset battles start over, with a fresh mask
+                for i in np.flatnonzero(done):
+                    assert vector_env.envs[i].battle.turn_number <= 1
+                break
+
+        assert finished
+
+    def test_battles_write_into_batch_rows(self, vector_env):
+        """Test that each battle fills its own row of the observation batch."""
+        obs, _ = vector_env.reset(seed=1)
+        for i, env in enumerate(vector_env.envs):
+            assert np.shares_memory(env._get_observation(), obs[i])
+            np.testing.assert_array_equal(obs[i], env.battle.get_state_vector())
+
+
 class TestGymCompatibility:
     """Tests for Gymnasium API compatibility."""
 
@@ -0,0 +1,65 @@
+"""Tests for the agents' batched action scoring."""
+import pytest
+import numpy as np
+
+from src.ml import scoring
+from src.ml.scoring import heuristic_scores, greedy_scores
+
+
+def make_row(avg_damage, hp, max_hp, class_mod=1.0, focus=False, power=0, cooldown=0):
+    """Feature row for a valid action."""
+    row = np.zeros(scoring.N_FEATURES, dtype=np.float64)
+    row[scoring.VALID] = 1.0
+    row[scoring.AVG_DAMAGE] = avg_damage
+    row[scoring.TARGET_HP] = hp
+    row[scoring.TARGET_MAX_HP] = max_hp
+    row[scoring.CLASS_MOD] = class_mod
+    row[scoring.FOCUS] = 1.0 if focus else 0.0
+    row[scoring.TARGET_POWER] = power
+    row[scoring.COOLDOWN] = cooldown
+    return row
+
+
+class TestHeuristicScores:
+    """Tests for heuristic_scores."""
+
+    def test_hand_computed_rows(self):
+        """Test each scoring term against scores worked out by hand."""
+        features = np.stack([
+            # 40 + 200 kill + 10 advantage + 20 focus + 15 hp + 5 power - 15 cooldown
+            make_row(40, hp=50, max_hp=100, class_mod=1.2, focus=True, power=10, cooldown=3),
+            # 10 - 15 disadvantage, target at full hp
+            make_row(10, hp=100, max_hp=100, class_mod=0.5),
+            # 100 + 200 kill + 15 hp - 20 overkill; cooldown 2 is not penalized
+            make_row(100, hp=10, max_hp=20, cooldown=2),
+            # No weapon or target
+            np.zeros(scoring.N_FEATURES),
+        ])
+
+        scores = heuristic_scores(features)
+
+        assert scores.dtype == np.float64
+        assert scores.tolist() == pytest.approx([275.0, -5.0, 295.0, scoring.INVALID_SCORE])
+
+    def test_invalid_row_ignores_features(self):
+        """Test that a row without VALID scores INVALID_SCORE whatever else it holds."""
+        row = make_row(500, hp=1, max_hp=1, power=100)
+        row[scoring.VALID] = 0.0
+
+        assert heuristic_scores(row[None, :])[0] == scoring.INVALID_SCORE
+
+
+class TestGreedyScores:
+    """Tests for greedy_scores."""
+
+    def test_hand_computed_scores(self):
+        """Test target bonus and class multiplier, which only apply with a target."""
+        scores = greedy_scores(
+            np.array([30.0, 30.0, 8.0]),
+            np.array([0.5, 0.0, 1.0]),
+            np.array([2.0, 3.0, 0.5]),
+            np.array([True, False, True])
+        )
+
+        # (30 + 25) * 2, plain 30 without a target, (8 + 0) * 0.5
+        assert scores.tolist() == pytest.approx([110.0, 30.0, 4.0])